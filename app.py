@@ -1,26 +1,105 @@
-from flask import Flask, render_template, render_template_string, redirect, url_for, flash, request, jsonify, get_flashed_messages
+from flask import Flask, Response, render_template, redirect, url_for, flash, request, jsonify, get_flashed_messages, stream_with_context, send_file, abort, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from flask.json.provider import DefaultJSONProvider
+from jinja2 import FileSystemBytecodeCache
 import pymysql
 pymysql.install_as_MySQLdb()
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, SubmitField, TextAreaField, SelectField, DecimalField, BooleanField
 from wtforms.validators import DataRequired, Email, Length, EqualTo
-from config import Config
+from config import Config, validate_engine_options
 import subprocess
 import os
 import stripe
 import redis
 import logging
-from datetime import datetime
+import json
+import csv
+import base64
+import zlib
+import gzip
+import uuid
+import dataclasses
+from typing import ClassVar, Optional
+from decimal import Decimal
+from io import StringIO, BytesIO
+from datetime import date, datetime, timedelta, timezone
 from werkzeug.security import generate_password_hash, check_password_hash
-from functools import wraps
+from werkzeug.utils import safe_join
+from markupsafe import escape
+from functools import wraps, lru_cache
+from collections import Counter, defaultdict
+from sqlalchemy import event
+from sqlalchemy.pool import Pool, QueuePool
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import selectinload, raiseload
+from flask_sqlalchemy.session import Session as FlaskSession
+import re
+import sqlite3
+import threading
+import fcntl
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+import tempfile
+import hashlib
+import hmac
+import inspect
+import mimetypes
+import click
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # pyarrow je voliteľný - bez neho stĺpcový export vráti 501
+    pa = None
+    pq = None
+
+# Voliteľné kompresné algoritmy - bez nich sa použije len gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Rýchle JSON knižnice - bez nich ostáva stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+class RoutingSession(FlaskSession):
+    """Session, ktorá SELECTy v read-only views posiela na read repliku
+
+    Zápisy (flush) a textové príkazy idú vždy na primárnu databázu.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and isinstance(clause, Select) and reads_from_replica():
+            return get_replica_engine()
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
 
 # --- INICIALIZÁCIA ---
 app = Flask(__name__)
 app.config.from_object(Config)
-app.config['TEMPLATES_AUTO_RELOAD'] = True
-db = SQLAlchemy(app)
+if app.config.get('JINJA_BYTECODE_CACHE_DIR'):
+    # Musí byť nastavené pred prvým použitím app.jinja_env
+    os.makedirs(app.config['JINJA_BYTECODE_CACHE_DIR'], exist_ok=True)
+    app.jinja_options = {**app.jinja_options, 'bytecode_cache': FileSystemBytecodeCache(app.config['JINJA_BYTECODE_CACHE_DIR'])}
+validate_engine_options(app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 login_manager = LoginManager(app)
 login_manager.login_view = 'login'
 
@@ -45,6 +124,771 @@ except Exception as e:
     print(f"Redis connection warning: {e}")
     redis_client = None
 
+# --- JSON SERIALIZÁCIA ---
+JSON_BACKENDS = ('orjson', 'msgspec', 'stdlib')
+
+def json_default(o):
+    """Typy mimo JSON - dátumy ako ISO 8601, Decimal ako reťazec (bez straty presnosti súm)"""
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, (Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        # Plytko - vnorené hodnoty spracuje json znova cez default (asdict by ich kopíroval)
+        return {field.name: getattr(o, field.name) for field in dataclasses.fields(o)}
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+def installed_json_backends():
+    installed = {'orjson': orjson is not None, 'msgspec': msgspec is not None, 'stdlib': True}
+    return [name for name in JSON_BACKENDS if installed[name]]
+
+def resolve_json_backend(name):
+    """JSON_BACKEND=auto vyberie najrýchlejší nainštalovaný backend"""
+    installed = installed_json_backends()
+    if name == 'auto':
+        return installed[0]
+    if name not in installed:
+        logger.warning(f"JSON backend {name} nie je nainštalovaný, používam {installed[0]}")
+        return installed[0]
+    return name
+
+def make_json_encoder(backend, sort_keys=True, indent=False):
+    """Vráti funkciu obj -> UTF-8 bajty pre daný backend"""
+    if backend == 'orjson':
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return lambda obj: orjson.dumps(obj, default=json_default, option=option)
+    if backend == 'msgspec':
+        encoder = msgspec.json.Encoder(enc_hook=json_default, order='sorted' if sort_keys else None)
+        if indent:
+            return lambda obj: msgspec.json.format(encoder.encode(obj), indent=2)
+        return encoder.encode
+    separators = None if indent else (',', ':')
+    return lambda obj: json.dumps(
+        obj, default=json_default, sort_keys=sort_keys, ensure_ascii=False,
+        indent=2 if indent else None, separators=separators
+    ).encode('utf-8')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider pre jsonify/request.get_json s orjson alebo msgspec, ak sú nainštalované
+
+    Všetky backendy serializujú datetime ako ISO 8601 a Decimal ako reťazec,
+    výstup je teda rovnaký bez ohľadu na to, ktorý je aktívny.
+    """
+
+    default = staticmethod(json_default)
+    ensure_ascii = False
+
+    def __init__(self, app, backend=None):
+        super().__init__(app)
+        self.backend = resolve_json_backend(backend or app.config.get('JSON_BACKEND', 'auto'))
+        self.encoders = {indent: make_json_encoder(self.backend, self.sort_keys, indent) for indent in (False, True)}
+
+    def dumps(self, obj, **kwargs):
+        # Iné argumenty ako odsadenie (cls, default, ...) vie len stdlib
+        if set(kwargs) - {'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        return self.encoders[bool(kwargs.get('indent'))](obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs or self.backend == 'stdlib':
+            return json.loads(s, **kwargs)
+        if self.backend == 'orjson':
+            return orjson.loads(s)
+        try:
+            return msgspec.json.decode(s)
+        except msgspec.DecodeError as e:
+            # request.get_json očakáva ValueError
+            raise ValueError(str(e)) from e
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        # Bajty idú rovno do odpovede bez medzikroku cez str
+        return self._app.response_class(self.encoders[indent](obj) + b'\n', mimetype=self.mimetype)
+
+app.json = FastJSONProvider(app)
+
+def sample_json_payload(projects=200, payments=1000):
+    """Dáta v tvare /api/projects a /api/project/<id>/payments pre benchmark serializácie"""
+    now = datetime.utcnow()
+    return {
+        'projects': [{
+            'id': i,
+            'name': f'Projekt {i} – kaviareň',
+            'api_key': uuid.UUID(int=i).hex * 2,
+            'is_active': i % 3 != 0,
+            'script_path': f'scripts/projekt_{i}.py',
+            'created_at': now - timedelta(days=i),
+            'updated_at': now - timedelta(hours=i),
+            'payments_count': i % 17,
+            'automations_count': i % 5
+        } for i in range(projects)],
+        'payments': [{
+            'id': i,
+            'amount': Decimal(i % 5000) / 100 + Decimal('9.99'),
+            'currency': 'EUR',
+            'status': 'completed' if i % 4 else 'pending',
+            'gateway': 'stripe',
+            'transaction_id': f'pi_{i:024d}',
+            'created_at': now - timedelta(minutes=i)
+        } for i in range(payments)]
+    }
+
+def benchmark_json_backends(payload, rounds=50):
+    """Vráti {backend: serializácií za sekundu} pre nainštalované backendy"""
+    results = {}
+    for backend in installed_json_backends():
+        encode = make_json_encoder(backend)
+        encode(payload)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            encode(payload)
+        results[backend] = rounds / (time.perf_counter() - started)
+    return results
+
+@app.cli.command('bench-json')
+@click.option('--rounds', default=50, help='Počet serializácií na backend')
+def bench_json_command(rounds):
+    """flask bench-json - porovná priepustnosť JSON backendov na projektoch a platbách"""
+    payload = sample_json_payload()
+    size = len(make_json_encoder('stdlib')(payload))
+    results = benchmark_json_backends(payload, rounds)
+    print(f"Payload: {len(payload['projects'])} projektov, {len(payload['payments'])} platieb, {size / 1024:.0f} KB")
+    for backend, rate in sorted(results.items(), key=lambda item: -item[1]):
+        print(f"{backend:8} {rate:8.1f} ops/s  {rate * size / 1024 / 1024:7.1f} MB/s  x{rate / results['stdlib']:.1f}")
+
+# --- DATABÁZOVÝ POOL ---
+# Počítadlá udalostí poolu v tomto procese (gunicorn worker)
+pool_metrics = {'connects': 0, 'checkouts': 0, 'checkins': 0, 'invalidations': 0}
+
+@event.listens_for(Pool, 'connect')
+def count_pool_connect(dbapi_connection, connection_record):
+    pool_metrics['connects'] += 1
+
+@event.listens_for(Pool, 'checkout')
+def count_pool_checkout(dbapi_connection, connection_record, connection_proxy):
+    pool_metrics['checkouts'] += 1
+
+@event.listens_for(Pool, 'checkin')
+def count_pool_checkin(dbapi_connection, connection_record):
+    pool_metrics['checkins'] += 1
+
+@event.listens_for(Pool, 'invalidate')
+def count_pool_invalidation(dbapi_connection, connection_record, exception):
+    # Sem padnú aj spojenia zavreté serverom, ktoré odhalil pool_pre_ping
+    pool_metrics['invalidations'] += 1
+
+def pool_stats():
+    """Aktuálny stav poolu hlavnej databázy a počítadlá udalostí"""
+    pool = db.engine.pool
+    stats = {'class': type(pool).__name__, **pool_metrics}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow(),
+            'checked_in': pool.checkedin()
+        })
+    return stats
+
+# --- SQL INŠTRUMENTÁCIA ---
+# Súhrnné SQL štatistiky podľa endpointu v tomto procese
+sql_endpoint_stats = {}
+sql_stats_lock = threading.Lock()
+
+def parameter_shape(parameters):
+    """Tvar parametrov dotazu (typy, nie hodnoty) - do logu sa nedostanú citlivé dáta"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f'{len(parameters)} x {parameter_shape(parameters[0])}'
+        return tuple(type(value).__name__ for value in parameters)
+    return type(parameters).__name__
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    # Čas sa drží na execution contexte, nie na spojení z poolu - zlyhaný príkaz
+    # (bez after_cursor_execute) tak po sebe nič nenechá
+    if context is not None:
+        context.query_started_at = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, 'query_started_at', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    if has_request_context():
+        g.sql_statements = g.get('sql_statements', 0) + 1
+        g.sql_time = g.get('sql_time', 0.0) + elapsed
+
+    if elapsed * 1000 >= app.config.get('SLOW_QUERY_MS', 200):
+        if has_request_context():
+            g.sql_slow_queries = g.get('sql_slow_queries', 0) + 1
+        logger.warning(
+            f'Slow query {elapsed * 1000:.1f}ms: {" ".join(statement.split())} '
+            f'params={parameter_shape(parameters)}'
+        )
+
+@app.before_request
+def start_request_timing():
+    g.request_started = time.perf_counter()
+    g.sql_statements = 0
+    g.sql_time = 0.0
+    g.sql_slow_queries = 0
+
+@app.after_request
+def add_server_timing(response):
+    """Server-Timing hlavička s počtom a časom SQL dotazov, zápis do štatistík endpointu"""
+    if 'request_started' not in g:
+        return response
+
+    statements = g.get('sql_statements', 0)
+    sql_ms = g.get('sql_time', 0.0) * 1000
+    total_ms = (time.perf_counter() - g.request_started) * 1000
+    response.headers.add('Server-Timing', f'db;dur={sql_ms:.1f};desc="{statements} queries"')
+    response.headers.add('Server-Timing', f'app;dur={total_ms:.1f}')
+
+    endpoint = request.endpoint or 'unknown'
+    budget = app.config.get('SQL_STATEMENT_BUDGET', 20)
+    if statements > budget:
+        logger.warning(f'SQL budget exceeded: {request.method} {request.path} ({endpoint}) issued {statements} statements (budget {budget})')
+
+    with sql_stats_lock:
+        stats = sql_endpoint_stats.setdefault(endpoint, {
+            'requests': 0, 'statements': 0, 'max_statements': 0,
+            'db_time_ms': 0.0, 'slow_queries': 0, 'over_budget': 0
+        })
+        stats['requests'] += 1
+        stats['statements'] += statements
+        stats['max_statements'] = max(stats['max_statements'], statements)
+        stats['db_time_ms'] += sql_ms
+        stats['slow_queries'] += g.get('sql_slow_queries', 0)
+        stats['over_budget'] += statements > budget
+    return response
+
+# --- PROMETHEUS METRIKY ---
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    'http_requests_total': ('counter', 'Počet HTTP requestov'),
+    'http_request_duration_seconds': ('histogram', 'Latencia HTTP requestov'),
+    'http_requests_in_flight': ('gauge', 'Práve spracovávané requesty'),
+    'rate_limit_rejections_total': ('counter', 'Requesty odmietnuté rate limitom'),
+    'redis_command_duration_seconds': ('histogram', 'Latencia Redis príkazov'),
+    'upstream_request_duration_seconds': ('histogram', 'Latencia volaní externých služieb'),
+    'upstream_errors_total': ('counter', 'Zlyhané volania externých služieb'),
+    'db_pool_connections': ('gauge', 'Stav DB connection poolu'),
+    'db_pool_events_total': ('counter', 'Udalosti DB connection poolu'),
+    'export_queue_depth': ('gauge', 'Exportné joby čakajúce na spracovanie'),
+    'scripts_running': ('gauge', 'Bežiace skripty projektov'),
+    'health_probe_duration_seconds': ('histogram', 'Latencia health check sond'),
+}
+
+class MetricsRegistry:
+    """Počítadlá, gauge a histogramy v pamäti procesu so snapshotom pre agregáciu cez workery"""
+
+    def __init__(self, buckets=METRIC_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.gauges = defaultdict(float)
+        self.histograms = {}
+
+    def inc(self, name, labels=None, value=1):
+        with self.lock:
+            self.counters[(name, tuple(sorted((labels or {}).items())))] += value
+
+    def set(self, name, value, labels=None):
+        with self.lock:
+            self.gauges[(name, tuple(sorted((labels or {}).items())))] = value
+
+    def add(self, name, value, labels=None):
+        """Zmena gauge o hodnotu (napr. dĺžka fronty)"""
+        with self.lock:
+            self.gauges[(name, tuple(sorted((labels or {}).items())))] += value
+
+    def set_total(self, name, value, labels=None):
+        """Počítadlo, ktoré sa počíta inde (napr. pool_metrics) - prepíše sa aktuálnou hodnotou"""
+        with self.lock:
+            self.counters[(name, tuple(sorted((labels or {}).items())))] = value
+
+    def observe(self, name, value, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self.lock:
+            histogram = self.histograms.setdefault(key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def snapshot(self):
+        """Serializovateľný stav - kľúč metriky je [meno, [[label, hodnota], ...]]"""
+        with self.lock:
+            return {
+                'pid': os.getpid(),
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in self.gauges.items()],
+                'histograms': [[name, labels, dict(histogram, buckets=list(histogram['buckets']))]
+                               for (name, labels), histogram in self.histograms.items()],
+            }
+
+metrics = MetricsRegistry()
+metrics_state = {'last_write': 0.0, 'pid': None, 'file': None}
+# Súhrn počítadiel a histogramov ukončených workerov
+METRICS_DEAD_FILE = 'metrics_dead.json'
+# Procesy skriptov spustených cez run_script
+script_processes = []
+
+def refresh_runtime_gauges():
+    """Stav poolu, exportnej fronty a bežiacich skriptov sa do registra prepíše pred zápisom"""
+    stats = pool_stats()
+    for state in ('size', 'checked_out', 'overflow', 'checked_in'):
+        if state in stats:
+            metrics.set('db_pool_connections', stats[state], {'state': state})
+    for event_name in pool_metrics:
+        metrics.set_total('db_pool_events_total', stats[event_name], {'event': event_name})
+
+    script_processes[:] = [process for process in script_processes if process.poll() is None]
+    metrics.set('scripts_running', len(script_processes))
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def merge_metric_snapshots(snapshots):
+    """Sčíta snapshoty workerov; gauge mŕtvych workerov sa vynechajú, počítadlá zostávajú"""
+    counters, gauges, histograms = defaultdict(float), defaultdict(float), {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            counters[(name, tuple(map(tuple, labels)))] += value
+        if snapshot['pid'] is not None and (snapshot['pid'] == os.getpid() or process_alive(snapshot['pid'])):
+            for name, labels, value in snapshot['gauges']:
+                gauges[(name, tuple(map(tuple, labels)))] += value
+        for name, labels, histogram in snapshot['histograms']:
+            merged = histograms.setdefault((name, tuple(map(tuple, labels))),
+                                           {'buckets': [0] * len(METRIC_BUCKETS), 'sum': 0.0, 'count': 0})
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], histogram['buckets'])]
+            merged['sum'] += histogram['sum']
+            merged['count'] += histogram['count']
+    return counters, gauges, histograms
+
+def snapshot_pid(filename):
+    """PID workera z názvu metrics_<pid>_<token>.json (starší formát metrics_<pid>.json)"""
+    return int(filename[len('metrics_'):-len('.json')].split('_')[0])
+
+def read_metrics_file(path):
+    with open(path) as f:
+        return json.load(f)
+
+def fold_dead_snapshot(directory, path):
+    """Počítadlá a histogramy ukončeného workera pripočíta do METRICS_DEAD_FILE, jeho gauge zahodí
+
+    Ako mark_process_dead v prometheus_client - súčty počítadiel po reštarte workera neklesnú,
+    takže Prometheus nevidí falošný reset (rate/increase).
+    """
+    dead_path = os.path.join(directory, METRICS_DEAD_FILE)
+    with open(os.path.join(directory, 'metrics_dead.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if not os.path.exists(path):
+            return  # Súbor medzitým spracoval iný worker
+        snapshots = [read_metrics_file(path)]
+        if os.path.exists(dead_path):
+            snapshots.append(read_metrics_file(dead_path))
+        counters, _, histograms = merge_metric_snapshots(snapshots)
+        aggregate = {
+            'pid': None,
+            'counters': [[name, [list(label) for label in labels], value] for (name, labels), value in counters.items()],
+            'gauges': [],
+            'histograms': [[name, [list(label) for label in labels], histogram]
+                           for (name, labels), histogram in histograms.items()],
+        }
+        with open(dead_path + '.tmp', 'w') as f:
+            json.dump(aggregate, f)
+        os.replace(dead_path + '.tmp', dead_path)
+        os.remove(path)
+
+def metrics_snapshot_file(directory):
+    """Názov snapshotu procesu - PID s náhodným tokenom, aby znovu použitý PID neprepísal súbor mŕtveho workera
+
+    Súbory s rovnakým PID, ktoré nepatria tomuto procesu, zostali po predchodcovi a pripočítajú sa k mŕtvym.
+    """
+    pid = os.getpid()
+    if metrics_state['pid'] != pid:
+        metrics_state['pid'] = pid
+        metrics_state['file'] = f'metrics_{pid}_{uuid.uuid4().hex[:8]}.json'
+        for filename in os.listdir(directory):
+            if (filename.startswith('metrics_') and filename.endswith('.json')
+                    and filename != METRICS_DEAD_FILE and snapshot_pid(filename) == pid):
+                fold_dead_snapshot(directory, os.path.join(directory, filename))
+    return metrics_state['file']
+
+def write_metrics_snapshot(force=False):
+    """Zapíše snapshot procesu do METRICS_DIR (max. raz za METRICS_WRITE_INTERVAL sekúnd)"""
+    directory = app.config.get('METRICS_DIR')
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - metrics_state['last_write'] < app.config.get('METRICS_WRITE_INTERVAL', 1):
+        return
+    metrics_state['last_write'] = now
+
+    refresh_runtime_gauges()
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, metrics_snapshot_file(directory))
+    with open(path + '.tmp', 'w') as f:
+        json.dump(metrics.snapshot(), f)
+    os.replace(path + '.tmp', path)
+
+def collect_metric_snapshots():
+    """Snapshoty všetkých workerov z METRICS_DIR, aktuálny proces vždy čerstvý
+
+    Súbory ukončených workerov sa najprv zložia do METRICS_DEAD_FILE, ten sa pripočíta nakoniec.
+    """
+    snapshots = [metrics.snapshot()]
+    directory = app.config.get('METRICS_DIR')
+    if directory and os.path.isdir(directory):
+        for filename in sorted(os.listdir(directory)):
+            if (not filename.startswith('metrics_') or not filename.endswith('.json')
+                    or filename in (metrics_state['file'], METRICS_DEAD_FILE)):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                pid = snapshot_pid(filename)
+                # Cudzí súbor s naším PID zostal po predchodcovi s rovnakým PID
+                if pid == os.getpid() or not process_alive(pid):
+                    fold_dead_snapshot(directory, path)
+                    continue
+                snapshots.append(read_metrics_file(path))
+            except (OSError, ValueError):
+                logger.warning(f'Nečitateľný snapshot metrík: {filename}')
+        dead_path = os.path.join(directory, METRICS_DEAD_FILE)
+        try:
+            if os.path.exists(dead_path):
+                snapshots.append(read_metrics_file(dead_path))
+        except (OSError, ValueError):
+            logger.warning(f'Nečitateľný snapshot metrík: {METRICS_DEAD_FILE}')
+    return snapshots
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{escape_label(value)}"' for key, value in pairs) + '}'
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def render_prometheus(counters, gauges, histograms):
+    """Textový formát Prometheus exposition (verzia 0.0.4)"""
+    series = defaultdict(list)
+    for (name, labels), value in counters.items():
+        series[name].append(f'{name}{format_labels(labels)} {value}')
+    for (name, labels), value in gauges.items():
+        series[name].append(f'{name}{format_labels(labels)} {value}')
+    for (name, labels), histogram in histograms.items():
+        for bound, count in zip(METRIC_BUCKETS, histogram['buckets']):
+            series[name].append(f'{name}_bucket{format_labels(labels, [("le", bound)])} {count}')
+        series[name].append(f'{name}_bucket{format_labels(labels, [("le", "+Inf")])} {histogram["count"]}')
+        series[name].append(f'{name}_sum{format_labels(labels)} {histogram["sum"]}')
+        series[name].append(f'{name}_count{format_labels(labels)} {histogram["count"]}')
+
+    lines = []
+    for name in sorted(series):
+        kind, description = METRIC_HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(series[name])
+    return '\n'.join(lines) + '\n'
+
+class track_upstream:
+    """Meranie latencie volania externej služby (Stripe, OpenAI)"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        metrics.observe('upstream_request_duration_seconds', time.perf_counter() - self.started, {'service': self.service})
+        if exc_type is not None:
+            metrics.inc('upstream_errors_total', {'service': self.service})
+        return False
+
+@app.before_request
+def track_in_flight():
+    g.metrics_in_flight = True
+    with metrics.lock:
+        metrics.gauges[('http_requests_in_flight', ())] += 1
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' in g:
+        labels = {'endpoint': request.endpoint or 'unknown', 'method': request.method}
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - g.request_started, labels)
+        metrics.inc('http_requests_total', dict(labels, status=str(response.status_code)))
+    return response
+
+@app.teardown_request
+def finish_in_flight(exc=None):
+    if g.pop('metrics_in_flight', False):
+        with metrics.lock:
+            metrics.gauges[('http_requests_in_flight', ())] -= 1
+        write_metrics_snapshot()
+
+# --- KOMPRESIA ODPOVEDÍ ---
+# Bez text/html - stránky nesú CSRF token vedľa reflektovaného vstupu (BREACH)
+COMPRESSIBLE_MIMETYPES = {
+    'text/css', 'text/plain', 'text/csv', 'text/javascript',
+    'application/json', 'application/x-ndjson', 'application/javascript',
+    'application/xml', 'image/svg+xml',
+}
+# Prípony statických súborov, ku ktorým flask compress-static pripraví .gz/.br
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.xml', '.map', '.ico')
+
+def available_encodings():
+    """Algoritmy z COMPRESS_ALGORITHMS v poradí preferencie, len tie s nainštalovanou knižnicou"""
+    installed = {'br': brotli is not None, 'zstd': zstandard is not None, 'gzip': True}
+    return [name.strip() for name in app.config.get('COMPRESS_ALGORITHMS', Config.COMPRESS_ALGORITHMS).split(',')
+            if installed.get(name.strip())]
+
+def negotiate_encoding():
+    for encoding in available_encodings():
+        if request.accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+def make_compressor(encoding):
+    """Vráti dvojicu (compress, finish) pre prúdovú kompresiu"""
+    level = app.config.get('COMPRESS_LEVEL', 6)
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=min(level, 11))
+        return compressor.process, compressor.finish
+    if encoding == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        return compressor.compress, compressor.flush
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+def compress_stream(chunks, encoding):
+    """Komprimuje prúd chunkov za behu (streamované exporty)"""
+    compress, finish = make_compressor(encoding)
+    for chunk in chunks:
+        data = compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield finish()
+
+@app.after_request
+def compress_response(response):
+    """gzip/br/zstd podľa Accept-Encoding pre textové odpovede nad COMPRESS_MIN_SIZE"""
+    if not app.config.get('COMPRESS_ENABLED', True) or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+
+    # send_file (statické súbory, stiahnutie exportov, Range) ide bez zmeny
+    if (request.method == 'HEAD' or response.direct_passthrough or 'Content-Encoding' in response.headers
+            or response.status_code < 200 or response.status_code in (204, 206, 304)):
+        return response
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < app.config.get('COMPRESS_MIN_SIZE', 500):
+            return response
+        compress, finish = make_compressor(encoding)
+        response.set_data(compress(data) + finish())
+    response.headers['Content-Encoding'] = encoding
+
+    # Komprimovaná reprezentácia nie je bajtovo zhodná - silný ETag sa oslabí (ako gzip v nginx)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+@app.before_request
+def serve_precompressed_static():
+    """Statický súbor s pripravenou .br/.gz variantou sa pošle bez kompresie za behu"""
+    if request.endpoint != 'static':
+        return None
+    filename = request.view_args.get('filename', '')
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings.quality(encoding) <= 0:
+            continue
+        path = safe_join(app.static_folder, filename + suffix)
+        if path and os.path.isfile(path):
+            response = send_file(
+                path,
+                mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                conditional=True,
+                max_age=app.get_send_file_max_age(filename)
+            )
+            response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            return response
+    return None
+
+def precompress_static(folder):
+    """Vytvorí .gz (a .br, ak je brotli) varianty statických súborov, vráti zapísané cesty"""
+    written = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if not name.endswith(PRECOMPRESS_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            variants = [('.gz', lambda raw: gzip.compress(raw, 9, mtime=0))]
+            if brotli is not None:
+                variants.append(('.br', lambda raw: brotli.compress(raw, quality=11)))
+            for suffix, compress in variants:
+                target = path + suffix
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    continue
+                compressed = compress(data)
+                # Varianta, ktorá nie je menšia, by len zdržala server
+                if len(compressed) >= len(data):
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(compressed)
+                written.append(target)
+    return written
+
+@app.cli.command('compress-static')
+def compress_static_command():
+    """flask compress-static - pripraví .gz/.br varianty súborov v static/"""
+    written = precompress_static(app.static_folder)
+    print(f"✅ Skomprimované súbory: {len(written)}")
+
+# --- READ REPLIKA ---
+# Posledné meranie oneskorenia repliky (zdieľané v rámci procesu)
+replica_state = {'checked_at': 0.0, 'lag': None}
+# Read-your-writes bez Redis: principal -> čas, do kedy číta z primárnej DB (len tento proces)
+replica_sticky = {}
+
+def get_replica_engine():
+    """Engine read repliky z SQLALCHEMY_BINDS['replica'] alebo None"""
+    return db.engines.get('replica')
+
+def measure_replica_lag(engine):
+    """Oneskorenie repliky v sekundách, None ak replika nie je dostupná"""
+    try:
+        with engine.connect() as connection:
+            if engine.dialect.name in ('mysql', 'mariadb'):
+                status = connection.exec_driver_sql('SHOW SLAVE STATUS').mappings().first()
+                if status is None or status.get('Seconds_Behind_Master') is None:
+                    return None
+                return float(status['Seconds_Behind_Master'])
+            connection.exec_driver_sql('SELECT 1')
+            return 0.0
+    except Exception as e:
+        logger.warning(f'Replica lag check failed: {str(e)}')
+        return None
+
+def replica_lag():
+    """Oneskorenie repliky, merané najviac raz za REPLICA_LAG_CHECK_INTERVAL sekúnd"""
+    now = time.monotonic()
+    if now - replica_state['checked_at'] >= app.config.get('REPLICA_LAG_CHECK_INTERVAL', 5):
+        replica_state['lag'] = measure_replica_lag(get_replica_engine())
+        replica_state['checked_at'] = now
+    return replica_state['lag']
+
+def reads_from_replica():
+    """Má aktuálny dotaz ísť na repliku?
+
+    Len v read-only views, nie krátko po zápise toho istého klienta
+    (read-your-writes) a len ak replika nezaostáva viac ako REPLICA_MAX_LAG.
+    """
+    if not has_request_context() or not g.get('db_read_only'):
+        return False
+    if get_replica_engine() is None:
+        return False
+    if 'db_primary_sticky' not in g:
+        g.db_primary_sticky = sticks_to_primary(replica_principal())
+    if g.db_primary_sticky:
+        return False
+    lag = replica_lag()
+    return lag is not None and lag <= app.config.get('REPLICA_MAX_LAG', 5)
+
+def replica_read(f):
+    """Označí view ako read-only - jeho SELECTy môžu ísť na repliku"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.db_read_only = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+@app.before_request
+def reset_replica_stickiness():
+    # Rozhodnutie sa počíta raz za request pri prvom SELECTe view (po načítaní principala)
+    g.pop('db_read_only', None)
+    g.pop('db_primary_sticky', None)
+
+def replica_principal():
+    """Kto zapisoval - API kľúč alebo prihlásený používateľ, None pre anonymný request
+
+    Používateľa berie z g (už načítaného), aby dotaz v user_loaderi znova nevolal loader.
+    """
+    if g.get('api_key_digest'):
+        return f'key:{g.api_key_digest[:16]}'
+    user = g.get('_login_user')
+    if user is not None and user.is_authenticated:
+        return f'user:{user.id}'
+    return None
+
+def sticks_to_primary(principal):
+    if principal is None:
+        return False
+    if redis_client:
+        try:
+            return bool(redis_client.get(f'db_primary:{principal}'))
+        except Exception as e:
+            logger.warning(f'Redis read-your-writes zlyhal: {str(e)}')
+            return True
+    return replica_sticky.get(principal, 0) > time.time()
+
+@app.after_request
+def stick_to_primary_after_write(response):
+    """Po zápise číta ten istý principal REPLICA_STICKY_SECONDS z primárnej databázy
+
+    Stav je v Redis podľa používateľa/API kľúča, nie v session - funguje aj pre klientov
+    bez cookie a API odpovede nedostanú Set-Cookie.
+    """
+    if request.method not in ('POST', 'PUT', 'PATCH', 'DELETE') or get_replica_engine() is None:
+        return response
+    principal = replica_principal()
+    if principal is None:
+        return response
+    seconds = app.config.get('REPLICA_STICKY_SECONDS', 10)
+    if redis_client:
+        try:
+            redis_client.setex(f'db_primary:{principal}', int(seconds), 1)
+        except Exception as e:
+            logger.warning(f'Redis read-your-writes zlyhal: {str(e)}')
+    else:
+        replica_sticky[principal] = time.time() + seconds
+    return response
+
 # --- STRIPE ---
 if app.config['STRIPE_SECRET_KEY']:
     stripe.api_key = app.config['STRIPE_SECRET_KEY']
@@ -58,6 +902,9 @@ class User(UserMixin, db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Verzia kolekcie projektov pre ETag /api/projects - zvyšuje sa pri každom zápise projektu
+    projects_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    projects_modified_at = db.Column(db.DateTime)
     projects = db.relationship('Project', backref='author', lazy=True, cascade='all, delete-orphan')
 
     def set_password(self, password):
@@ -84,14 +931,25 @@ class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
     api_key = db.Column(db.String(120), unique=True, nullable=False)
+    # SHA-256 kľúča - API autentifikácia hľadá projekt podľa digestu, nie podľa samotného kľúča
+    api_key_digest = db.Column(db.String(64))
     script_path = db.Column(db.String(200))
     is_active = db.Column(db.Boolean, default=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     payments = db.relationship('Payment', backref='project', lazy=True, cascade='all, delete-orphan')
     automation = db.relationship('Automation', backref='project', lazy=True, cascade='all, delete-orphan')
     ai_requests = db.relationship('AIRequest', backref='project', lazy=True, cascade='all, delete-orphan')
 
+    # Pokrýva aj samotné filtrovanie podľa user_id (ľavý prefix indexu)
+    __table_args__ = (
+        db.Index('ix_projects_user_active', 'user_id', 'is_active'),
+        # Keyset stránkovanie /api/projects podľa (created_at, id)
+        db.Index('ix_projects_user_created', 'user_id', 'created_at'),
+        db.Index('ix_projects_api_key_digest', 'api_key_digest', unique=True),
+    )
+
 class Payment(db.Model):
     __tablename__ = 'payments'
     id = db.Column(db.Integer, primary_key=True)
@@ -103,6 +961,11 @@ class Payment(db.Model):
     transaction_id = db.Column(db.String(120))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Keyset stránkovanie platieb projektu ide po (project_id, created_at)
+    __table_args__ = (
+        db.Index('ix_payments_project_created', 'project_id', 'created_at'),
+    )
+
 class Automation(db.Model):
     __tablename__ = 'automation'
     id = db.Column(db.Integer, primary_key=True)
@@ -113,6 +976,10 @@ class Automation(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index('ix_automation_project', 'project_id'),
+    )
+
 class AIRequest(db.Model):
     __tablename__ = 'ai_requests'
     id = db.Column(db.Integer, primary_key=True)
@@ -121,6 +988,664 @@ class AIRequest(db.Model):
     response = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # História AI požiadaviek projektu sa číta od najnovších
+    __table_args__ = (
+        db.Index('ix_ai_requests_project_created', 'project_id', 'created_at'),
+    )
+
+class ExportJob(db.Model):
+    __tablename__ = 'export_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    kind = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), default='pending')
+    filename = db.Column(db.String(200))
+    size = db.Column(db.Integer)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    expires_at = db.Column(db.DateTime)
+    # Lease bežiaceho jobu - worker ho obnovuje počas zápisu
+    heartbeat_at = db.Column(db.DateTime)
+
+class SchemaMigration(db.Model):
+    __tablename__ = 'schema_migrations'
+    version = db.Column(db.Integer, primary_key=True)
+    description = db.Column(db.String(200), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+# --- VYHĽADÁVANIE PROJEKTOV ---
+# Maximálny počet zoradených výsledkov, ktoré vyhľadávanie vráti dashboardu
+SEARCH_MAX_RESULTS = 500
+
+def normalize_search_text(text):
+    """Malé písmená bez diakritiky - 'Účet' aj 'ucet' nájdu to isté"""
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+def trigrams(text):
+    """Množina trigramov textu (s okrajmi slov) pre fuzzy porovnanie"""
+    padded = f'  {normalize_search_text(text)} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def search_terms(text):
+    """Slová hľadaného výrazu bez FTS operátorov"""
+    return re.findall(r'\w+', normalize_search_text(text))
+
+class TrigramIndex:
+    """Čisto Python trigramový index názvov s fuzzy a prefixovým hodnotením"""
+
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.names = {}
+        self.sizes = {}
+
+    def add(self, doc_id, text):
+        self.remove(doc_id)
+        grams = trigrams(text)
+        self.names[doc_id] = normalize_search_text(text)
+        self.sizes[doc_id] = len(grams)
+        for gram in grams:
+            self.postings[gram].add(doc_id)
+
+    def remove(self, doc_id):
+        name = self.names.pop(doc_id, None)
+        if name is None:
+            return
+        self.sizes.pop(doc_id, None)
+        for gram in trigrams(name):
+            ids = self.postings.get(gram)
+            if ids:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[gram]
+
+    def search(self, query, limit=SEARCH_MAX_RESULTS, threshold=0.3):
+        """Vráti ID zoradené podľa skóre - podreťazec a prefix majú prednosť pred podobnosťou"""
+        query_grams = trigrams(query)
+        needle = normalize_search_text(query).strip()
+        shared = Counter()
+        for gram in query_grams:
+            for doc_id in self.postings.get(gram, ()):
+                shared[doc_id] += 1
+
+        scored = []
+        for doc_id, count in shared.items():
+            name = self.names[doc_id]
+            score = 2 * count / (len(query_grams) + self.sizes[doc_id])
+            if needle and needle in name:
+                score += 1
+                if name.startswith(needle):
+                    score += 0.5
+            if score >= threshold:
+                scored.append((score, doc_id))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [doc_id for _, doc_id in scored[:limit]]
+
+def fuzzy_project_search(user_id, query, limit):
+    """Fuzzy vyhľadávanie nad názvami projektov používateľa cez dočasný trigramový index"""
+    index = TrigramIndex()
+    for project_id, name in db.session.query(Project.id, Project.name).filter(Project.user_id == user_id):
+        index.add(project_id, name)
+    return index.search(query, limit)
+
+class TrigramSearchBackend:
+    """Fallback pre databázy bez fulltextu - trigramový index v pamäti procesu
+
+    Index používateľa sa postaví pri prvom hľadaní a ďalej sa udržiava cez
+    ORM eventy. Zmeny z iných gunicorn workerov nevidí, preto je určený
+    pre SQLite bez FTS5 a vývojové prostredie.
+    """
+    name = 'trigram'
+
+    def __init__(self):
+        self.indexes = {}
+        self.lock = threading.Lock()
+
+    def setup(self, connection):
+        return False
+
+    def rebuild(self, connection):
+        with self.lock:
+            self.indexes.clear()
+
+    def drop(self, connection):
+        self.rebuild(connection)
+
+    def index(self, connection, project):
+        with self.lock:
+            user_index = self.indexes.get(project.user_id)
+            if user_index is not None:
+                user_index.add(project.id, project.name)
+
+    def remove(self, connection, project):
+        with self.lock:
+            user_index = self.indexes.get(project.user_id)
+            if user_index is not None:
+                user_index.remove(project.id)
+
+    def remove_many(self, connection, projects):
+        for project in projects:
+            self.remove(connection, project)
+
+    def search(self, user_id, query, limit):
+        with self.lock:
+            user_index = self.indexes.get(user_id)
+            if user_index is None:
+                user_index = TrigramIndex()
+                for project_id, name in db.session.query(Project.id, Project.name).filter(Project.user_id == user_id):
+                    user_index.add(project_id, name)
+                self.indexes[user_id] = user_index
+            return user_index.search(query, limit)
+
+class SQLiteFTSSearchBackend:
+    """SQLite FTS5 tabuľka projects_fts s prefixovým vyhľadávaním a bm25 rankingom"""
+    name = 'sqlite-fts5'
+
+    def setup(self, connection):
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+        ).first()
+        if exists:
+            return False
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE projects_fts USING fts5("
+            "name, user_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        return True
+
+    def rebuild(self, connection):
+        connection.exec_driver_sql('DELETE FROM projects_fts')
+        connection.exec_driver_sql('INSERT INTO projects_fts (rowid, name, user_id) SELECT id, name, user_id FROM projects')
+
+    def drop(self, connection):
+        connection.exec_driver_sql('DROP TABLE IF EXISTS projects_fts')
+
+    def index(self, connection, project):
+        self.remove(connection, project)
+        connection.execute(
+            db.text('INSERT INTO projects_fts (rowid, name, user_id) VALUES (:id, :name, :user_id)'),
+            {'id': project.id, 'name': project.name, 'user_id': project.user_id}
+        )
+
+    def remove(self, connection, project):
+        connection.execute(db.text('DELETE FROM projects_fts WHERE rowid = :id'), {'id': project.id})
+
+    def remove_many(self, connection, projects):
+        connection.execute(db.text('DELETE FROM projects_fts WHERE rowid IN :ids').bindparams(
+            db.bindparam('ids', expanding=True)), {'ids': [project.id for project in projects]})
+
+    def search(self, user_id, query, limit):
+        terms = search_terms(query)
+        if not terms:
+            return []
+        rows = db.session.execute(db.text(
+            'SELECT rowid FROM projects_fts WHERE projects_fts MATCH :match AND user_id = :user_id '
+            'ORDER BY bm25(projects_fts) LIMIT :limit'
+        ), {'match': ' '.join(f'"{term}"*' for term in terms), 'user_id': user_id, 'limit': limit})
+        ids = [row[0] for row in rows]
+        return ids or fuzzy_project_search(user_id, query, limit)
+
+class MySQLFulltextSearchBackend:
+    """MySQL FULLTEXT index nad projects.name, InnoDB ho udržiava sám"""
+    name = 'mysql-fulltext'
+
+    def setup(self, connection):
+        exists = connection.execute(db.text(
+            "SELECT COUNT(*) FROM information_schema.statistics WHERE table_schema = DATABASE() "
+            "AND table_name = 'projects' AND index_name = 'ix_projects_name_ft'"
+        )).scalar()
+        if exists:
+            return False
+        connection.exec_driver_sql('ALTER TABLE projects ADD FULLTEXT INDEX ix_projects_name_ft (name)')
+        return True
+
+    def rebuild(self, connection):
+        pass
+
+    def drop(self, connection):
+        # FULLTEXT index zaniká spolu s tabuľkou projects
+        pass
+
+    def index(self, connection, project):
+        pass
+
+    def remove(self, connection, project):
+        pass
+
+    def remove_many(self, connection, projects):
+        pass
+
+    def search(self, user_id, query, limit):
+        terms = search_terms(query)
+        if not terms:
+            return []
+        rows = db.session.execute(db.text(
+            'SELECT id FROM projects WHERE user_id = :user_id '
+            'AND MATCH(name) AGAINST(:match IN BOOLEAN MODE) '
+            'ORDER BY MATCH(name) AGAINST(:match IN BOOLEAN MODE) DESC LIMIT :limit'
+        ), {'match': ' '.join(f'+{term}*' for term in terms), 'user_id': user_id, 'limit': limit})
+        ids = [row[0] for row in rows]
+        return ids or fuzzy_project_search(user_id, query, limit)
+
+_search_backends = {}
+
+@lru_cache(maxsize=None)
+def sqlite_has_fts5():
+    """Zistí, či je SQLite skompilované s FTS5"""
+    try:
+        sqlite3.connect(':memory:').execute('CREATE VIRTUAL TABLE t USING fts5(x)')
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+def fulltext_engine(dialect_name):
+    """Dostupný fulltext pre dialekt: 'sqlite-fts5', 'mysql-fulltext' alebo None
+
+    SEARCH_BACKEND=trigram fulltext vypne a vynúti Python fallback.
+    """
+    if app.config.get('SEARCH_BACKEND', 'auto') == 'trigram':
+        return None
+    if dialect_name == 'sqlite' and sqlite_has_fts5():
+        return 'sqlite-fts5'
+    if dialect_name in ('mysql', 'mariadb'):
+        return 'mysql-fulltext'
+    return None
+
+def search_backend_for(dialect_name):
+    """Vyhľadávací backend projektov pre daný SQL dialekt"""
+    engine = fulltext_engine(dialect_name)
+    key = (dialect_name, engine)
+    if key not in _search_backends:
+        if engine == 'sqlite-fts5':
+            _search_backends[key] = SQLiteFTSSearchBackend()
+        elif engine == 'mysql-fulltext':
+            _search_backends[key] = MySQLFulltextSearchBackend()
+        else:
+            _search_backends[key] = TrigramSearchBackend()
+    return _search_backends[key]
+
+def get_search_backend():
+    return search_backend_for(db.engine.dialect.name)
+
+def setup_search_index(connection):
+    """Vytvorí vyhľadávací index a pri novom indexe ho naplní existujúcimi projektmi"""
+    backend = search_backend_for(connection.dialect.name)
+    if backend.setup(connection):
+        backend.rebuild(connection)
+
+@event.listens_for(Project, 'after_insert')
+def index_new_project(mapper, connection, target):
+    search_backend_for(connection.dialect.name).index(connection, target)
+
+@event.listens_for(Project, 'after_update')
+def reindex_project(mapper, connection, target):
+    if db.inspect(target).attrs.name.history.has_changes():
+        search_backend_for(connection.dialect.name).index(connection, target)
+
+@event.listens_for(Project, 'after_delete')
+def unindex_project(mapper, connection, target):
+    search_backend_for(connection.dialect.name).remove(connection, target)
+
+# --- VYHĽADÁVANIE V AI HISTÓRII ---
+def highlight_terms(text, terms):
+    """HTML-escapovaný text s <mark> okolo slov začínajúcich hľadanými výrazmi
+
+    Porovnáva sa bez diakritiky a veľkosti písmen, označujú sa však pôvodné znaky.
+    """
+    if not text:
+        return text
+    folded = []
+    offsets = []
+    for i, char in enumerate(text):
+        folded_char = normalize_search_text(char)
+        folded.append(folded_char)
+        offsets.extend([i] * len(folded_char))
+    folded = ''.join(folded)
+
+    pattern = re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\w*')
+    result = []
+    position = 0
+    for match in pattern.finditer(folded):
+        start, end = offsets[match.start()], offsets[match.end() - 1] + 1
+        result.append(str(escape(text[position:start])))
+        result.append(f'<mark>{escape(text[start:end])}</mark>')
+        position = end
+    result.append(str(escape(text[position:])))
+    return ''.join(result)
+
+class SQLiteFTSHistoryIndex:
+    """FTS5 tabuľka ai_requests_fts nad promptom a odpoveďou"""
+
+    def setup(self, connection):
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ai_requests_fts'"
+        ).first()
+        if exists:
+            return False
+        connection.exec_driver_sql(
+            "CREATE VIRTUAL TABLE ai_requests_fts USING fts5("
+            "prompt, response, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        return True
+
+    def rebuild(self, connection):
+        connection.exec_driver_sql('DELETE FROM ai_requests_fts')
+        connection.exec_driver_sql(
+            "INSERT INTO ai_requests_fts (rowid, prompt, response) "
+            "SELECT id, prompt, COALESCE(response, '') FROM ai_requests"
+        )
+
+    def drop(self, connection):
+        connection.exec_driver_sql('DROP TABLE IF EXISTS ai_requests_fts')
+
+    def index(self, connection, ai_request):
+        self.remove(connection, ai_request)
+        connection.execute(
+            db.text('INSERT INTO ai_requests_fts (rowid, prompt, response) VALUES (:id, :prompt, :response)'),
+            {'id': ai_request.id, 'prompt': ai_request.prompt, 'response': ai_request.response or ''}
+        )
+
+    def remove(self, connection, ai_request):
+        connection.execute(db.text('DELETE FROM ai_requests_fts WHERE rowid = :id'), {'id': ai_request.id})
+
+    def remove_projects(self, connection, project_ids):
+        """Odstráni z indexu celú AI históriu projektov jedným príkazom"""
+        connection.execute(db.text(
+            'DELETE FROM ai_requests_fts WHERE rowid IN (SELECT id FROM ai_requests WHERE project_id IN :ids)'
+        ).bindparams(db.bindparam('ids', expanding=True)), {'ids': list(project_ids)})
+
+    def match_clause(self, text):
+        terms = search_terms(text)
+        return AIRequest.id.in_(
+            db.text('SELECT rowid FROM ai_requests_fts WHERE ai_requests_fts MATCH :ai_match')
+            .bindparams(ai_match=' '.join(f'"{term}"*' for term in terms))
+            .columns(db.column('rowid'))
+        )
+
+class MySQLFulltextHistoryIndex:
+    """MySQL FULLTEXT index nad (prompt, response), InnoDB ho udržiava sám"""
+
+    def setup(self, connection):
+        exists = connection.execute(db.text(
+            "SELECT COUNT(*) FROM information_schema.statistics WHERE table_schema = DATABASE() "
+            "AND table_name = 'ai_requests' AND index_name = 'ix_ai_requests_text_ft'"
+        )).scalar()
+        if exists:
+            return False
+        connection.exec_driver_sql('ALTER TABLE ai_requests ADD FULLTEXT INDEX ix_ai_requests_text_ft (prompt, response)')
+        return True
+
+    def rebuild(self, connection):
+        pass
+
+    def drop(self, connection):
+        pass
+
+    def index(self, connection, ai_request):
+        pass
+
+    def remove(self, connection, ai_request):
+        pass
+
+    def remove_projects(self, connection, project_ids):
+        pass
+
+    def match_clause(self, text):
+        terms = search_terms(text)
+        return db.text('MATCH(ai_requests.prompt, ai_requests.response) AGAINST(:ai_match IN BOOLEAN MODE)').bindparams(
+            ai_match=' '.join(f'+{term}*' for term in terms)
+        )
+
+class LikeHistoryIndex:
+    """Fallback bez fulltextu - LIKE nad AI požiadavkami jedného projektu"""
+
+    def setup(self, connection):
+        return False
+
+    def rebuild(self, connection):
+        pass
+
+    def drop(self, connection):
+        pass
+
+    def index(self, connection, ai_request):
+        pass
+
+    def remove(self, connection, ai_request):
+        pass
+
+    def remove_projects(self, connection, project_ids):
+        pass
+
+    def match_clause(self, text):
+        # LIKE neporovnáva bez diakritiky, preto sa hľadajú pôvodné slová
+        return db.and_(*[
+            db.or_(AIRequest.prompt.ilike(f'%{term}%'), AIRequest.response.ilike(f'%{term}%'))
+            for term in re.findall(r'\w+', text)
+        ])
+
+_history_indexes = {}
+
+def history_index_for(dialect_name):
+    """Index AI histórie pre daný SQL dialekt"""
+    engine = fulltext_engine(dialect_name)
+    key = (dialect_name, engine)
+    if key not in _history_indexes:
+        if engine == 'sqlite-fts5':
+            _history_indexes[key] = SQLiteFTSHistoryIndex()
+        elif engine == 'mysql-fulltext':
+            _history_indexes[key] = MySQLFulltextHistoryIndex()
+        else:
+            _history_indexes[key] = LikeHistoryIndex()
+    return _history_indexes[key]
+
+def get_history_index():
+    return history_index_for(db.engine.dialect.name)
+
+def setup_history_index(connection):
+    """Vytvorí index AI histórie a pri novom indexe ho naplní existujúcimi záznamami"""
+    index = history_index_for(connection.dialect.name)
+    if index.setup(connection):
+        index.rebuild(connection)
+
+@event.listens_for(AIRequest, 'after_insert')
+@event.listens_for(AIRequest, 'after_update')
+def index_ai_request(mapper, connection, target):
+    history_index_for(connection.dialect.name).index(connection, target)
+
+@event.listens_for(AIRequest, 'after_delete')
+def unindex_ai_request(mapper, connection, target):
+    history_index_for(connection.dialect.name).remove(connection, target)
+
+@event.listens_for(db.metadata, 'after_create')
+def create_search_indexes(target, connection, **kw):
+    setup_search_index(connection)
+    setup_history_index(connection)
+
+@event.listens_for(db.metadata, 'before_drop')
+def drop_search_indexes(target, connection, **kw):
+    search_backend_for(connection.dialect.name).drop(connection)
+    history_index_for(connection.dialect.name).drop(connection)
+
+# --- VERZIE PROJEKTOV (CONDITIONAL GET) ---
+# Zápis projektu zvýši verziu kolekcie používateľa, zmena platieb či automatizácií
+# posunie updated_at projektu. API podľa nich odpovie 304 bez dotazu na dáta.
+def bump_projects_version(connection, user_id):
+    users = User.__table__
+    connection.execute(users.update().where(users.c.id == user_id).values(
+        projects_version=users.c.projects_version + 1,
+        projects_modified_at=datetime.utcnow()
+    ))
+
+def touch_project(connection, project_id):
+    projects = Project.__table__
+    connection.execute(projects.update().where(projects.c.id == project_id).values(updated_at=datetime.utcnow()))
+
+@event.listens_for(Project, 'after_insert')
+@event.listens_for(Project, 'after_delete')
+def project_collection_changed(mapper, connection, target):
+    bump_projects_version(connection, target.user_id)
+
+@event.listens_for(Project, 'after_update')
+def project_row_changed(mapper, connection, target):
+    # after_update chodí aj pre objekty bez zmeny stĺpcov (napr. len zmenené kolekcie)
+    state = db.inspect(target)
+    if any(state.attrs[attr.key].history.has_changes() for attr in mapper.column_attrs):
+        bump_projects_version(connection, target.user_id)
+
+@event.listens_for(Payment, 'after_insert')
+@event.listens_for(Payment, 'after_delete')
+@event.listens_for(Automation, 'after_insert')
+@event.listens_for(Automation, 'after_delete')
+def project_counts_changed(mapper, connection, target):
+    touch_project(connection, target.project_id)
+
+def http_date(value):
+    """Naivný UTC datetime z DB -> aware, na celé sekundy (presnosť HTTP dátumu)"""
+    return value.replace(microsecond=0, tzinfo=timezone.utc) if value else None
+
+def with_validators(response, etag, last_modified=None):
+    """ETag, Last-Modified a Cache-Control: klient si uloží odpoveď, ale vždy ju revaliduje"""
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = http_date(last_modified)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def not_modified(etag, last_modified=None):
+    """304 odpoveď, ak má klient aktuálnu verziu (If-None-Match má prednosť pred If-Modified-Since)"""
+    if request.if_none_match:
+        # Slabé porovnanie - komprimovaná odpoveď nesie slabý ETag
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        fresh = http_date(last_modified) <= request.if_modified_since
+    else:
+        fresh = False
+    return with_validators(Response(status=304), etag, last_modified) if fresh else None
+
+def projects_version(user_id):
+    """(verzia, čas zmeny) kolekcie projektov
+
+    Číta sa cez tú istú (routovanú) session ako zoznam - pri zaostávajúcej replike
+    tak ETag nepredbehne telo odpovede.
+    """
+    return db.session.query(User.projects_version, User.projects_modified_at).filter(User.id == user_id).one()
+
+def projects_etag(user_id, version):
+    """ETag kolekcie projektov - verzia kolekcie a query string (iné parametre = iná reprezentácia)"""
+    etag = f'projects-{user_id}-{version or 0}'
+    if g.get('api_key_project_id'):
+        # Kľúč vidí len svoj projekt - iná reprezentácia než pre session
+        etag += f"-p{g.api_key_project_id}"
+    if request.query_string:
+        etag += '-' + hashlib.sha256(request.query_string).hexdigest()[:12]
+    return etag
+
+def project_etag(project):
+    return f'project-{project.id}-{project.updated_at.timestamp() if project.updated_at else 0}'
+
+# --- MIGRÁCIE ---
+# Nové databázy dostanú celú schému cez db.create_all(), migrácie dopĺňajú
+# indexy a tabuľky do existujúcich databáz. Každý krok je idempotentný.
+def create_indexes(*names):
+    """Migračný krok - vytvorí indexy deklarované na modeloch, ak ešte neexistujú"""
+    def upgrade(connection):
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                if index.name in names:
+                    index.create(connection, checkfirst=True)
+    return upgrade
+
+def create_tables(*models):
+    """Migračný krok - vytvorí tabuľky modelov, ak ešte neexistujú"""
+    def upgrade(connection):
+        for model in models:
+            model.__table__.create(connection, checkfirst=True)
+    return upgrade
+
+def add_columns(model, *names):
+    """Migračný krok - pridá stĺpce modelu, ktoré v tabuľke ešte chýbajú"""
+    def upgrade(connection):
+        table = model.__table__
+        existing = {column['name'] for column in db.inspect(connection).get_columns(table.name)}
+        for name in names:
+            if name in existing:
+                continue
+            column = table.c[name]
+            ddl = f'ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(dialect=connection.dialect)}'
+            if not column.nullable:
+                ddl += ' NOT NULL'
+            if column.server_default is not None:
+                ddl += f' DEFAULT {column.server_default.arg}'
+            connection.execute(db.text(ddl))
+    return upgrade
+
+def add_change_tracking(connection):
+    """Stĺpce pre conditional GET, existujúce projekty dostanú updated_at = created_at"""
+    add_columns(Project, 'updated_at')(connection)
+    add_columns(User, 'projects_version', 'projects_modified_at')(connection)
+    connection.execute(db.text('UPDATE projects SET updated_at = created_at WHERE updated_at IS NULL'))
+
+def add_api_key_digests(connection):
+    """Stĺpec a index api_key_digest, digesty existujúcich kľúčov sa dopočítajú"""
+    add_columns(Project, 'api_key_digest')(connection)
+    projects = Project.__table__
+    pending = connection.execute(db.select(projects.c.id, projects.c.api_key).where(projects.c.api_key_digest.is_(None))).all()
+    for project_id, key in pending:
+        connection.execute(projects.update().where(projects.c.id == project_id).values(api_key_digest=api_key_digest(key)))
+    create_indexes('ix_projects_api_key_digest')(connection)
+
+MIGRATIONS = [
+    (1, 'Index payments(project_id, created_at) pre keyset stránkovanie',
+     create_indexes('ix_payments_project_created')),
+    (2, 'Tabuľka export_jobs pre exporty na pozadí',
+     create_tables(ExportJob)),
+    (3, 'Indexy pre hot query paths (projekty, automatizácie, AI história)',
+     create_indexes('ix_projects_user_active', 'ix_automation_project', 'ix_ai_requests_project_created')),
+    (4, 'Fulltextový index názvov projektov pre vyhľadávanie na dashboarde',
+     setup_search_index),
+    (5, 'Fulltextový index promptov a odpovedí AI histórie',
+     setup_history_index),
+    (6, 'projects.updated_at a verzia kolekcie projektov používateľa pre ETag',
+     add_change_tracking),
+    (7, 'Index projects(user_id, created_at) pre keyset stránkovanie API',
+     create_indexes('ix_projects_user_created')),
+    (8, 'projects.api_key_digest s unikátnym indexom pre autentifikáciu API kľúčom',
+     add_api_key_digests),
+    (9, 'export_jobs.heartbeat_at pre lease bežiacich exportov',
+     add_columns(ExportJob, 'heartbeat_at')),
+]
+
+def run_migrations():
+    """Aplikuje čakajúce migrácie v poradí verzií, vráti zoznam aplikovaných verzií"""
+    SchemaMigration.__table__.create(db.engine, checkfirst=True)
+    applied = {version for (version,) in db.session.query(SchemaMigration.version)}
+    db.session.commit()
+
+    newly_applied = []
+    for version, description, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        with db.engine.begin() as connection:
+            upgrade(connection)
+            connection.execute(SchemaMigration.__table__.insert().values(
+                version=version,
+                description=description,
+                applied_at=datetime.utcnow()
+            ))
+        logger.info(f'Migration {version} applied: {description}')
+        newly_applied.append(version)
+    return newly_applied
+
+@app.cli.command('migrate')
+def migrate_command():
+    """flask migrate - aplikuje čakajúce migrácie databázy"""
+    applied = run_migrations()
+    print(f"✅ Aplikované migrácie: {applied}" if applied else "✅ Databáza je aktuálna")
+
 # --- FORMULÁRE ---
 class LoginForm(FlaskForm):
     username = StringField('Užívateľské meno', validators=[DataRequired()])
@@ -162,14 +1687,144 @@ class EditProjectForm(FlaskForm):
     is_active = SelectField('Stav', choices=[('True', 'Aktívny'), ('False', 'Neaktívny')], default='True')
     submit = SubmitField('Uložiť zmeny')
 
+# --- PROFILY NAČÍTANIA ---
+# Endpoint -> loader options pre vzťahy na Project. Vzťahy na modeloch ostávajú
+# lazy=True, views ich však načítavajú podľa profilu: kolekcie, ktoré šablóna
+# prechádza, jedným selectin dotazom dopredu; kolekcie, ktoré view nemá čo
+# načítavať, cez raiseload - nechcený lazy load (N+1) skončí chybou, nie tichým dotazom.
+QUERY_PROFILES = {
+    'payments': (
+        selectinload(Project.payments),
+        raiseload(Project.automation),
+        raiseload(Project.ai_requests),
+    ),
+    'edit_project': (
+        raiseload(Project.payments),
+        raiseload(Project.automation),
+        raiseload(Project.ai_requests),
+    ),
+}
+
+def load_profile(query, endpoint=None):
+    """Aplikuje na dotaz loader options profilu aktuálneho (alebo zadaného) endpointu"""
+    return query.options(*QUERY_PROFILES.get(endpoint or request.endpoint, ()))
+
+def project_counts(project_id):
+    """Počty platieb, automatizácií a AI požiadaviek projektu v jednom dotaze"""
+    def count_of(model):
+        return db.select(db.func.count(model.id)).where(model.project_id == project_id).scalar_subquery()
+
+    row = db.session.execute(db.select(
+        count_of(Payment).label('payments'),
+        count_of(Automation).label('automations'),
+        count_of(AIRequest).label('ai_requests')
+    )).one()
+    return row._asdict()
+
 # --- LOGIN MANAGER ---
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
 
+# --- API KĽÚČE ---
+# Stroje sa na /api/ endpointy prihlasujú hlavičkou X-API-Key namiesto session cookie.
+# Kľúč platí len pre svoj projekt; overený digest sa drží v Redis najviac
+# API_KEY_CACHE_SECONDS a zmena kľúča ho odtiaľ odstráni. Cache je len v Redis,
+# aby odvolanie platilo okamžite pre všetky gunicorn workery - bez Redis sa
+# kľúč overuje v DB pri každej požiadavke.
+API_KEY_HEADER = 'X-API-Key'
+
+def api_key_digest(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+def cache_api_key(digest, user_id, project_id):
+    if not redis_client:
+        return
+    try:
+        redis_client.setex(f'api_key:{digest}', int(app.config.get('API_KEY_CACHE_SECONDS', 60)), f'{user_id}:{project_id}')
+    except Exception as e:
+        logger.warning(f'Redis cache API kľúča zlyhala: {str(e)}')
+
+def cached_api_key(digest):
+    if not redis_client:
+        return None
+    try:
+        value = redis_client.get(f'api_key:{digest}')
+    except Exception:
+        return None
+    if not value:
+        return None
+    user_id, project_id = (int(part) for part in value.split(':'))
+    return user_id, project_id
+
+def forget_api_key(digest):
+    if redis_client:
+        try:
+            redis_client.delete(f'api_key:{digest}')
+        except Exception as e:
+            logger.warning(f'Redis cache API kľúča zlyhala: {str(e)}')
+
+def verify_api_key(key):
+    """Vráti (user_id, project_id) pre platný kľúč aktívneho projektu, inak None"""
+    digest = api_key_digest(key)
+    cached = cached_api_key(digest)
+    if cached:
+        return cached
+
+    row = db.session.query(Project.id, Project.user_id, Project.api_key_digest).filter(
+        Project.api_key_digest == digest,
+        Project.is_active.is_(True)
+    ).first()
+    if row is None or not hmac.compare_digest(row.api_key_digest, digest):
+        return None
+    cache_api_key(digest, row.user_id, row.id)
+    return row.user_id, row.id
+
+@event.listens_for(Project.api_key, 'set')
+def update_api_key_digest(target, value, oldvalue, initiator):
+    target.api_key_digest = api_key_digest(value) if value else None
+    if isinstance(oldvalue, str):
+        forget_api_key(api_key_digest(oldvalue))
+
+@event.listens_for(Project, 'after_delete')
+@event.listens_for(Project, 'after_update')
+def forget_project_api_key(mapper, connection, target):
+    # Zmazaný alebo deaktivovaný projekt nesmie ostať overený v cache
+    if target.api_key_digest:
+        forget_api_key(target.api_key_digest)
+
+@login_manager.request_loader
+def load_user_from_api_key(request):
+    key = request.headers.get(API_KEY_HEADER)
+    if not key or not request.path.startswith('/api/'):
+        return None
+    verified = verify_api_key(key)
+    if verified is None:
+        logger.warning(f'Neplatný API kľúč z {request.remote_addr} pre {request.path}')
+        return None
+    user_id, project_id = verified
+    g.api_key_project_id = project_id
+    g.api_key_digest = api_key_digest(key)
+    return db.session.get(User, user_id)
+
+@app.before_request
+def reject_invalid_api_key():
+    """Neplatný kľúč na API dostane 401 namiesto presmerovania na login"""
+    if request.path.startswith('/api/') and request.headers.get(API_KEY_HEADER) and not current_user.is_authenticated:
+        return jsonify({'error': 'Unauthorized', 'message': 'Neplatný API kľúč'}), 401
+
+def project_access_denied(project):
+    """Projekt patrí inému používateľovi alebo je request overený kľúčom iného projektu"""
+    return project.user_id != current_user.id or g.get('api_key_project_id', project.id) != project.id
+
+def api_key_forbidden(message):
+    """403 pre endpointy dostupné len cez session - API kľúč projektu nesmie vidieť celý účet"""
+    return jsonify({'error': 'Unauthorized', 'message': message}), 403
+
 # --- ROUTES ---
 @app.route('/')
 @login_required
+@replica_read
 def dashboard():
     """Hlavný dashboard zobrazujúci všetky projekty používateľa"""
     # Paginácia
@@ -177,13 +1832,17 @@ def dashboard():
     per_page = request.args.get('per_page', 10, type=int)
     search = request.args.get('search', '', type=str)
     
-    # Vyhľadávanie
+    # Vyhľadávanie cez fulltextový index, výsledky zoradené podľa relevancie
     query = Project.query.filter_by(user_id=current_user.id)
+    order = Project.created_at.desc()
     if search:
-        query = query.filter(Project.name.contains(search))
+        ids = get_search_backend().search(current_user.id, search, SEARCH_MAX_RESULTS)
+        query = query.filter(Project.id.in_(ids))
+        if ids:
+            order = db.case({project_id: rank for rank, project_id in enumerate(ids)}, value=Project.id)
     
     # Zoradenie a paginácia
-    projects = query.order_by(Project.created_at.desc()).paginate(
+    projects = query.order_by(order).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
@@ -235,7 +1894,7 @@ def run_script(project_id):
         script_full_path = os.path.join(app.config['UPLOAD_FOLDER'], project.script_path)
         if os.path.exists(script_full_path):
             try:
-                subprocess.Popen(['python3', script_full_path])
+                script_processes.append(subprocess.Popen(['python3', script_full_path]))
                 logger.info(f'Skript spustený: {script_full_path} pre projekt {project.name}')
                 flash(f'Skript {project.name} beží!', 'success')
             except Exception as e:
@@ -252,7 +1911,7 @@ def run_script(project_id):
 @login_required
 def payments(project_id):
     """Správa platieb pre projekt"""
-    project = Project.query.get_or_404(project_id)
+    project = load_profile(Project.query).get_or_404(project_id)
     if project.user_id != current_user.id:
         flash('Nemáš oprávnenie!', 'danger')
         return redirect(url_for('dashboard'))
@@ -266,11 +1925,12 @@ def payments(project_id):
 
             try:
                 # Vytvor platobný intent
-                intent = stripe.PaymentIntent.create(
-                    amount=int(float(form.amount.data) * 100),  # Stripe počíta v centoch
-                    currency='eur',
-                    metadata={'project_id': project_id}
-                )
+                with track_upstream('stripe'):
+                    intent = stripe.PaymentIntent.create(
+                        amount=int(float(form.amount.data) * 100),  # Stripe počíta v centoch
+                        currency='eur',
+                        metadata={'project_id': project_id}
+                    )
                 new_payment = Payment(
                     project_id=project_id,
                     amount=form.amount.data,
@@ -342,13 +2002,14 @@ def ai(project_id):
             http_client = httpx.Client(trust_env=False)
             client = OpenAI(api_key=app.config['OPENAI_API_KEY'], http_client=http_client)
 
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "user", "content": form.prompt.data}
-                ],
-                max_tokens=200
-            )
+            with track_upstream('openai'):
+                response = client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "user", "content": form.prompt.data}
+                    ],
+                    max_tokens=200
+                )
 
             ai_response = response.choices[0].message.content
 
@@ -405,182 +2066,12 @@ def login():
             flash('Nesprávne prihlasovacie údaje!', 'danger')
             return redirect(url_for('login'))
 
-    return render_template_string('''
-<!DOCTYPE html>
-<html lang="sk">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Prihlásenie - API Dashboard</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            margin: 0;
-            padding: 20px;
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }
-        .container {
-            background: white;
-            padding: 40px;
-            border-radius: 10px;
-            box-shadow: 0 15px 35px rgba(0,0,0,0.1);
-            width: 100%;
-            max-width: 400px;
-        }
-        .logo {
-            text-align: center;
-            font-size: 48px;
-            color: #667eea;
-            margin-bottom: 20px;
-        }
-        h1 {
-            text-align: center;
-            color: #333;
-            margin-bottom: 10px;
-            font-size: 24px;
-        }
-        .subtitle {
-            text-align: center;
-            color: #666;
-            margin-bottom: 30px;
-        }
-        .form-group {
-            margin-bottom: 20px;
-        }
-        label {
-            display: block;
-            margin-bottom: 8px;
-            color: #333;
-            font-weight: 500;
-        }
-        input[type="text"], input[type="password"] {
-            width: 100%;
-            padding: 12px 15px;
-            border: 2px solid #e1e5e9;
-            border-radius: 8px;
-            font-size: 16px;
-            box-sizing: border-box;
-            transition: border-color 0.3s ease;
-        }
-        input[type="text"]:focus, input[type="password"]:focus {
-            outline: none;
-            border-color: #667eea;
-        }
-        .input-group {
-            position: relative;
-        }
-        .input-icon {
-            position: absolute;
-            right: 15px;
-            top: 50%;
-            transform: translateY(-50%);
-            color: #999;
-            font-size: 18px;
-        }
-        .btn {
-            width: 100%;
-            padding: 12px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border: none;
-            border-radius: 8px;
-            font-size: 16px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: transform 0.2s ease;
-        }
-        .btn:hover {
-            transform: translateY(-2px);
-        }
-        .alert {
-            padding: 15px;
-            background: #d4edda;
-            border: 1px solid #c3e6cb;
-            border-radius: 8px;
-            margin-top: 20px;
-            color: #155724;
-        }
-        .alert strong {
-            display: block;
-            margin-bottom: 8px;
-            color: #0f5132;
-        }
-        code {
-            background: #f8f9fa;
-            padding: 2px 6px;
-            border-radius: 4px;
-            font-family: monospace;
-        }
-        .error {
-            padding: 15px;
-            background: #f8d7da;
-            border: 1px solid #f5c6cb;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            color: #721c24;
-        }
-        .success {
-            padding: 15px;
-            background: #d4edda;
-            border: 1px solid #c3e6cb;
-            border-radius: 8px;
-            margin-bottom: 20px;
-            color: #155724;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="logo">🚀</div>
-        <h1>API Dashboard</h1>
-        <p class="subtitle">Prihlás sa do svojho účtu</p>
-
-        {% if error %}
-        <div class="error">
-            {{ error }}
-        </div>
-        {% endif %}
-
-        {% if success %}
-        <div class="success">
-            {{ success }}
-        </div>
-        {% endif %}
-
-        <form method="POST">
-            <div class="form-group">
-                <label for="username">Užívateľské meno</label>
-                <div class="input-group">
-                    <input type="text" id="username" name="username" placeholder="Zadaj používateľské meno" required value="{{ username or '' }}">
-                    <span class="input-icon">👤</span>
-                </div>
-            </div>
-
-            <div class="form-group">
-                <label for="password">Heslo</label>
-                <div class="input-group">
-                    <input type="password" id="password" name="password" placeholder="Zadaj heslo" required>
-                    <span class="input-icon">🔒</span>
-                </div>
-            </div>
-
-            <button type="submit" class="btn">Prihlásiť</button>
-        </form>
-
-        <div class="alert">
-            <strong>Predvolené prihlasovacie údaje:</strong><br>
-            Užívateľ: <code>admin</code><br>
-            Heslo: <code>admin123</code><br>
-            <em>Zmeň heslo po prvom prihlásení!</em>
-        </div>
-    </div>
-</body>
-</html>
-''', error=get_flashed_messages(category_filter=['danger']), success=get_flashed_messages(category_filter=['success']), username=request.form.get('username', ''))
+    return render_template(
+        'login.html',
+        error=get_flashed_messages(category_filter=['danger']),
+        success=get_flashed_messages(category_filter=['success']),
+        username=request.form.get('username', '')
+    )
 
 @app.route('/logout')
 @login_required
@@ -636,7 +2127,7 @@ def delete_project(project_id):
 @login_required
 def edit_project(project_id):
     """Editácia projektu"""
-    project = Project.query.get_or_404(project_id)
+    project = load_profile(Project.query).get_or_404(project_id)
     if project.user_id != current_user.id:
         flash('Nemáš oprávnenie!', 'danger')
         return redirect(url_for('dashboard'))
@@ -658,7 +2149,8 @@ def edit_project(project_id):
             db.session.rollback()
             flash('Chyba pri ukladaní zmien. Skús to znova.', 'danger')
     
-    return render_template('projects/edit_project.html', form=form, project=project)
+    return render_template('projects/edit_project.html', form=form, project=project,
+                           stats=project_counts(project.id))
 
 @app.route('/projects/<int:project_id>/regenerate-key', methods=['POST'])
 @login_required
@@ -676,59 +2168,324 @@ def regenerate_api_key(project_id):
     flash(f'API kľúč bol regenerovaný! Nový kľúč: {project.api_key}', 'success')
     return redirect(url_for('dashboard'))
 
+# --- DTO PRE API A EXPORTY ---
+# Riadky stĺpcových dotazov sa pozične mapujú na objekty so __slots__ - žiadne ORM
+# identity v session, žiadny __dict__ na riadok. orjson/msgspec serializujú dataclassy
+# natívne, stdlib cez json_default. Poradie polí = poradie stĺpcov v dotaze.
+
+@dataclasses.dataclass
+class ProjectSummary:
+    """Položka /api/projects s predvolenými poliami"""
+    __slots__ = ('id', 'name', 'api_key', 'is_active', 'created_at')
+    id: int
+    name: str
+    api_key: str
+    is_active: bool
+    created_at: datetime
+
+    columns: ClassVar[tuple] = (Project.id, Project.name, Project.api_key, Project.is_active, Project.created_at)
+
+@dataclasses.dataclass
+class ProjectDetail:
+    """Detail projektu pre /api/project/<id> a /api/projects/batch"""
+    __slots__ = ('id', 'name', 'api_key', 'is_active', 'script_path', 'created_at', 'updated_at',
+                 'payments_count', 'automations_count')
+    id: int
+    name: str
+    api_key: str
+    is_active: bool
+    script_path: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    payments_count: int
+    automations_count: int
+
+    columns: ClassVar[tuple] = (Project.id, Project.name, Project.api_key, Project.is_active,
+                                Project.script_path, Project.created_at, Project.updated_at)
+
+@dataclasses.dataclass
+class ProjectExport:
+    __slots__ = ('id', 'name', 'api_key', 'script_path', 'is_active', 'created_at')
+    id: int
+    name: str
+    api_key: str
+    script_path: Optional[str]
+    is_active: bool
+    created_at: datetime
+
+    columns: ClassVar[tuple] = (Project.id, Project.name, Project.api_key, Project.script_path,
+                                Project.is_active, Project.created_at)
+
+@dataclasses.dataclass
+class AIRequestExport:
+    __slots__ = ('id', 'project_id', 'project', 'prompt', 'response', 'created_at')
+    id: int
+    project_id: int
+    project: str
+    prompt: str
+    response: Optional[str]
+    created_at: datetime
+
+@dataclasses.dataclass
+class AutomationExport:
+    __slots__ = ('id', 'project_id', 'project', 'script_name', 'schedule', 'is_active', 'last_run', 'created_at')
+    id: int
+    project_id: int
+    project: str
+    script_name: str
+    schedule: str
+    is_active: bool
+    last_run: Optional[datetime]
+    created_at: datetime
+
+# --- STREAMOVANÉ EXPORTY ---
+# Počet riadkov načítaných z DB naraz pri streamovaných exportoch
+EXPORT_BATCH_SIZE = 1000
+
+def streamed_export(chunks, mimetype, filename):
+    """Vráti streamovanú odpoveď s exportom (kompresiu za behu pridá compress_response)"""
+    headers = {'Content-Disposition': f'attachment; filename={filename}'}
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+def project_export_rows(user_id):
+    """Dávkovo načítané riadky projektov používateľa pre export"""
+    rows = db.session.query(*ProjectExport.columns).filter(
+        Project.user_id == user_id
+    ).order_by(Project.id).yield_per(EXPORT_BATCH_SIZE)
+
+    for row in rows:
+        yield ProjectExport(*row)
+
+def export_encoder():
+    """Enkóder položiek exportu aktívnym JSON backendom, kľúče v poradí polí DTO"""
+    return make_json_encoder(app.json.backend, sort_keys=False)
+
+def iter_ndjson(items):
+    """Jeden JSON objekt na riadok, chunky po EXPORT_BATCH_SIZE položkách"""
+    encode = export_encoder()
+    buffer = []
+    for item in items:
+        buffer.append(encode(item))
+        if len(buffer) >= EXPORT_BATCH_SIZE:
+            yield (b'\n'.join(buffer) + b'\n').decode('utf-8')
+            buffer = []
+    if buffer:
+        yield (b'\n'.join(buffer) + b'\n').decode('utf-8')
+
+def iter_json_array(items):
+    """JSON pole generované po chunkoch bez držania celého zoznamu v pamäti"""
+    encode = export_encoder()
+    yield '['
+    buffer = []
+    first = True
+    for item in items:
+        buffer.append(encode(item))
+        if len(buffer) >= EXPORT_BATCH_SIZE:
+            yield ('\n' if first else ',\n') + b',\n'.join(buffer).decode('utf-8')
+            buffer = []
+            first = False
+    if buffer:
+        yield ('\n' if first else ',\n') + b',\n'.join(buffer).decode('utf-8')
+    yield '\n]'
+
 @app.route('/export/projects')
 @login_required
+@replica_read
 def export_projects():
-    """Export projektov do JSON"""
-    projects = Project.query.filter_by(user_id=current_user.id).all()
-    data = [{
-        'id': p.id,
-        'name': p.name,
-        'api_key': p.api_key,
-        'script_path': p.script_path,
-        'is_active': p.is_active,
-        'created_at': p.created_at.isoformat()
-    } for p in projects]
-    
-    from flask import Response
-    import json
-    return Response(
-        json.dumps(data, indent=2, ensure_ascii=False),
-        mimetype='application/json',
-        headers={'Content-Disposition': 'attachment; filename=projects.json'}
-    )
+    """Export projektov do JSON (?format=json) alebo NDJSON (?format=ndjson)"""
+    export_format = request.args.get('format', 'json')
+    items = project_export_rows(current_user.id)
+
+    if export_format == 'ndjson':
+        return streamed_export(iter_ndjson(items), 'application/x-ndjson', 'projects.ndjson')
+    if export_format != 'json':
+        return bad_request('Podporované formáty exportu sú json a ndjson')
+    return streamed_export(iter_json_array(items), 'application/json', 'projects.json')
+
+def payment_export_query(user_id):
+    """Stĺpcový dotaz na platby používateľa s názvom projektu z toho istého JOINu"""
+    return db.session.query(
+        Payment.id,
+        Project.name.label('project'),
+        Payment.amount,
+        Payment.currency,
+        Payment.status,
+        Payment.gateway,
+        Payment.transaction_id,
+        Payment.created_at
+    ).join(Project, Payment.project_id == Project.id).filter(
+        Project.user_id == user_id
+    ).order_by(Payment.id).yield_per(EXPORT_BATCH_SIZE)
+
+def payment_csv_chunks(user_id):
+    """CSV platieb používateľa po chunkoch, názov projektu ide z toho istého dotazu"""
+    rows = payment_export_query(user_id)
 
-@app.route('/export/payments')
-@login_required
-def export_payments():
-    """Export platieb do CSV"""
-    payments = Payment.query.join(Project).filter(Project.user_id == current_user.id).all()
-    
-    import csv
-    from io import StringIO
-    from flask import Response
-    
     output = StringIO()
     writer = csv.writer(output)
     writer.writerow(['ID', 'Projekt', 'Suma', 'Mena', 'Status', 'Brána', 'Dátum'])
-    
-    for payment in payments:
+
+    for i, row in enumerate(rows, start=1):
         writer.writerow([
-            payment.id,
-            payment.project.name,
-            payment.amount,
-            payment.currency,
-            payment.status,
-            payment.gateway,
-            payment.created_at.strftime('%Y-%m-%d %H:%M:%S')
+            row.id,
+            row.project,
+            row.amount,
+            row.currency,
+            row.status,
+            row.gateway,
+            row.created_at.strftime('%Y-%m-%d %H:%M:%S')
         ])
-    
-    output.seek(0)
-    return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=payments.csv'}
-    )
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+
+    yield output.getvalue()
+
+def ai_request_export_query(user_id):
+    """Stĺpcový dotaz na históriu AI požiadaviek používateľa"""
+    return db.session.query(
+        AIRequest.id,
+        AIRequest.project_id,
+        Project.name.label('project'),
+        AIRequest.prompt,
+        AIRequest.response,
+        AIRequest.created_at
+    ).join(Project, AIRequest.project_id == Project.id).filter(
+        Project.user_id == user_id
+    ).order_by(AIRequest.id).yield_per(EXPORT_BATCH_SIZE)
+
+def ai_request_export_rows(user_id):
+    """Dávkovo načítaná história AI požiadaviek používateľa pre export"""
+    for row in ai_request_export_query(user_id):
+        yield AIRequestExport(*row)
+
+def automation_export_rows(user_id):
+    """Dávkovo načítané automatizácie a ich posledné behy pre export"""
+    rows = db.session.query(
+        Automation.id,
+        Automation.project_id,
+        Project.name,
+        Automation.script_name,
+        Automation.schedule,
+        Automation.is_active,
+        Automation.last_run,
+        Automation.created_at
+    ).join(Project, Automation.project_id == Project.id).filter(
+        Project.user_id == user_id
+    ).order_by(Automation.id).yield_per(EXPORT_BATCH_SIZE)
+
+    for row in rows:
+        yield AutomationExport(*row)
+
+@app.route('/export/payments')
+@login_required
+@replica_read
+def export_payments():
+    """Export platieb do CSV
+
+    Odpoveď sa streamuje po dávkach - riadky sa čítajú cez yield_per spolu s názvom
+    projektu v jednom dotaze, takže pamäť ostáva konštantná aj pri 100k+ platbách.
+    """
+    return streamed_export(payment_csv_chunks(current_user.id), 'text/csv', 'payments.csv')
+
+# --- STĹPCOVÝ EXPORT (ARROW/PARQUET) ---
+def columnar_schema(kind):
+    """Arrow schéma exportu so zachovanými typmi (Decimal, timestamp)"""
+    if kind == 'payments':
+        return pa.schema([
+            ('id', pa.int64()),
+            ('project', pa.string()),
+            ('amount', pa.decimal128(10, 2)),
+            ('currency', pa.string()),
+            ('status', pa.string()),
+            ('gateway', pa.string()),
+            ('transaction_id', pa.string()),
+            ('created_at', pa.timestamp('us'))
+        ])
+    return pa.schema([
+        ('id', pa.int64()),
+        ('project_id', pa.int64()),
+        ('project', pa.string()),
+        ('prompt', pa.string()),
+        ('response', pa.string()),
+        ('created_at', pa.timestamp('us'))
+    ])
+
+# Typ stĺpcového exportu -> stĺpcový dotaz pre user_id
+COLUMNAR_EXPORT_QUERIES = {
+    'payments': payment_export_query,
+    'ai': ai_request_export_query,
+}
+
+def iter_record_batches(rows, schema):
+    """Skladá riadky dotazu do Arrow RecordBatch po EXPORT_BATCH_SIZE"""
+    names = schema.names
+    columns = {name: [] for name in names}
+    count = 0
+    for row in rows:
+        for name in names:
+            columns[name].append(getattr(row, name))
+        count += 1
+        if count >= EXPORT_BATCH_SIZE:
+            yield pa.RecordBatch.from_pydict(columns, schema=schema)
+            columns = {name: [] for name in names}
+            count = 0
+    if count:
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+def arrow_stream_chunks(batches, schema):
+    """Arrow IPC stream - každý RecordBatch sa posiela ako samostatný chunk"""
+    buffer = BytesIO()
+
+    def drain():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    writer = pa.ipc.new_stream(buffer, schema)
+    for batch in batches:
+        writer.write_batch(batch)
+        yield drain()
+    writer.close()
+    yield drain()
+
+@app.route('/export/<kind>/columnar')
+@login_required
+@replica_read
+def export_columnar(kind):
+    """Stĺpcový export platieb alebo AI požiadaviek (?format=arrow|parquet)
+
+    Vyžaduje pyarrow. Typy ostávajú zachované (suma ako decimal128(10,2),
+    dátumy ako timestamp), takže pandas.read_parquet/read_feather nemusí nič parsovať.
+    """
+    if kind not in COLUMNAR_EXPORT_QUERIES:
+        abort(404)
+    if pa is None:
+        return jsonify({'error': 'Not implemented', 'message': 'Stĺpcový export vyžaduje balík pyarrow'}), 501
+
+    export_format = request.args.get('format', 'parquet')
+    schema = columnar_schema(kind)
+    batches = iter_record_batches(COLUMNAR_EXPORT_QUERIES[kind](current_user.id), schema)
+
+    if export_format == 'arrow':
+        return Response(
+            stream_with_context(arrow_stream_chunks(batches, schema)),
+            mimetype='application/vnd.apache.arrow.stream',
+            headers={'Content-Disposition': f'attachment; filename={kind}.arrows'}
+        )
+    if export_format != 'parquet':
+        return bad_request('Podporované formáty sú parquet a arrow')
+
+    # Parquet potrebuje footer na konci súboru, preto sa zapisuje do dočasného súboru
+    artifact = tempfile.TemporaryFile()
+    with pq.ParquetWriter(artifact, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    artifact.seek(0)
+    return send_file(artifact, mimetype='application/vnd.apache.parquet',
+                     as_attachment=True, download_name=f'{kind}.parquet')
 
 @app.route('/favicon.ico')
 def favicon():
@@ -775,10 +2532,15 @@ def rate_limit(max_per_minute=60):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             if redis_client:
-                key = f"rate_limit:{request.remote_addr}:{f.__name__}"
+                # Requesty s API kľúčom majú vlastný bucket pre každý kľúč
+                identity = f"key:{g.api_key_digest[:16]}" if g.get('api_key_digest') else request.remote_addr
+                key = f"rate_limit:{identity}:{f.__name__}"
+                started = time.perf_counter()
                 current = redis_client.get(key)
+                metrics.observe('redis_command_duration_seconds', time.perf_counter() - started, {'command': 'get'})
                 
                 if current and int(current) >= max_per_minute:
+                    metrics.inc('rate_limit_rejections_total', {'endpoint': request.endpoint or f.__name__})
                     return jsonify({
                         'error': 'Rate limit exceeded',
                         'message': f'Maximum {max_per_minute} requests per minute allowed'
@@ -787,162 +2549,1036 @@ def rate_limit(max_per_minute=60):
                 pipe = redis_client.pipeline()
                 pipe.incr(key)
                 pipe.expire(key, 60)  # 60 sekúnd
+                started = time.perf_counter()
                 pipe.execute()
+                metrics.observe('redis_command_duration_seconds', time.perf_counter() - started, {'command': 'pipeline'})
             
             return f(*args, **kwargs)
         return decorated_function
     return decorator
 
 # --- API DOCUMENTATION ---
-@app.route('/api/docs', methods=['GET'])
-def api_docs():
-    """API dokumentácia endpoint"""
-    docs = {
+# Dokumentácia sa skladá z app.url_map a docstringov views, raz za proces
+API_DOCS_PREFIXES = ('/api', '/health', '/metrics')
+API_DOCS_MAX_AGE = 3600
+
+API_DOCS_RATE_LIMITING = {
+    'description': 'API endpointy majú rate limiting 60 požiadavok za minútu',
+    'headers': {
+        'X-RateLimit-Limit': '60',
+        'X-RateLimit-Remaining': 'počet zostávajúcich požiadavok'
+    }
+}
+
+API_DOCS_AUTHENTICATION = {
+    'description': 'Používa Flask-Login session cookies, /api/ endpointy prijímajú aj hlavičku X-API-Key',
+    'required': 'Pre väčšinu endpointov je potrebné prihlásenie',
+    'api_key': 'Kľúč projektu platí len pre jeho projekt a má vlastný rate limit'
+}
+
+# Kód vnútorných funkcií dekorátorov - podľa neho sa v reťazci __wrapped__ spozná použitý dekorátor
+LOGIN_REQUIRED_CODE = login_required(lambda: None).__code__
+RATE_LIMIT_CODE = rate_limit()(lambda: None).__code__
+
+def view_decorators(view):
+    """Funkcie v reťazci dekorátorov view (od vonkajšej po pôvodnú)"""
+    chain = []
+    while view is not None:
+        chain.append(view)
+        view = getattr(view, '__wrapped__', None)
+    return chain
+
+def parse_view_docstring(view):
+    """Z docstringu: prvý riadok je popis, odsek 'Parametre: ...' zoznam parametrov, zvyšok poznámky"""
+    summary, _, rest = inspect.cleandoc(view.__doc__ or '').partition('\n')
+    parameters, notes = [], []
+    for paragraph in rest.strip().split('\n\n'):
+        paragraph = ' '.join(paragraph.split())
+        match = re.match(r'Parametre:\s*((?:[^.(]|\([^)]*\))*)\.?\s*(.*)', paragraph)
+        if match:
+            # Zoznam končí prvou bodkou mimo zátvoriek, čiarky v zátvorkách patria k popisu parametra
+            parameters.extend(name.strip() for name in re.split(r',\s*(?![^()]*\))', match.group(1)) if name.strip())
+            paragraph = match.group(2)
+        if paragraph:
+            notes.append(paragraph)
+    return summary.strip(), parameters, ' '.join(notes)
+
+def describe_endpoint(rule):
+    view = app.view_functions[rule.endpoint]
+    chain = view_decorators(view)
+    summary, parameters, notes = parse_view_docstring(chain[-1])
+
+    entry = {
+        'description': summary,
+        'authentication': any(fn.__code__ is LOGIN_REQUIRED_CODE for fn in chain)
+    }
+    for fn in chain:
+        if fn.__code__ is RATE_LIMIT_CODE:
+            entry['rate_limit'] = f"{inspect.getclosurevars(fn).nonlocals['max_per_minute']}/min"
+    if rule.arguments:
+        entry['path_parameters'] = sorted(rule.arguments)
+    if parameters:
+        entry['parameters'] = parameters
+    if notes:
+        entry['notes'] = notes
+    return entry
+
+def build_api_docs(base_url):
+    endpoints = {}
+    for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if not rule.rule.startswith(API_DOCS_PREFIXES):
+            continue
+        path = re.sub(r'<(?:[^:>]+:)?([^>]+)>', r'<\1>', rule.rule)
+        entry = describe_endpoint(rule)
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            endpoints[f'{method} {path}'] = entry
+
+    return {
         'title': 'VPS Dashboard API Documentation',
         'version': '1.0.0',
-        'base_url': request.url_root.rstrip('/'),
-        'endpoints': {
-            'GET /api/health': {
-                'description': 'Health check endpoint pre monitoring',
-                'authentication': False,
-                'response': {
-                    'status': 'healthy|degraded',
-                    'timestamp': 'ISO datetime',
-                    'services': {
-                        'database': 'status',
-                        'redis': 'status',
-                        'stripe': 'status',
-                        'openai': 'status'
-                    }
-                }
-            },
-            'GET /api/projects': {
-                'description': 'Získanie zoznamu projektov používateľa',
-                'authentication': True,
-                'response': [{
-                    'id': 'integer',
-                    'name': 'string',
-                    'api_key': 'string',
-                    'is_active': 'boolean',
-                    'created_at': 'ISO datetime'
-                }]
-            },
-            'GET /api/project/<id>': {
-                'description': 'Získanie detailu projektu',
-                'authentication': True,
-                'parameters': {
-                    'id': 'integer - ID projektu'
-                },
-                'response': {
-                    'id': 'integer',
-                    'name': 'string',
-                    'api_key': 'string',
-                    'is_active': 'boolean',
-                    'script_path': 'string',
-                    'created_at': 'ISO datetime',
-                    'payments_count': 'integer',
-                    'automations_count': 'integer'
-                }
-            }
-        },
-        'rate_limiting': {
-            'description': 'API endpointy majú rate limiting 60 požiadavok za minútu',
-            'headers': {
-                'X-RateLimit-Limit': '60',
-                'X-RateLimit-Remaining': 'počet zostávajúcich požiadavok'
-            }
-        },
-        'authentication': {
-            'description': 'Používa Flask-Login session cookies',
-            'required': 'Pre väčšinu endpointov je potrebné prihlásenie'
-        }
+        'base_url': base_url,
+        'endpoints': endpoints,
+        'rate_limiting': API_DOCS_RATE_LIMITING,
+        'authentication': API_DOCS_AUTHENTICATION
     }
-    return jsonify(docs)
+
+@lru_cache(maxsize=8)
+def api_docs_payload(base_url):
+    """Serializovaná dokumentácia a jej ETag pre daný base_url"""
+    body = app.json.dumps(build_api_docs(base_url)).encode('utf-8')
+    return body, hashlib.sha256(body).hexdigest()[:32]
+
+@app.route('/api/docs', methods=['GET'])
+def api_docs():
+    """API dokumentácia endpoint
+
+    Odpoveď má silný ETag, na If-None-Match vracia 304. Verejne cachovateľná
+    je len s nastaveným PUBLIC_BASE_URL.
+    """
+    base_url = app.config.get('PUBLIC_BASE_URL', '').rstrip('/')
+    body, etag = api_docs_payload(base_url or request.url_root.rstrip('/'))
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    if base_url:
+        response.cache_control.public = True
+    else:
+        # base_url z hlavičky Host - zdieľaná cache by podvrhnutú adresu servírovala všetkým
+        response.cache_control.private = True
+        response.vary.add('Host')
+    response.cache_control.max_age = API_DOCS_MAX_AGE
+    return response.make_conditional(request)
 
 # --- HEALTH CHECK ---
+# Výsledky sond počíta vlákno na pozadí, endpointy vracajú len cache
+health_state = {'result': None, 'thread': None}
+health_lock = threading.Lock()
+health_stop = threading.Event()
+
+def probe_database():
+    with db.engine.connect() as connection:
+        connection.execute(db.text('SELECT 1'))
+    return 'connected'
+
+def probe_redis():
+    if not redis_client:
+        return None
+    redis_client.ping()
+    return 'connected'
+
+def probe_replica():
+    if get_replica_engine() is None:
+        return None
+    lag = replica_lag()
+    if lag is None:
+        raise RuntimeError('unavailable')
+    return f'lag {lag:.1f}s'
+
+def probe_stripe():
+    return 'configured' if app.config.get('STRIPE_SECRET_KEY') else None
+
+def probe_openai():
+    return 'configured' if app.config.get('OPENAI_API_KEY') else None
+
+# (názov, sonda, kritická pre readiness) - sonda vráti popis, None ak služba nie je nakonfigurovaná
+HEALTH_PROBES = [
+    ('database', probe_database, True),
+    ('redis', probe_redis, False),
+    ('database_replica', probe_replica, False),
+    ('stripe', probe_stripe, False),
+    ('openai', probe_openai, False),
+]
+
+def run_health_probes():
+    """Spustí všetky sondy, zmeria ich latenciu a uloží výsledok do cache"""
+    checks = {}
+    for name, probe, critical in HEALTH_PROBES:
+        started = time.perf_counter()
+        try:
+            detail = probe()
+            status = 'ok' if detail else 'not configured'
+        except Exception as e:
+            detail = f'error: {str(e)}'
+            status = 'error'
+        latency = time.perf_counter() - started
+        metrics.observe('health_probe_duration_seconds', latency, {'dependency': name})
+        checks[name] = {
+            'status': status,
+            'detail': detail or 'not configured',
+            'latency_ms': round(latency * 1000, 2),
+            'critical': critical
+        }
+
+    result = {
+        'checked_at': datetime.utcnow().isoformat(),
+        'checked_monotonic': time.monotonic(),
+        'checks': checks
+    }
+    health_state['result'] = result
+    return result
+
+def health_refresher():
+    """Slučka vlákna: sondy každých HEALTH_CHECK_INTERVAL sekúnd"""
+    while not health_stop.is_set():
+        with app.app_context():
+            try:
+                run_health_probes()
+            except Exception as e:
+                logger.error(f'Health refresher zlyhal: {str(e)}', exc_info=True)
+        health_stop.wait(app.config.get('HEALTH_CHECK_INTERVAL', 10))
+
+def ensure_health_refresher():
+    """Vlákno sa spúšťa až pri prvom health requeste - po forku v každom gunicorn workeri"""
+    with health_lock:
+        thread = health_state['thread']
+        if thread is None or not thread.is_alive():
+            health_stop.clear()
+            thread = threading.Thread(target=health_refresher, name='health-refresher', daemon=True)
+            thread.start()
+            health_state['thread'] = thread
+
+def cached_health():
+    """Posledný výsledok sond; pri HEALTH_CHECK_INTERVAL 0 sa sondy spúšťajú priamo"""
+    if app.config.get('HEALTH_CHECK_INTERVAL', 10) <= 0:
+        return run_health_probes()
+
+    ensure_health_refresher()
+    result = health_state['result']
+    if result is None:
+        # Prvý request pred dobehnutím vlákna
+        result = run_health_probes()
+    return result
+
+def health_age(result):
+    return time.monotonic() - result['checked_monotonic']
+
+@app.route('/health/live', methods=['GET'])
+def health_live():
+    """Liveness - proces beží a odpovedá, bez volania závislostí"""
+    return jsonify({'status': 'healthy', 'timestamp': datetime.utcnow().isoformat()})
+
+@app.route('/health/ready', methods=['GET'])
+def health_ready():
+    """Readiness - kritické závislosti sú podľa cache v poriadku a cache nie je zastaraná"""
+    result = cached_health()
+    failing = [name for name, check in result['checks'].items()
+               if check['critical'] and check['status'] == 'error']
+    stale = health_age(result) > app.config.get('HEALTH_STALE_SECONDS', 30)
+    ready = not failing and not stale
+
+    return jsonify({
+        'status': 'ready' if ready else 'unavailable',
+        'timestamp': datetime.utcnow().isoformat(),
+        'checked_at': result['checked_at'],
+        'failing': failing,
+        'stale': stale
+    }), 200 if ready else 503
+
 @app.route('/health', methods=['GET'])
 @app.route('/api/health', methods=['GET'])
+@app.route('/health/deep', methods=['GET'])
 def health_check():
-    """Health check endpoint pre monitoring"""
+    """Health check endpoint pre monitoring - detail všetkých závislostí z cache"""
+    result = cached_health()
+    degraded = any(check['critical'] and check['status'] == 'error' for check in result['checks'].values())
+
     health_status = {
-        'status': 'healthy',
+        'status': 'degraded' if degraded else 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
+        'checked_at': result['checked_at'],
+        'age_seconds': round(health_age(result), 2),
         'version': '1.0.0',
-        'services': {}
+        'services': {name: check['detail'] for name, check in result['checks'].items()},
+        'checks': result['checks'],
+        'database_pool': pool_stats()
     }
-    
-    # Kontrola databázy
-    try:
-        db.session.execute(db.text('SELECT 1'))
-        health_status['services']['database'] = 'connected'
-    except Exception as e:
-        health_status['status'] = 'degraded'
-        health_status['services']['database'] = f'error: {str(e)}'
-    
-    # Kontrola Redis
+
+    status_code = 200 if health_status['status'] == 'healthy' else 503
+    return jsonify(health_status), status_code
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus metriky zo všetkých gunicorn workerov (METRICS_DIR)"""
+    token = app.config.get('METRICS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    refresh_runtime_gauges()
     if redis_client:
+        started = time.perf_counter()
         try:
             redis_client.ping()
-            health_status['services']['redis'] = 'connected'
+            metrics.observe('redis_command_duration_seconds', time.perf_counter() - started, {'command': 'ping'})
         except Exception as e:
-            health_status['services']['redis'] = f'error: {str(e)}'
-    else:
-        health_status['services']['redis'] = 'not configured'
-    
-    # Kontrola Stripe
-    if app.config.get('STRIPE_SECRET_KEY'):
-        health_status['services']['stripe'] = 'configured'
-    else:
-        health_status['services']['stripe'] = 'not configured'
-    
-    # Kontrola OpenAI
-    if app.config.get('OPENAI_API_KEY'):
-        health_status['services']['openai'] = 'configured'
-    else:
-        health_status['services']['openai'] = 'not configured'
-    
-    status_code = 200 if health_status['status'] == 'healthy' else 503
-    return jsonify(health_status), status_code
+            logger.warning(f'Redis ping pre metriky zlyhal: {str(e)}')
+
+    body = render_prometheus(*merge_metric_snapshots(collect_metric_snapshots()))
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/metrics/db', methods=['GET'])
+@login_required
+def api_db_metrics():
+    """SQL štatistiky podľa endpointu (počty dotazov, čas v DB, pomalé dotazy) a stav poolu
+
+    Štatistiky sú za celý proces, preto ich vidí len administrátor.
+    """
+    if g.get('api_key_project_id'):
+        return api_key_forbidden('Metriky databázy nie sú dostupné cez API kľúč projektu')
+    if not current_user.is_admin:
+        return jsonify({'error': 'Unauthorized', 'message': 'Metriky databázy vidí len administrátor'}), 403
+    with sql_stats_lock:
+        endpoints = {
+            endpoint: {
+                **stats,
+                'avg_statements': round(stats['statements'] / stats['requests'], 2),
+                'avg_db_time_ms': round(stats['db_time_ms'] / stats['requests'], 2),
+                'db_time_ms': round(stats['db_time_ms'], 2)
+            }
+            for endpoint, stats in sql_endpoint_stats.items()
+        }
+    return jsonify({
+        'slow_query_ms': app.config.get('SLOW_QUERY_MS', 200),
+        'statement_budget': app.config.get('SQL_STATEMENT_BUDGET', 20),
+        'endpoints': endpoints,
+        'pool': pool_stats()
+    })
+
+# --- API STRÁNKOVANIE ---
+API_PAGE_LIMIT_DEFAULT = 50
+API_PAGE_LIMIT_MAX = 200
+
+def encode_cursor(*values):
+    """Zakóduje hodnoty posledného riadku stránky do nepriehľadného kurzora"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Dekóduje kurzor na zoznam hodnôt, pri neplatnom vstupe vyhodí ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError('Neplatný kurzor')
+    if not isinstance(values, list):
+        raise ValueError('Neplatný kurzor')
+    return values
+
+def apply_keyset_cursor(query, created_column, id_column):
+    """Zoradí dotaz od najnovších a obmedzí ho na riadky za kurzorom (created_at, id)
+
+    Pri neplatnom kurzore vyhodí ValueError.
+    """
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            last_created, last_id = decode_cursor(cursor)
+            last_created = datetime.fromisoformat(last_created)
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            raise ValueError('Neplatný kurzor')
+        query = query.filter(db.or_(
+            created_column < last_created,
+            db.and_(created_column == last_created, id_column < last_id)
+        ))
+    return query.order_by(created_column.desc(), id_column.desc())
+
+def fetch_keyset_page(query, limit):
+    """Načíta limit + 1 riadkov, vráti stránku a kurzor na ďalšiu (alebo None)"""
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+def parse_page_limit():
+    """Načíta parameter limit z requestu a orezáva ho na povolený rozsah"""
+    limit = request.args.get('limit', API_PAGE_LIMIT_DEFAULT, type=int)
+    return max(1, min(limit, API_PAGE_LIMIT_MAX))
+
+# Stĺpce, ktoré môže klient vybrať cez fields= v /api/projects
+API_PROJECT_COLUMNS = {
+    'id': Project.id,
+    'name': Project.name,
+    'api_key': Project.api_key,
+    'is_active': Project.is_active,
+    'script_path': Project.script_path,
+    'created_at': Project.created_at,
+    'updated_at': Project.updated_at,
+}
+API_PROJECT_DEFAULT_FIELDS = ('id', 'name', 'api_key', 'is_active', 'created_at')
+
+def parse_project_fields():
+    """Načíta parameter fields, pri neznámom stĺpci vyhodí ValueError"""
+    requested = request.args.get('fields')
+    if not requested:
+        return list(API_PROJECT_DEFAULT_FIELDS)
+    fields = list(dict.fromkeys(field.strip() for field in requested.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in API_PROJECT_COLUMNS]
+    if unknown or not fields:
+        raise ValueError(f"Neznáme polia: {', '.join(unknown)}. Povolené: {', '.join(API_PROJECT_COLUMNS)}")
+    return fields
+
+def bad_request(message):
+    """JSON odpoveď pre neplatné parametre API požiadavky"""
+    return jsonify({'error': 'Bad request', 'message': message}), 400
 
 # --- API ENDPOINTS ---
 @app.route('/api/projects', methods=['GET'])
 @login_required
 @rate_limit(max_per_minute=60)
+@replica_read
 def api_projects():
-    """API endpoint pre zoznam projektov"""
-    projects = Project.query.filter_by(user_id=current_user.id).all()
-    return jsonify([{
-        'id': project.id,
-        'name': project.name,
-        'api_key': project.api_key,
-        'is_active': project.is_active,
-        'created_at': project.created_at.isoformat()
-    } for project in projects])
+    """API endpoint pre zoznam projektov s keyset stránkovaním
+
+    Parametre: limit (max 200), cursor (z hlavičky X-Next-Cursor), fields (čiarkou oddelené stĺpce, napr. id,name).
+    Telo je zoznam projektov od najnovších. Bez limit a cursor sa vráti celý zoznam ako pred
+    zavedením stránkovania; inak je ďalšia stránka v hlavičkách Link (rel=next) a X-Next-Cursor.
+    Odpoveď má ETag a Last-Modified podľa verzie kolekcie, na If-None-Match vracia 304 bez dotazu na projekty.
+    """
+    # Verzia sa číta pred zoznamom z tej istej databázy, telo je teda aspoň také nové ako ETag
+    version, modified_at = projects_version(current_user.id)
+    etag = projects_etag(current_user.id, version)
+    cached = not_modified(etag, modified_at)
+    if cached:
+        return cached
+
+    try:
+        fields = parse_project_fields()
+    except ValueError as e:
+        return bad_request(str(e))
+
+    # SELECT len vybraných stĺpcov, id a created_at sú potrebné pre kurzor
+    default_fields = fields == list(API_PROJECT_DEFAULT_FIELDS)
+    keys = list(dict.fromkeys(['id', 'created_at', *fields]))
+    columns = ProjectSummary.columns if default_fields else [API_PROJECT_COLUMNS[key] for key in keys]
+    query = db.session.query(*columns).filter(Project.user_id == current_user.id)
+    if g.get('api_key_project_id'):
+        query = query.filter(Project.id == g.api_key_project_id)
+    try:
+        query = apply_keyset_cursor(query, Project.created_at, Project.id)
+    except ValueError:
+        return bad_request('Neplatný kurzor')
+    # Existujúci klienti bez limit/cursor očakávajú celý zoznam - stránkuje sa len na požiadanie
+    if 'limit' in request.args or 'cursor' in request.args:
+        rows, next_cursor = fetch_keyset_page(query, parse_page_limit())
+    else:
+        rows, next_cursor = query.all(), None
+
+    if default_fields:
+        items = [ProjectSummary(*row) for row in rows]
+    else:
+        items = [dict(zip(keys, row)) for row in rows]
+        if len(keys) != len(fields):
+            items = [{field: item[field] for field in fields} for item in items]
+
+    response = jsonify(items)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+        next_url = url_for('api_projects', _external=True, **{**request.args.to_dict(), 'cursor': next_cursor})
+        response.headers['Link'] = f'<{next_url}>; rel="next"'
+    return with_validators(response, etag, modified_at)
+
+def grouped_project_counts(project_ids):
+    """Počty platieb a automatizácií pre viac projektov jedným dotazom (UNION ALL zoskupených COUNT)"""
+    counts = {project_id: {'payments_count': 0, 'automations_count': 0} for project_id in project_ids}
+    grouped = db.union_all(*(
+        db.select(model.project_id, db.literal(key).label('kind'), db.func.count().label('total'))
+        .where(model.project_id.in_(project_ids))
+        .group_by(model.project_id)
+        for model, key in ((Payment, 'payments_count'), (Automation, 'automations_count'))
+    ))
+    for project_id, kind, total in db.session.execute(grouped):
+        counts[project_id][kind] = total
+    return counts
+
+def project_detail_query():
+    """Stĺpce ProjectDetail a na začiatku user_id pre kontrolu prístupu (do odpovede nejde)"""
+    return db.session.query(Project.user_id, *ProjectDetail.columns)
+
+def project_detail(row, counts):
+    return ProjectDetail(*row[1:], **counts)
 
 @app.route('/api/project/<int:project_id>', methods=['GET'])
 @login_required
 @rate_limit(max_per_minute=60)
+@replica_read
 def api_project_detail(project_id):
-    """API endpoint pre detail projektu"""
+    """API endpoint pre detail projektu
+
+    Odpoveď má ETag a Last-Modified podľa updated_at projektu, na If-None-Match vracia 304 bez počítania platieb.
+    """
+    project = project_detail_query().filter(Project.id == project_id).first()
+    if project is None:
+        abort(404)
+    if project_access_denied(project):
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    etag = project_etag(project)
+    cached = not_modified(etag, project.updated_at)
+    if cached:
+        return cached
+
+    response = jsonify(project_detail(project, grouped_project_counts([project.id])[project.id]))
+    return with_validators(response, etag, project.updated_at)
+
+@app.route('/api/projects/batch', methods=['GET'])
+@login_required
+@rate_limit(max_per_minute=60)
+@replica_read
+def api_projects_batch():
+    """API endpoint pre detaily viacerých projektov naraz
+
+    Parametre: ids (čiarkou oddelené ID projektov, najviac 200).
+    Počty platieb a automatizácií všetkých projektov sa načítajú jedným zoskupeným dotazom.
+    """
+    try:
+        ids = list(dict.fromkeys(int(part) for part in request.args.get('ids', '').split(',') if part.strip()))
+    except ValueError:
+        return bad_request('Parameter ids musí byť zoznam celých čísel oddelených čiarkou')
+    if not ids:
+        return bad_request('Parameter ids je povinný')
+    if len(ids) > API_PAGE_LIMIT_MAX:
+        return bad_request(f'Najviac {API_PAGE_LIMIT_MAX} projektov naraz')
+
+    query = project_detail_query().filter(Project.id.in_(ids), Project.user_id == current_user.id)
+    if g.get('api_key_project_id'):
+        query = query.filter(Project.id == g.api_key_project_id)
+    projects = {row.id: row for row in query}
+    counts = grouped_project_counts(list(projects)) if projects else {}
+
+    return jsonify({
+        'items': [project_detail(projects[project_id], counts[project_id]) for project_id in ids if project_id in projects],
+        'missing': [project_id for project_id in ids if project_id not in projects]
+    })
+
+@app.route('/api/project/<int:project_id>/payments', methods=['GET'])
+@login_required
+@rate_limit(max_per_minute=60)
+@replica_read
+def api_project_payments(project_id):
+    """API endpoint pre zoznam platieb projektu s keyset stránkovaním
+
+    Parametre: limit, cursor, status, gateway, from, to (ISO dátum).
+    Platby sú zoradené od najnovších podľa (created_at, id), ďalšia stránka
+    sa načíta cez next_cursor bez OFFSET skenovania.
+    """
     project = Project.query.get_or_404(project_id)
-    if project.user_id != current_user.id:
+    if project_access_denied(project):
         return jsonify({'error': 'Unauthorized'}), 403
 
-    # Použijeme efektívne počítanie pomocou query namiesto len() na relationship
-    payments_count = db.session.query(Payment).filter_by(project_id=project.id).count()
-    automations_count = db.session.query(Automation).filter_by(project_id=project.id).count()
-    
+    limit = parse_page_limit()
+    query = Payment.query.filter(Payment.project_id == project_id)
+
+    status = request.args.get('status')
+    if status:
+        query = query.filter(Payment.status == status)
+    gateway = request.args.get('gateway')
+    if gateway:
+        query = query.filter(Payment.gateway == gateway)
+
+    try:
+        date_from = request.args.get('from')
+        if date_from:
+            query = query.filter(Payment.created_at >= datetime.fromisoformat(date_from))
+        date_to = request.args.get('to')
+        if date_to:
+            query = query.filter(Payment.created_at <= datetime.fromisoformat(date_to))
+    except ValueError:
+        return bad_request('Parametre from/to musia byť vo formáte ISO 8601')
+
+    try:
+        query = apply_keyset_cursor(query, Payment.created_at, Payment.id)
+    except ValueError:
+        return bad_request('Neplatný kurzor')
+    rows, next_cursor = fetch_keyset_page(query, limit)
+
     return jsonify({
-        'id': project.id,
-        'name': project.name,
-        'api_key': project.api_key,
-        'is_active': project.is_active,
-        'script_path': project.script_path,
-        'created_at': project.created_at.isoformat(),
-        'payments_count': payments_count,
-        'automations_count': automations_count
+        'items': [{
+            'id': payment.id,
+            'amount': payment.amount,
+            'currency': payment.currency,
+            'status': payment.status,
+            'gateway': payment.gateway,
+            'transaction_id': payment.transaction_id,
+            'created_at': payment.created_at
+        } for payment in rows],
+        'next_cursor': next_cursor,
+        'limit': limit
     })
 
+@app.route('/api/project/<int:project_id>/ai/history', methods=['GET'])
+@login_required
+@rate_limit(max_per_minute=60)
+@replica_read
+def api_ai_history(project_id):
+    """API endpoint pre históriu AI požiadaviek projektu
+
+    Parametre: q (fulltext nad promptom a odpoveďou, slová ako prefixy), limit, cursor.
+    Pri vyhľadávaní obsahuje každá položka aj highlight s <mark> okolo zhôd.
+    """
+    project = Project.query.get_or_404(project_id)
+    if project_access_denied(project):
+        return jsonify({'error': 'Unauthorized'}), 403
+
+    limit = parse_page_limit()
+    search = request.args.get('q', '')
+    terms = search_terms(search)
+    query = AIRequest.query.filter(AIRequest.project_id == project_id)
+    if terms:
+        query = query.filter(get_history_index().match_clause(search))
+
+    try:
+        query = apply_keyset_cursor(query, AIRequest.created_at, AIRequest.id)
+    except ValueError:
+        return bad_request('Neplatný kurzor')
+    rows, next_cursor = fetch_keyset_page(query, limit)
+
+    items = []
+    for ai_request in rows:
+        item = {
+            'id': ai_request.id,
+            'prompt': ai_request.prompt,
+            'response': ai_request.response,
+            'created_at': ai_request.created_at
+        }
+        if terms:
+            item['highlight'] = {
+                'prompt': highlight_terms(ai_request.prompt, terms),
+                'response': highlight_terms(ai_request.response, terms)
+            }
+        items.append(item)
+
+    return jsonify({'items': items, 'next_cursor': next_cursor, 'limit': limit})
+
+# --- HROMADNÉ OPERÁCIE S PROJEKTMI ---
+# Všetky položky sa overia naraz, platné sa zapíšu v jednej transakcii hromadnými
+# UPDATE/DELETE príkazmi. Tie obchádzajú mapper eventy, preto sa odvodené dáta
+# (verzia kolekcie, cache API kľúčov, fulltextové indexy) udržiavajú tu.
+BULK_MAX_ITEMS = 500
+
+def bulk_item_error(index, message, **extra):
+    return {'index': index, 'status': 'error', 'error': message, **extra}
+
+def bulk_owned_projects(items):
+    """Overí položky s ID projektu; vráti ({id: riadok projektu}, {index: chyba})"""
+    errors, seen = {}, set()
+    for index, item in enumerate(items):
+        project_id = item.get('id') if isinstance(item, dict) else item
+        if not isinstance(project_id, int) or isinstance(project_id, bool):
+            errors[index] = bulk_item_error(index, 'Chýba celočíselné id projektu')
+        elif project_id in seen:
+            errors[index] = bulk_item_error(index, 'Duplicitné id', id=project_id)
+        else:
+            seen.add(project_id)
+
+    ids = [item.get('id') if isinstance(item, dict) else item for index, item in enumerate(items) if index not in errors]
+    owned = {row.id: row for row in db.session.query(
+        Project.id, Project.user_id, Project.is_active, Project.api_key_digest
+    ).filter(Project.id.in_(ids), Project.user_id == current_user.id)} if ids else {}
+
+    for index, item in enumerate(items):
+        project_id = item.get('id') if isinstance(item, dict) else item
+        if index not in errors and project_id not in owned:
+            errors[index] = bulk_item_error(index, 'Projekt neexistuje', id=project_id)
+    return owned, errors
+
+def bulk_create(items):
+    errors, projects = {}, []
+    for index, item in enumerate(items):
+        name = item.get('name') if isinstance(item, dict) else None
+        script_path = item.get('script_path') if isinstance(item, dict) else None
+        if not isinstance(name, str) or not name.strip() or len(name) > 120:
+            errors[index] = bulk_item_error(index, 'Názov je povinný (najviac 120 znakov)')
+        elif script_path is not None and (not isinstance(script_path, str) or len(script_path) > 200):
+            errors[index] = bulk_item_error(index, 'script_path musí byť text (najviac 200 znakov)')
+        else:
+            projects.append((index, Project(
+                name=name.strip(),
+                script_path=script_path,
+                api_key=os.urandom(24).hex(),
+                user_id=current_user.id
+            )))
+
+    # ORM insert kvôli eventom (digest kľúča, vyhľadávací index); SQLAlchemy ho dávkuje (insertmanyvalues)
+    db.session.add_all([project for _, project in projects])
+    db.session.flush()
+    results = {index: {'index': index, 'status': 'ok', 'id': project.id, 'api_key': project.api_key}
+               for index, project in projects}
+    return results, errors
+
+def bulk_toggle(items):
+    owned, errors = bulk_owned_projects(items)
+    results, targets = {}, {True: [], False: []}
+    for index, item in enumerate(items):
+        if index in errors:
+            continue
+        project = owned[item.get('id') if isinstance(item, dict) else item]
+        requested = item.get('is_active') if isinstance(item, dict) else None
+        if requested is not None and not isinstance(requested, bool):
+            errors[index] = bulk_item_error(index, 'is_active musí byť true/false', id=project.id)
+            continue
+        # Bez is_active sa stav prepne
+        is_active = (not project.is_active) if requested is None else requested
+        targets[is_active].append(project.id)
+        results[index] = {'index': index, 'status': 'ok', 'id': project.id, 'is_active': is_active}
+
+    now = datetime.utcnow()
+    for is_active, ids in targets.items():
+        if ids:
+            Project.query.filter(Project.id.in_(ids)).update(
+                {'is_active': is_active, 'updated_at': now}, synchronize_session=False
+            )
+    for project in owned.values():
+        if project.api_key_digest:
+            forget_api_key(project.api_key_digest)
+    return results, errors
+
+def bulk_regenerate_keys(items):
+    owned, errors = bulk_owned_projects(items)
+    results, updates = {}, []
+    now = datetime.utcnow()
+    for index, item in enumerate(items):
+        if index in errors:
+            continue
+        project = owned[item.get('id') if isinstance(item, dict) else item]
+        key = os.urandom(24).hex()
+        updates.append({'id': project.id, 'api_key': key, 'api_key_digest': api_key_digest(key), 'updated_at': now})
+        results[index] = {'index': index, 'status': 'ok', 'id': project.id, 'api_key': key}
+
+    if updates:
+        # UPDATE podľa primárneho kľúča ako jeden executemany
+        db.session.execute(db.update(Project), updates)
+    for project in owned.values():
+        if project.api_key_digest:
+            forget_api_key(project.api_key_digest)
+    return results, errors
+
+def bulk_delete(items):
+    owned, errors = bulk_owned_projects(items)
+    ids = list(owned)
+    results = {index: {'index': index, 'status': 'ok', 'id': item.get('id') if isinstance(item, dict) else item}
+               for index, item in enumerate(items) if index not in errors}
+    if not ids:
+        return results, errors
+
+    connection = db.session.connection()
+    history_index_for(connection.dialect.name).remove_projects(connection, ids)
+    search_backend_for(connection.dialect.name).remove_many(connection, list(owned.values()))
+
+    # Kaskáda z modelov (cascade='all, delete-orphan') pri hromadnom DELETE neplatí
+    for model in (AIRequest, Payment, Automation):
+        model.query.filter(model.project_id.in_(ids)).delete(synchronize_session=False)
+    Project.query.filter(Project.id.in_(ids)).delete(synchronize_session=False)
+    for project in owned.values():
+        if project.api_key_digest:
+            forget_api_key(project.api_key_digest)
+    return results, errors
+
+BULK_ACTIONS = {
+    'create': bulk_create,
+    'toggle': bulk_toggle,
+    'regenerate-keys': bulk_regenerate_keys,
+    'delete': bulk_delete,
+}
+
+@app.route('/api/projects/bulk/<action>', methods=['POST'])
+@login_required
+@rate_limit(max_per_minute=10)
+def api_projects_bulk(action):
+    """Hromadné operácie s projektmi (create, toggle, regenerate-keys, delete)
+
+    Parametre: items (zoznam - pre create objekty {name, script_path}, inak id projektov alebo {id, is_active} pre toggle).
+    Neplatné položky sa vrátia s chybou, platné sa zapíšu v jednej transakcii. Vyžaduje prihlásenie cez session.
+    """
+    if action not in BULK_ACTIONS:
+        abort(404)
+    if g.get('api_key_project_id'):
+        return api_key_forbidden('Hromadné operácie nie sú dostupné cez API kľúč projektu')
+
+    payload = request.get_json(silent=True)
+    items = payload.get('items') if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        return bad_request('Telo musí obsahovať neprázdny zoznam items')
+    if len(items) > BULK_MAX_ITEMS:
+        return bad_request(f'Najviac {BULK_MAX_ITEMS} položiek naraz')
+
+    try:
+        results, errors = BULK_ACTIONS[action](items)
+        if results:
+            bump_projects_version(db.session.connection(), current_user.id)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Hromadná operácia {action} zlyhala pre používateľa {current_user.id}: {str(e)}', exc_info=True)
+        return jsonify({'error': 'Bulk operation failed', 'message': 'Žiadna zmena nebola uložená'}), 500
+
+    logger.info(f'Bulk {action}: {len(results)} applied, {len(errors)} failed, user {current_user.id}')
+    return jsonify({
+        'action': action,
+        'applied': len(results),
+        'failed': len(errors),
+        'results': [results.get(index) or errors[index] for index in range(len(items))]
+    })
+
+# --- EXPORTNÉ JOBY NA POZADÍ ---
+# Typ exportu -> (generátor chunkov pre user_id, prípona súboru)
+EXPORT_JOB_KINDS = {
+    'projects': (lambda user_id: iter_json_array(project_export_rows(user_id)), 'json'),
+    'payments': (payment_csv_chunks, 'csv'),
+    'ai': (lambda user_id: iter_ndjson(ai_request_export_rows(user_id)), 'ndjson'),
+    'automation': (lambda user_id: iter_ndjson(automation_export_rows(user_id)), 'ndjson'),
+}
+
+export_executor = ThreadPoolExecutor(
+    max_workers=app.config.get('EXPORT_WORKERS', 2),
+    thread_name_prefix='export'
+)
+metrics.set('export_queue_depth', 0)
+
+def export_job_path(job):
+    """Cesta k artefaktu exportného jobu v EXPORT_FOLDER"""
+    return os.path.join(app.config['EXPORT_FOLDER'], job.filename)
+
+def export_job_timeout():
+    return timedelta(minutes=app.config.get('EXPORT_JOB_TIMEOUT_MINUTES', 30))
+
+def export_job_lease():
+    return timedelta(seconds=app.config.get('EXPORT_JOB_LEASE_SECONDS', 120))
+
+def stale_export_jobs(now):
+    """Podmienka mŕtveho jobu: running bez heartbeatu dlhšie ako lease, pending po termíne"""
+    return db.or_(
+        db.and_(ExportJob.status == 'running',
+                db.func.coalesce(ExportJob.heartbeat_at, ExportJob.created_at) < now - export_job_lease()),
+        db.and_(ExportJob.status == 'pending', db.or_(
+            ExportJob.expires_at < now,
+            # Joby založené pred zavedením termínu pri založení
+            db.and_(ExportJob.expires_at.is_(None), ExportJob.created_at < now - export_job_timeout())
+        ))
+    )
+
+def fail_stale_export_jobs(now, job_id=None):
+    """Joby, ktorých worker zanikol (reštart, deploy), označí ako failed a zmaže ich .part
+
+    UPDATE je podmienený stavom aj heartbeatom, takže job, ktorý medzitým obnovil
+    lease, beží ďalej. Vráti počet označených jobov.
+    """
+    query = ExportJob.query.filter(stale_export_jobs(now))
+    if job_id is not None:
+        query = query.filter(ExportJob.id == job_id)
+    failed = 0
+    for job in query.all():
+        updated = ExportJob.query.filter(ExportJob.id == job.id, stale_export_jobs(now)).update({
+            'status': 'failed',
+            'error': 'Export nebol dokončený včas',
+            'finished_at': now,
+            # Záznam s chybou ešte chvíľu ostane, aby ju klient videl
+            'expires_at': now + timedelta(hours=app.config.get('EXPORT_TTL_HOURS', 24)),
+        }, synchronize_session=False)
+        if not updated:
+            continue
+        part = export_job_path(job) + '.part'
+        if os.path.exists(part):
+            os.remove(part)
+        logger.warning(f'Export job {job.id} ({job.kind}) of user {job.user_id} timed out')
+        failed += 1
+    db.session.commit()
+    return failed
+
+def renew_export_lease(job_id):
+    """Obnoví heartbeat bežiaceho jobu, False ak ho reaper medzitým označil ako failed
+
+    Zapisuje cez samostatné spojenie - session workera má otvorený prúdový dotaz exportu.
+    """
+    jobs = ExportJob.__table__
+    with db.engine.begin() as connection:
+        result = connection.execute(jobs.update().where(
+            jobs.c.id == job_id, jobs.c.status == 'running'
+        ).values(heartbeat_at=datetime.utcnow()))
+    return result.rowcount == 1
+
+def run_queued_export_job(job_id):
+    """Job vybraný z fronty executora - zníži gauge dĺžky exportnej fronty"""
+    metrics.add('export_queue_depth', -1)
+    run_export_job(job_id)
+
+def run_export_job(job_id):
+    """Vykoná exportný job - zapíše gzip artefakt a aktualizuje jeho stav
+
+    Počas zápisu obnovuje lease (heartbeat_at); stav done/failed zapíše len ak je job
+    stále running, takže neprepíše failed od reapera.
+    """
+    with app.app_context():
+        started = ExportJob.query.filter_by(id=job_id, status='pending').update(
+            {'status': 'running', 'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+        db.session.commit()
+        if not started:
+            return  # Job neexistuje alebo ho reaper už označil ako failed
+        job = db.session.get(ExportJob, job_id)
+
+        chunks, _ = EXPORT_JOB_KINDS[job.kind]
+        path = export_job_path(job)
+        heartbeat = export_job_lease().total_seconds() / 4
+        try:
+            os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+            last_beat = time.monotonic()
+            with gzip.open(path + '.part', 'wt', encoding='utf-8', newline='') as artifact:
+                for chunk in chunks(job.user_id):
+                    artifact.write(chunk)
+                    if time.monotonic() - last_beat >= heartbeat:
+                        if not renew_export_lease(job_id):
+                            raise RuntimeError('Export stratil lease, job bol označený ako failed')
+                        last_beat = time.monotonic()
+            os.replace(path + '.part', path)
+            result = {'status': 'done', 'size': os.path.getsize(path)}
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f'Export job {job_id} failed: {str(e)}', exc_info=True)
+            if os.path.exists(path + '.part'):
+                os.remove(path + '.part')
+            result = {'status': 'failed', 'error': str(e)}
+
+        finished_at = datetime.utcnow()
+        result.update(finished_at=finished_at,
+                      expires_at=finished_at + timedelta(hours=app.config.get('EXPORT_TTL_HOURS', 24)))
+        updated = ExportJob.query.filter_by(id=job_id, status='running').update(result, synchronize_session=False)
+        db.session.commit()
+        if not updated:
+            if result['status'] == 'done':
+                os.remove(path)
+            logger.warning(f'Export job {job_id} was reaped while running, result discarded')
+        elif result['status'] == 'done':
+            logger.info(f'Export job {job_id} ({job.kind}) finished for user {job.user_id}')
+
+def cleanup_expired_exports():
+    """Vymaže artefakty a záznamy exportných jobov po expirácii
+
+    Mŕtve pending/running joby (pozri stale_export_jobs) sa označia ako failed.
+    Osirelé .part súbory bez bežiaceho jobu staršie ako lease sa zmažú.
+    Vráti počet spracovaných jobov.
+    """
+    now = datetime.utcnow()
+    reaped = fail_stale_export_jobs(now)
+    expired = ExportJob.query.filter(ExportJob.status.in_(('done', 'failed')), ExportJob.expires_at < now).all()
+    for job in expired:
+        path = export_job_path(job)
+        if os.path.exists(path):
+            os.remove(path)
+        db.session.delete(job)
+    if expired:
+        db.session.commit()
+        logger.info(f'Cleaned up {len(expired)} expired export jobs')
+
+    folder = app.config['EXPORT_FOLDER']
+    if os.path.isdir(folder):
+        running = {job.filename + '.part' for job in ExportJob.query.filter_by(status='running')}
+        cutoff = time.time() - export_job_lease().total_seconds()
+        for name in os.listdir(folder):
+            path = os.path.join(folder, name)
+            if name.endswith('.part') and name not in running and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                logger.info(f'Removed orphaned export part {name}')
+    return reaped + len(expired)
+
+def export_job_to_dict(job):
+    """Serializácia stavu exportného jobu pre API"""
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'size': job.size,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'expires_at': job.expires_at.isoformat() if job.expires_at else None,
+        'download_url': url_for('api_export_download', job_id=job.id) if job.status == 'done' else None
+    }
+
+@app.route('/api/exports', methods=['POST'])
+@login_required
+@rate_limit(max_per_minute=10)
+def api_export_create():
+    """Založí exportný job (projects, payments, ai, automation) spracovaný na pozadí
+
+    Parametre: kind (projects|payments|ai|automation).
+    Export zahŕňa celý účet, preto vyžaduje prihlásenie cez session.
+    """
+    if g.get('api_key_project_id'):
+        return api_key_forbidden('Exporty nie sú dostupné cez API kľúč projektu')
+    payload = request.get_json(silent=True) or {}
+    kind = payload.get('kind') or request.form.get('kind')
+    if kind not in EXPORT_JOB_KINDS:
+        return bad_request(f'Typ exportu musí byť jeden z: {", ".join(EXPORT_JOB_KINDS)}')
+
+    cleanup_expired_exports()
+
+    job = ExportJob(
+        user_id=current_user.id,
+        kind=kind,
+        status='pending',
+        filename=f'{uuid.uuid4().hex}-{kind}.{EXPORT_JOB_KINDS[kind][1]}.gz',
+        # Termín platí od založenia - job mŕtveho workera tak neostane pending navždy
+        expires_at=datetime.utcnow() + export_job_timeout()
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    metrics.add('export_queue_depth', 1)
+    export_executor.submit(run_queued_export_job, job.id)
+    logger.info(f'Export job {job.id} ({kind}) queued by user {current_user.id}')
+    return jsonify(export_job_to_dict(job)), 202
+
+@app.route('/api/exports/<int:job_id>', methods=['GET'])
+@login_required
+def api_export_status(job_id):
+    """Stav exportného jobu"""
+    if g.get('api_key_project_id'):
+        return api_key_forbidden('Exporty nie sú dostupné cez API kľúč projektu')
+    job = ExportJob.query.get_or_404(job_id)
+    if job.user_id != current_user.id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    if job.status in ('pending', 'running'):
+        fail_stale_export_jobs(datetime.utcnow(), job.id)
+    return jsonify(export_job_to_dict(job))
+
+@app.route('/api/exports/<int:job_id>/download', methods=['GET'])
+@login_required
+def api_export_download(job_id):
+    """Stiahnutie artefaktu exportu, podporuje Range požiadavky"""
+    if g.get('api_key_project_id'):
+        return api_key_forbidden('Exporty nie sú dostupné cez API kľúč projektu')
+    job = ExportJob.query.get_or_404(job_id)
+    if job.user_id != current_user.id:
+        return jsonify({'error': 'Unauthorized'}), 403
+    if job.status != 'done':
+        return jsonify({'error': 'Conflict', 'message': f'Export ešte nie je pripravený ({job.status})'}), 409
+
+    path = export_job_path(job)
+    if (job.expires_at and job.expires_at < datetime.utcnow()) or not os.path.exists(path):
+        return jsonify({'error': 'Gone', 'message': 'Export expiroval'}), 410
+
+    return send_file(path, mimetype='application/gzip', as_attachment=True,
+                     download_name=job.filename, conditional=True)
+
 # --- ERROR HANDLERS ---
 @app.errorhandler(404)
 def not_found_error(error):
@@ -974,11 +3610,34 @@ def rate_limit_error(error):
     flash('Príliš veľa požiadavok. Skús to neskôr.', 'warning')
     return redirect(request.referrer or url_for('dashboard')), 429
 
+# --- ŠABLÓNY ---
+def warm_templates():
+    """Skompiluje všetky HTML šablóny do cache Jinja prostredia (a bytecode cache), vráti ich počet"""
+    compiled = 0
+    for name in app.jinja_env.list_templates(extensions=['html']):
+        try:
+            app.jinja_env.get_template(name)
+            compiled += 1
+        except Exception as e:
+            logger.error(f'Template warm-up failed for {name}: {str(e)}')
+    return compiled
+
+@app.cli.command('warm-templates')
+def warm_templates_command():
+    """flask warm-templates - naplní bytecode cache šablón pred štartom workerov"""
+    print(f"✅ Skompilované šablóny: {warm_templates()}")
+
+# V cached režime sa šablóny kompilujú pri štarte workera, nie pri prvom requeste
+# (filtre a globály sú už zaregistrované, takže kompilácia prejde)
+if app.config.get('TEMPLATE_MODE') == 'cached':
+    warm_templates()
+
 # --- INICIALIZÁCIA ---
 if __name__ == '__main__':
     try:
         with app.app_context():
             db.create_all()
+            run_migrations()
             print("✅ Databáza bola inicializovaná!")
     except Exception as e:
         print(f"❌ Chyba databázy: {e}")
@@ -6,10 +6,99 @@ load_dotenv()  # Načítanie premenných z `.env`
 # Získaj absolútnu cestu k projektu
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Predvolené nastavenia connection poolu podľa prostredia.
+# pool_recycle musí byť kratší ako MySQL wait_timeout, inak pool vydáva
+# spojenia, ktoré server už zavrel.
+POOL_DEFAULTS = {
+    'production': {'pool_size': 10, 'max_overflow': 10, 'pool_recycle': 280, 'pool_timeout': 30, 'pool_pre_ping': True},
+    'development': {'pool_size': 5, 'max_overflow': 5, 'pool_recycle': 1800, 'pool_timeout': 30, 'pool_pre_ping': True},
+}
+
+def build_engine_options(database_uri, env):
+    """SQLALCHEMY_ENGINE_OPTIONS z predvolieb prostredia a DB_POOL_* premenných
+
+    Ak je nastavené DB_MAX_CONNECTIONS, rozpočet spojení sa delí medzi
+    gunicorn workery (WEB_CONCURRENCY), aby ich súčet neprekročil limit servera.
+    """
+    defaults = POOL_DEFAULTS.get(env, POOL_DEFAULTS['development'])
+    options = {'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', str(defaults['pool_pre_ping'])).lower() == 'true'}
+
+    # SQLite nepoužíva sieťové spojenia, veľkosť poolu ani recycle nemajú zmysel
+    if database_uri.startswith('sqlite'):
+        return options
+
+    options['pool_size'] = int(os.getenv('DB_POOL_SIZE', defaults['pool_size']))
+    options['max_overflow'] = int(os.getenv('DB_MAX_OVERFLOW', defaults['max_overflow']))
+    options['pool_recycle'] = int(os.getenv('DB_POOL_RECYCLE', defaults['pool_recycle']))
+    options['pool_timeout'] = int(os.getenv('DB_POOL_TIMEOUT', defaults['pool_timeout']))
+
+    max_connections = os.getenv('DB_MAX_CONNECTIONS')
+    if max_connections:
+        workers = max(1, int(os.getenv('WEB_CONCURRENCY', 1)))
+        budget = max(1, int(max_connections) // workers)
+        options['pool_size'] = min(options['pool_size'], budget)
+        options['max_overflow'] = min(options['max_overflow'], budget - options['pool_size'])
+
+    return options
+
+def validate_engine_options(options):
+    """Overí nastavenia poolu pri štarte, pri chybe vyhodí ValueError"""
+    if options.get('pool_size', 1) < 1:
+        raise ValueError('DB_POOL_SIZE musí byť aspoň 1')
+    if options.get('max_overflow', 0) < 0:
+        raise ValueError('DB_MAX_OVERFLOW nesmie byť záporné')
+    if options.get('pool_timeout', 1) <= 0:
+        raise ValueError('DB_POOL_TIMEOUT musí byť kladné')
+    recycle = options.get('pool_recycle', -1)
+    if recycle != -1 and recycle <= 0:
+        raise ValueError('DB_POOL_RECYCLE musí byť kladné alebo -1 (vypnuté)')
+    return options
+
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'tvoje_tajne_heslo_123')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(SQLALCHEMY_DATABASE_URI, os.getenv('FLASK_ENV', 'development'))
+    
+    # Verejná adresa API (napr. https://api.example.com) - base_url v /api/docs nezávisí od hlavičky Host
+    PUBLIC_BASE_URL = os.getenv('PUBLIC_BASE_URL', '')
+    
+    # SQL inštrumentácia - prah pre log pomalých dotazov a rozpočet príkazov na request
+    SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', 200))
+    SQL_STATEMENT_BUDGET = int(os.getenv('SQL_STATEMENT_BUDGET', 20))
+    
+    # Prometheus metriky - adresár zdieľaný gunicorn workermi (prázdny = iba aktuálny proces)
+    METRICS_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR', '')
+    METRICS_WRITE_INTERVAL = float(os.getenv('METRICS_WRITE_INTERVAL', 1))
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+    
+    # Health checky - interval sond na pozadí (0 = sondy pri každom requeste) a vek, po ktorom readiness zlyhá
+    HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', 10))
+    HEALTH_STALE_SECONDS = float(os.getenv('HEALTH_STALE_SECONDS', 30))
+    
+    # API kľúče - ako dlho platí overený kľúč v cache (proces aj Redis)
+    API_KEY_CACHE_SECONDS = int(os.getenv('API_KEY_CACHE_SECONDS', 60))
+    
+    # JSON serializácia - auto | orjson | msgspec | stdlib
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+    
+    # Kompresia odpovedí - poradie preferencie algoritmov (br/zstd len ak je knižnica nainštalovaná)
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_ALGORITHMS = os.getenv('COMPRESS_ALGORITHMS', 'br,zstd,gzip')
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+    
+    # Read replika pre read-only views (dashboard, API, exporty, health)
+    DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {
+        'replica': {
+            'url': DATABASE_REPLICA_URL,
+            **build_engine_options(DATABASE_REPLICA_URL, os.getenv('FLASK_ENV', 'development'))
+        }
+    } if DATABASE_REPLICA_URL else {}
+    REPLICA_MAX_LAG = float(os.getenv('REPLICA_MAX_LAG', 5))
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 10))
+    REPLICA_LAG_CHECK_INTERVAL = int(os.getenv('REPLICA_LAG_CHECK_INTERVAL', 5))
     
     # UPLOAD_FOLDER - dynamicky nastavený podľa prostredia
     # Pre produkciu: /var/www/api_dashboard/scripts
@@ -22,6 +111,18 @@ class Config:
     # Vytvor adresár ak neexistuje
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
     
+    # Artefakty exportných jobov na pozadí
+    EXPORT_FOLDER = os.getenv('EXPORT_FOLDER', os.path.join(BASE_DIR, 'exports'))
+    EXPORT_TTL_HOURS = int(os.getenv('EXPORT_TTL_HOURS', 24))
+    EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', 2))
+    # Pending job, ktorý worker do tohto času nevybral, sa považuje za mŕtvy
+    EXPORT_JOB_TIMEOUT_MINUTES = int(os.getenv('EXPORT_JOB_TIMEOUT_MINUTES', 30))
+    # Running job bez obnovenia heartbeatu dlhšie ako lease sa považuje za mŕtvy
+    EXPORT_JOB_LEASE_SECONDS = int(os.getenv('EXPORT_JOB_LEASE_SECONDS', 120))
+    
+    # Vyhľadávanie projektov: auto (FTS5/FULLTEXT podľa databázy) alebo trigram
+    SEARCH_BACKEND = os.getenv('SEARCH_BACKEND', 'auto')
+    
     STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY')
     STRIPE_PUBLIC_KEY = os.getenv('STRIPE_PUBLIC_KEY')
     SUMUP_API_KEY = os.getenv('SUMUP_API_KEY')
@@ -33,3 +134,12 @@ class Config:
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
     PORT = int(os.getenv('PORT', 6002))
+    
+    # Šablóny - reload (kontrola zmien súborov pri každom renderi) alebo cached (produkcia)
+    TEMPLATE_MODE = os.getenv('TEMPLATE_MODE', 'cached' if FLASK_ENV == 'production' else 'reload')
+    TEMPLATES_AUTO_RELOAD = TEMPLATE_MODE == 'reload'
+    # Skompilovaný bytecode šablón zdieľaný gunicorn workermi, prázdne = vypnuté
+    JINJA_BYTECODE_CACHE_DIR = os.getenv(
+        'JINJA_BYTECODE_CACHE_DIR',
+        os.path.join(BASE_DIR, 'instance', 'jinja_cache') if TEMPLATE_MODE == 'cached' else ''
+    )
@@ -14,7 +14,7 @@ import logging
 # Pridaj parent directory do path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app import app, db, Automation, Project
+from app import app, db, Automation, Project, cleanup_expired_exports
 
 # Nastavenie logovania
 logging.basicConfig(
@@ -92,5 +92,17 @@ def run_pending_automations():
             logging.error(f"Chyba pri spracovaní automatizácií: {str(e)}")
             db.session.rollback()
 
+def cleanup_exports():
+    """Zmaže expirované artefakty exportných jobov"""
+    with app.app_context():
+        try:
+            removed = cleanup_expired_exports()
+            if removed:
+                logging.info(f"Zmazaných {removed} expirovaných exportov")
+        except Exception as e:
+            logging.error(f"Chyba pri mazaní exportov: {str(e)}")
+            db.session.rollback()
+
 if __name__ == "__main__":
     run_pending_automations()
+    cleanup_exports()
@@ -88,6 +88,15 @@ EOF
 info "Načítavam databázové schéma..."
 mysql -u root -p"$MYSQL_PASSWORD" api_dashboard < database/init_db.sql
 
+info "Aplikujem databázové migrácie (indexy)..."
+FLASK_APP=app.py venv/bin/flask migrate
+
+info "Pripravujem komprimované varianty statických súborov..."
+FLASK_APP=app.py venv/bin/flask compress-static
+
+info "Kompilujem šablóny do bytecode cache..."
+FLASK_ENV=production FLASK_APP=app.py venv/bin/flask warm-templates
+
 # 10. Nastavenie systemd služby
 info "Nastavujem systemd službu..."
 cp api_dashboard.service /etc/systemd/system/
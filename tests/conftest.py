@@ -25,6 +25,8 @@ class TestConfig:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {'poolclass': NullPool}
     UPLOAD_FOLDER = '/tmp/test_scripts'
+    EXPORT_FOLDER = '/tmp/test_exports'
+    HEALTH_CHECK_INTERVAL = 0  # Probe inline, no background refresher thread
     STRIPE_SECRET_KEY = None
     STRIPE_PUBLIC_KEY = None
     SUMUP_API_KEY = None
@@ -56,8 +58,39 @@ def app():
         os.remove(db_path)
 
 
+# N+1 detector: maximum SQL statements a single request may issue.
+# Endpoints that legitimately need more declare their own budget.
+DEFAULT_STATEMENT_BUDGET = 12
+STATEMENT_BUDGETS = {}
+
+
+@pytest.fixture(scope='function')
+def statement_budget(app):
+    """Fail the test when any request issues more SQL statements than its budget.
+
+    Uses the per-request statement counter the app keeps in g.sql_statements.
+    """
+    from flask import g, request, request_finished
+
+    counter = {'statements': 0}
+    violations = []
+
+    def check(sender, response, **extra):
+        counter['statements'] = g.get('sql_statements', 0)
+        budget = STATEMENT_BUDGETS.get(request.endpoint, DEFAULT_STATEMENT_BUDGET)
+        if counter['statements'] > budget:
+            violations.append(f"{request.method} {request.full_path} -> {counter['statements']} SQL statements (budget {budget})")
+
+    request_finished.connect(check, app)
+    yield counter
+
+    request_finished.disconnect(check, app)
+    if violations:
+        pytest.fail('Possible N+1 queries:\n' + '\n'.join(violations))
+
+
 @pytest.fixture(scope='function')
-def client(app):
+def client(app, statement_budget):
     """Test client for making HTTP requests."""
     return app.test_client()
 
@@ -0,0 +1,88 @@
+"""
+AI History Search Tests for VPS Dashboard API.
+Tests /api/project/<id>/ai/history full-text search, highlighting and pagination.
+"""
+
+import pytest
+import json
+from datetime import datetime, timedelta
+
+
+@pytest.fixture
+def ai_history(app, test_project):
+    """AI requests with distinct timestamps for the test project"""
+    from app import db, AIRequest
+
+    entries = [
+        ('Napíš popis produktu', 'Elegantná káva z Etiópie'),
+        ('Návrh newslettera', 'Milí zákazníci, prinášame novinky'),
+        ('Slogan pre kaviareň', 'Káva, ktorá prebúdza'),
+        ('Preklad do angličtiny', 'Good morning'),
+    ]
+    base = datetime(2024, 5, 1, 8, 0, 0)
+    with app.app_context():
+        for i, (prompt, response) in enumerate(entries):
+            db.session.add(AIRequest(project_id=test_project.id, prompt=prompt, response=response,
+                                     created_at=base + timedelta(hours=i)))
+        db.session.commit()
+
+
+class TestHighlight:
+    """Tests for highlight_terms()"""
+
+    def test_marks_prefix_ignoring_diacritics(self):
+        from app import highlight_terms
+
+        assert highlight_terms('Elegantná káva', ['kav']) == 'Elegantná <mark>káva</mark>'
+
+    def test_escapes_html(self):
+        from app import highlight_terms
+
+        assert highlight_terms('<b>kava</b>', ['kava']) == '&lt;b&gt;<mark>kava</mark>&lt;/b&gt;'
+
+
+@pytest.mark.parametrize('mode', ['auto', 'trigram'])
+class TestAIHistoryAPI:
+    """Tests for the AI history endpoint over fulltext and fallback indexes"""
+
+    @pytest.fixture(autouse=True)
+    def backend_mode(self, app, mode):
+        app.config['SEARCH_BACKEND'] = mode
+        yield
+        app.config['SEARCH_BACKEND'] = 'auto'
+
+    def test_search_prompt_and_response(self, authenticated_client, test_project, ai_history, mode):
+        response = authenticated_client.get(f'/api/project/{test_project.id}/ai/history?q=káva')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert [item['prompt'] for item in data['items']] == ['Slogan pre kaviareň', 'Napíš popis produktu']
+
+    def test_highlight_in_results(self, authenticated_client, test_project, ai_history, mode):
+        response = authenticated_client.get(f'/api/project/{test_project.id}/ai/history?q=newsletter')
+        items = json.loads(response.data)['items']
+
+        assert len(items) == 1
+        assert items[0]['highlight']['prompt'] == 'Návrh <mark>newslettera</mark>'
+
+    def test_keyset_pagination(self, authenticated_client, test_project, ai_history, mode):
+        url = f'/api/project/{test_project.id}/ai/history?limit=3'
+        first = json.loads(authenticated_client.get(url).data)
+        second = json.loads(authenticated_client.get(url + f"&cursor={first['next_cursor']}").data)
+
+        assert len(first['items']) == 3
+        assert first['items'][0]['prompt'] == 'Preklad do angličtiny'
+        assert [item['prompt'] for item in second['items']] == ['Napíš popis produktu']
+        assert second['next_cursor'] is None
+
+    def test_forbidden_for_other_user(self, app, authenticated_client, admin_user, mode):
+        from app import db, Project
+        import os
+
+        with app.app_context():
+            project = Project(name='Admin', api_key=os.urandom(24).hex(), user_id=admin_user.id)
+            db.session.add(project)
+            db.session.commit()
+            project_id = project.id
+
+        assert authenticated_client.get(f'/api/project/{project_id}/ai/history').status_code == 403
@@ -0,0 +1,93 @@
+"""
+API Docs Tests for VPS Dashboard API.
+Tests the generated, ETag-cached /api/docs document.
+"""
+
+import pytest
+import json
+
+
+class TestGeneratedDocs:
+    """Tests for docs discovered from app.url_map and view docstrings"""
+
+    def test_lists_every_api_route(self, app, client):
+        """Test every /api rule appears in the docs"""
+        data = json.loads(client.get('/api/docs').data)
+
+        for rule in app.url_map.iter_rules():
+            if rule.rule.startswith('/api/'):
+                assert any(key.endswith(' ' + rule.rule.replace('<int:', '<')) for key in data['endpoints'])
+
+    def test_entry_from_docstring_and_decorators(self, client):
+        """Test description, parameters, authentication and rate limit are derived from the view"""
+        data = json.loads(client.get('/api/docs').data)
+        entry = data['endpoints']['GET /api/project/<project_id>/payments']
+
+        assert entry['description'].startswith('API endpoint pre zoznam platieb')
+        assert entry['authentication'] is True
+        assert entry['rate_limit'] == '60/min'
+        assert entry['path_parameters'] == ['project_id']
+        assert entry['parameters'][:2] == ['limit', 'cursor']
+
+        assert data['endpoints']['GET /api/health']['authentication'] is False
+        assert data['endpoints']['POST /api/exports']['rate_limit'] == '10/min'
+
+    def test_parse_docstring_parameters(self):
+        """Test parameter list stops at the first period outside parentheses"""
+        from app import parse_view_docstring
+
+        def view():
+            """Popis
+
+            Parametre: q (text, prefixy), limit. Ďalšia poznámka.
+            """
+
+        assert parse_view_docstring(view) == ('Popis', ['q (text, prefixy)', 'limit'], 'Ďalšia poznámka.')
+
+
+class TestDocsCaching:
+    """Tests for ETag and Cache-Control on /api/docs"""
+
+    def test_strong_etag_and_cache_control(self, app, client, monkeypatch):
+        """Test response with PUBLIC_BASE_URL carries a strong ETag and public Cache-Control"""
+        monkeypatch.setitem(app.config, 'PUBLIC_BASE_URL', 'https://api.example.com/')
+        response = client.get('/api/docs', headers={'Host': 'evil.example'})
+
+        assert response.content_type == 'application/json'
+        assert not response.headers['ETag'].startswith('W/')
+        assert response.cache_control.public
+        assert response.cache_control.max_age > 0
+        assert json.loads(response.data)['base_url'] == 'https://api.example.com'
+
+    def test_host_derived_base_url_not_shared(self, app, client, monkeypatch):
+        """Test without PUBLIC_BASE_URL the Host-derived document is private and varies on Host"""
+        monkeypatch.setitem(app.config, 'PUBLIC_BASE_URL', '')
+        response = client.get('/api/docs', headers={'Host': 'evil.example'})
+
+        assert json.loads(response.data)['base_url'] == 'http://evil.example'
+        assert response.cache_control.private
+        assert not response.cache_control.public
+        assert 'Host' in response.headers['Vary']
+
+    def test_if_none_match_returns_304(self, client):
+        """Test matching If-None-Match answers 304 without a body"""
+        etag = client.get('/api/docs').headers['ETag']
+        response = client.get('/api/docs', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_stale_etag_returns_document(self, client):
+        """Test a different ETag gets the full document"""
+        response = client.get('/api/docs', headers={'If-None-Match': '"stale"'})
+
+        assert response.status_code == 200
+        assert 'endpoints' in json.loads(response.data)
+
+    def test_document_built_once(self, client, monkeypatch):
+        """Test the document is generated once per base URL"""
+        import app as app_module
+
+        client.get('/api/docs')
+        monkeypatch.setattr(app_module, 'build_api_docs', lambda base_url: pytest.fail('docs rebuilt'))
+        assert client.get('/api/docs').status_code == 200
@@ -0,0 +1,296 @@
+"""
+API Key Tests for VPS Dashboard API.
+Tests X-API-Key authentication, digest lookup, caching and per-key scoping.
+"""
+
+import pytest
+import json
+import os
+
+
+@pytest.fixture(autouse=True)
+def fresh_request_user(app):
+    """Re-run the login loaders on every request.
+
+    Test requests share the fixture's app context, so g would otherwise keep
+    the user (and key scope) loaded by the previous request.
+    """
+    from flask import g, request_started
+
+    def reset(sender, **extra):
+        for name in ('_login_user', 'api_key_project_id', 'api_key_digest'):
+            g.pop(name, None)
+
+    request_started.connect(reset, app)
+    yield
+    request_started.disconnect(reset, app)
+
+
+class SharedRedis:
+    """Minimal in-memory Redis shared by all (simulated) workers."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, seconds, value):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def pipeline(self):
+        return self
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture
+def clear_key_cache(monkeypatch):
+    """Start every test with an empty verification cache in a shared Redis."""
+    import app as app_module
+
+    redis = SharedRedis()
+    monkeypatch.setattr(app_module, 'redis_client', redis)
+    return redis.store
+
+
+@pytest.fixture
+def second_project(app, test_user):
+    """Another project of the same user."""
+    from app import db, Project
+
+    project = Project(name='Second Project', api_key=os.urandom(24).hex(), user_id=test_user.id)
+    db.session.add(project)
+    db.session.commit()
+    return project
+
+
+class TestAPIKeyAuthentication:
+    """Tests for X-API-Key header authentication"""
+
+    def test_key_authenticates_without_session(self, client, test_project, clear_key_cache):
+        """Test a valid key grants API access without logging in"""
+        response = client.get(f'/api/project/{test_project.id}', headers={'X-API-Key': test_project.api_key})
+
+        assert response.status_code == 200
+        assert json.loads(response.data)['name'] == 'Test Project'
+
+    def test_invalid_key_returns_401(self, client, test_project, clear_key_cache):
+        """Test an unknown key is rejected with JSON 401, not a login redirect"""
+        response = client.get('/api/projects', headers={'X-API-Key': 'nonsense'})
+
+        assert response.status_code == 401
+        assert json.loads(response.data)['error'] == 'Unauthorized'
+
+    def test_key_ignored_outside_api(self, client, test_project, clear_key_cache):
+        """Test keys do not log into the HTML dashboard"""
+        response = client.get('/', headers={'X-API-Key': test_project.api_key})
+        assert response.status_code == 302
+
+    def test_inactive_project_key_rejected(self, client, test_project, clear_key_cache):
+        """Test keys of deactivated projects do not authenticate"""
+        from app import db
+
+        test_project.is_active = False
+        db.session.commit()
+
+        response = client.get('/api/projects', headers={'X-API-Key': test_project.api_key})
+        assert response.status_code == 401
+
+
+class TestAPIKeyScope:
+    """Tests that a key only reaches its own project"""
+
+    def test_other_project_forbidden(self, client, test_project, second_project, clear_key_cache):
+        """Test key of one project cannot read another project of the same user"""
+        response = client.get(f'/api/project/{second_project.id}', headers={'X-API-Key': test_project.api_key})
+        assert response.status_code == 403
+
+    def test_list_limited_to_key_project(self, client, test_project, second_project, clear_key_cache):
+        """Test /api/projects lists only the key's project"""
+        response = client.get('/api/projects', headers={'X-API-Key': second_project.api_key})
+
+        assert [p['name'] for p in json.loads(response.data)] == ['Second Project']
+
+    def test_exports_forbidden(self, client, test_project, second_project, clear_key_cache):
+        """Test a project key cannot export the account, so sibling keys never leak"""
+        from app import db, ExportJob
+
+        headers = {'X-API-Key': test_project.api_key}
+        response = client.post('/api/exports', json={'kind': 'projects'}, headers=headers)
+
+        assert response.status_code == 403
+        assert second_project.api_key not in response.get_data(as_text=True)
+        assert db.session.query(ExportJob).count() == 0
+
+    def test_existing_export_forbidden(self, client, test_project, second_project, clear_key_cache):
+        """Test status and download of the owner's export job are not reachable with a key"""
+        from app import db, ExportJob
+
+        job = ExportJob(user_id=test_project.user_id, kind='projects', status='done', filename='x-projects.json.gz')
+        db.session.add(job)
+        db.session.commit()
+
+        headers = {'X-API-Key': test_project.api_key}
+        assert client.get(f'/api/exports/{job.id}', headers=headers).status_code == 403
+        download = client.get(f'/api/exports/{job.id}/download', headers=headers)
+        assert download.status_code == 403
+        assert second_project.api_key not in download.get_data(as_text=True)
+
+    def test_db_metrics_forbidden(self, client, test_project, clear_key_cache):
+        """Test pool and SQL internals are not exposed to project keys"""
+        response = client.get('/api/metrics/db', headers={'X-API-Key': test_project.api_key})
+        assert response.status_code == 403
+
+
+class TestAPIKeyDigest:
+    """Tests for hashed key storage and lookup"""
+
+    def test_digest_stored_and_indexed(self, app, test_project):
+        """Test digest is kept in sync and backed by a unique index"""
+        from app import db, api_key_digest
+
+        assert test_project.api_key_digest == api_key_digest(test_project.api_key)
+        indexes = {index['name']: index for index in db.inspect(db.engine).get_indexes('projects')}
+        assert indexes['ix_projects_api_key_digest']['unique']
+
+    def test_lookup_by_digest_only(self, client, test_project, clear_key_cache):
+        """Test verification queries the digest, never the plaintext key"""
+        from app import db
+        from sqlalchemy import event
+
+        parameters = []
+
+        def capture(conn, cursor, statement, params, context, executemany):
+            parameters.append(repr(params))
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            client.get('/api/projects', headers={'X-API-Key': test_project.api_key})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        assert not any(test_project.api_key in p for p in parameters)
+
+    def test_migration_backfills_digests(self, app, test_project):
+        """Test migration 8 computes digests for existing keys"""
+        from app import db, run_migrations, api_key_digest
+
+        db.session.execute(db.text('DROP INDEX ix_projects_api_key_digest'))
+        db.session.execute(db.text('ALTER TABLE projects DROP COLUMN api_key_digest'))
+        db.session.commit()
+
+        assert 8 in run_migrations()
+        digest = db.session.execute(db.text('SELECT api_key_digest FROM projects')).scalar()
+        assert digest == api_key_digest(test_project.api_key)
+
+
+class TestAPIKeyCache:
+    """Tests for the verification cache"""
+
+    def test_verified_key_is_cached(self, app, client, test_project, clear_key_cache, monkeypatch):
+        """Test second request skips the digest lookup"""
+        import app as app_module
+
+        client.get('/api/projects', headers={'X-API-Key': test_project.api_key})
+        assert f'api_key:{app_module.api_key_digest(test_project.api_key)}' in clear_key_cache
+
+        monkeypatch.setattr(app_module.hmac, 'compare_digest', lambda a, b: pytest.fail('key verified again'))
+        assert client.get('/api/projects', headers={'X-API-Key': test_project.api_key}).status_code == 200
+
+    def test_regenerated_key_evicted(self, app, client, test_project, clear_key_cache):
+        """Test the old key stops working as soon as it is regenerated"""
+        from app import db
+
+        old_key = test_project.api_key
+        assert client.get('/api/projects', headers={'X-API-Key': old_key}).status_code == 200
+
+        test_project.api_key = os.urandom(24).hex()
+        db.session.commit()
+
+        assert client.get('/api/projects', headers={'X-API-Key': old_key}).status_code == 401
+        assert client.get('/api/projects', headers={'X-API-Key': test_project.api_key}).status_code == 200
+
+    def test_revoked_key_rejected_while_cached(self, app, client, test_project, clear_key_cache):
+        """Test deactivating a project by another worker rejects its cached key at once"""
+        from app import db, Project
+        from sqlalchemy.orm import Session
+
+        headers = {'X-API-Key': test_project.api_key}
+        assert client.get('/api/projects', headers=headers).status_code == 200
+        assert any(key.startswith('api_key:') for key in clear_key_cache)
+
+        # Write through a separate session, as another worker process would
+        with Session(db.engine) as session:
+            session.get(Project, test_project.id).is_active = False
+            session.commit()
+        db.session.expire_all()
+
+        assert not any(key.startswith('api_key:') for key in clear_key_cache)
+        assert client.get('/api/projects', headers=headers).status_code == 401
+
+    def test_no_cache_without_redis(self, app, client, test_project, monkeypatch):
+        """Test without Redis every request verifies the key against the database"""
+        import app as app_module
+        from app import db
+
+        monkeypatch.setattr(app_module, 'redis_client', None)
+        headers = {'X-API-Key': test_project.api_key}
+        assert client.get('/api/projects', headers=headers).status_code == 200
+
+        test_project.is_active = False
+        db.session.commit()
+        assert client.get('/api/projects', headers=headers).status_code == 401
+
+
+class TestAPIKeyRateLimit:
+    """Tests for per-key rate-limit buckets"""
+
+    def test_bucket_per_key(self, app, client, test_project, second_project, clear_key_cache, monkeypatch):
+        """Test each key counts against its own rate-limit bucket"""
+        import app as app_module
+
+        keys = []
+
+        class FakeRedis:
+            def get(self, key):
+                keys.append(key)
+                return None
+
+            def pipeline(self):
+                return self
+
+            def incr(self, key):
+                pass
+
+            def expire(self, key, seconds):
+                pass
+
+            def execute(self):
+                pass
+
+            def setex(self, *args):
+                pass
+
+            def delete(self, *args):
+                pass
+
+        monkeypatch.setattr(app_module, 'redis_client', FakeRedis())
+        client.get('/api/projects', headers={'X-API-Key': test_project.api_key})
+        client.get('/api/projects', headers={'X-API-Key': second_project.api_key})
+
+        rate_keys = [key for key in keys if key.startswith('rate_limit:')]
+        assert len(rate_keys) == 2
+        assert rate_keys[0] != rate_keys[1]
+        assert all(key.startswith('rate_limit:key:') for key in rate_keys)
@@ -0,0 +1,95 @@
+"""
+Batch Detail Tests for VPS Dashboard API.
+Tests /api/projects/batch and its grouped count queries.
+"""
+
+import pytest
+import json
+import os
+
+
+@pytest.fixture
+def projects_with_children(app, test_user):
+    """Create projects with 0..3 payments and 3..0 automations."""
+    from app import db, Project, Payment, Automation
+
+    ids = []
+    for i in range(4):
+        project = Project(name=f'Batch {i}', api_key=os.urandom(24).hex(), user_id=test_user.id)
+        db.session.add(project)
+        db.session.flush()
+        for _ in range(i):
+            db.session.add(Payment(project_id=project.id, amount=1, gateway='stripe'))
+        for _ in range(3 - i):
+            db.session.add(Automation(project_id=project.id, script_name='s.py', schedule='* * * * *'))
+        ids.append(project.id)
+    db.session.commit()
+    return ids
+
+
+class TestBatchDetail:
+    """Tests for /api/projects/batch"""
+
+    def test_counts_per_project(self, authenticated_client, projects_with_children):
+        """Test every requested project has correct counts, in request order"""
+        ids = list(reversed(projects_with_children))
+        response = authenticated_client.get('/api/projects/batch?ids=' + ','.join(map(str, ids)))
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert [item['id'] for item in data['items']] == ids
+        for item in data['items']:
+            i = int(item['name'].split()[-1])
+            assert item['payments_count'] == i
+            assert item['automations_count'] == 3 - i
+        assert data['missing'] == []
+
+    def test_constant_query_count(self, app, authenticated_client, projects_with_children):
+        """Test counts for many projects take one grouped query, not one per project"""
+        from app import db
+        from sqlalchemy import event
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if 'FROM payments' in statement or 'FROM automation' in statement:
+                statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            authenticated_client.get('/api/projects/batch?ids=' + ','.join(map(str, projects_with_children)))
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        assert len(statements) == 1
+        assert 'GROUP BY' in statements[0]
+
+    def test_foreign_and_unknown_ids_missing(self, authenticated_client, admin_user, projects_with_children):
+        """Test ids of other users and nonexistent ids are reported as missing"""
+        from app import db, Project
+
+        foreign = Project(name='Foreign', api_key=os.urandom(24).hex(), user_id=admin_user.id)
+        db.session.add(foreign)
+        db.session.commit()
+
+        url = f'/api/projects/batch?ids={projects_with_children[0]},{foreign.id},999999'
+        data = json.loads(authenticated_client.get(url).data)
+
+        assert [item['id'] for item in data['items']] == [projects_with_children[0]]
+        assert data['missing'] == [foreign.id, 999999]
+
+    def test_invalid_ids(self, authenticated_client, monkeypatch):
+        """Test malformed, empty and oversized id lists return 400"""
+        import app as app_module
+
+        assert authenticated_client.get('/api/projects/batch?ids=a,b').status_code == 400
+        assert authenticated_client.get('/api/projects/batch').status_code == 400
+        monkeypatch.setattr(app_module, 'API_PAGE_LIMIT_MAX', 2)
+        assert authenticated_client.get('/api/projects/batch?ids=1,2,3').status_code == 400
+
+    def test_detail_uses_grouped_counts(self, authenticated_client, projects_with_children):
+        """Test single-project detail reports the same counts"""
+        data = json.loads(authenticated_client.get(f'/api/project/{projects_with_children[2]}').data)
+
+        assert data['payments_count'] == 2
+        assert data['automations_count'] == 1
@@ -0,0 +1,170 @@
+"""
+Bulk Project Operations Tests for VPS Dashboard API.
+Tests /api/projects/bulk/<action> validation, per-item results and derived state.
+"""
+
+import pytest
+import json
+import os
+
+
+@pytest.fixture
+def projects(app, test_user):
+    """Create three projects of the test user, each with a payment and an AI request."""
+    from app import db, Project, Payment, AIRequest
+
+    created = []
+    for i in range(3):
+        project = Project(name=f'Bulk {i}', api_key=os.urandom(24).hex(), user_id=test_user.id)
+        db.session.add(project)
+        db.session.flush()
+        db.session.add(Payment(project_id=project.id, amount=1, gateway='stripe'))
+        db.session.add(AIRequest(project_id=project.id, prompt=f'prompt {i}', response='ok'))
+        created.append(project)
+    db.session.commit()
+    return [project.id for project in created]
+
+
+def post_bulk(client, action, items):
+    return client.post(f'/api/projects/bulk/{action}', json={'items': items})
+
+
+class TestBulkCreate:
+    """Tests for bulk create"""
+
+    def test_creates_valid_items_and_reports_invalid(self, authenticated_client):
+        """Test valid projects are created and invalid ones get per-item errors"""
+        from app import Project
+
+        response = post_bulk(authenticated_client, 'create', [
+            {'name': 'A'}, {'name': ''}, {'name': 'B', 'script_path': 'b.py'}
+        ])
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert data['applied'] == 2
+        assert data['failed'] == 1
+        assert [r['status'] for r in data['results']] == ['ok', 'error', 'ok']
+        assert len(data['results'][0]['api_key']) == 48
+        assert sorted(p.name for p in Project.query.all()) == ['A', 'B']
+
+    def test_created_projects_are_searchable_and_keyed(self, authenticated_client):
+        """Test derived state (search index, key digest) is kept for created projects"""
+        from app import Project, api_key_digest
+
+        post_bulk(authenticated_client, 'create', [{'name': 'Kaviareň'}])
+        project = Project.query.one()
+
+        assert project.api_key_digest == api_key_digest(project.api_key)
+        assert b'Kaviare' in authenticated_client.get('/?search=kaviaren').data
+
+
+class TestBulkToggle:
+    """Tests for bulk toggle of is_active"""
+
+    def test_explicit_and_flip(self, authenticated_client, projects):
+        """Test explicit is_active values and flipping when omitted"""
+        from app import db, Project
+
+        response = post_bulk(authenticated_client, 'toggle', [
+            {'id': projects[0], 'is_active': False}, projects[1], {'id': 999999}
+        ])
+        data = json.loads(response.data)
+
+        assert [r['status'] for r in data['results']] == ['ok', 'ok', 'error']
+        db.session.expire_all()
+        states = {p.id: p.is_active for p in Project.query.all()}
+        assert states == {projects[0]: False, projects[1]: False, projects[2]: True}
+
+    def test_collection_etag_changes(self, authenticated_client, projects):
+        """Test bulk updates bump the collection version despite bypassing mapper events"""
+        etag = authenticated_client.get('/api/projects').headers['ETag']
+        post_bulk(authenticated_client, 'toggle', [projects[0]])
+
+        response = authenticated_client.get('/api/projects', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+
+
+class TestBulkRegenerateKeys:
+    """Tests for bulk API key regeneration"""
+
+    def test_new_keys_and_digests(self, authenticated_client, projects):
+        """Test each project gets a new key with a matching digest"""
+        from app import db, Project, api_key_digest
+
+        old = {p.id: p.api_key for p in Project.query.all()}
+        data = json.loads(post_bulk(authenticated_client, 'regenerate-keys', projects[:2]).data)
+
+        db.session.expire_all()
+        for result in data['results']:
+            project = db.session.get(Project, result['id'])
+            assert project.api_key == result['api_key'] != old[project.id]
+            assert project.api_key_digest == api_key_digest(project.api_key)
+        assert db.session.get(Project, projects[2]).api_key == old[projects[2]]
+
+
+class TestBulkDelete:
+    """Tests for bulk delete"""
+
+    def test_deletes_projects_and_children(self, authenticated_client, projects):
+        """Test projects and their payments and AI requests are removed"""
+        from app import db, Project, Payment, AIRequest
+
+        data = json.loads(post_bulk(authenticated_client, 'delete', projects[:2]).data)
+
+        assert data['applied'] == 2
+        db.session.expire_all()
+        assert [p.id for p in Project.query.all()] == [projects[2]]
+        assert Payment.query.count() == 1
+        assert AIRequest.query.count() == 1
+        assert db.session.execute(db.text('SELECT COUNT(*) FROM ai_requests_fts')).scalar() == 1
+
+    def test_other_users_projects_untouched(self, app, authenticated_client, admin_user):
+        """Test ids of another user's projects are reported as missing"""
+        from app import db, Project
+
+        project = Project(name='Admin', api_key=os.urandom(24).hex(), user_id=admin_user.id)
+        db.session.add(project)
+        db.session.commit()
+
+        data = json.loads(post_bulk(authenticated_client, 'delete', [project.id]).data)
+        assert data['results'][0]['status'] == 'error'
+        assert db.session.get(Project, project.id) is not None
+
+    def test_runs_as_few_statements(self, authenticated_client, projects, statement_budget):
+        """Test deleting many projects does not issue per-project DELETEs"""
+        post_bulk(authenticated_client, 'delete', projects)
+        assert statement_budget['statements'] <= 12
+
+
+class TestBulkValidation:
+    """Tests for request validation"""
+
+    def test_unknown_action(self, authenticated_client):
+        """Test unknown action returns 404"""
+        assert post_bulk(authenticated_client, 'archive', [1]).status_code == 404
+
+    def test_empty_or_missing_items(self, authenticated_client):
+        """Test missing items returns 400"""
+        assert post_bulk(authenticated_client, 'delete', []).status_code == 400
+        assert authenticated_client.post('/api/projects/bulk/delete', data='x').status_code == 400
+
+    def test_item_limit(self, authenticated_client, monkeypatch):
+        """Test more than BULK_MAX_ITEMS items returns 400"""
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'BULK_MAX_ITEMS', 2)
+        assert post_bulk(authenticated_client, 'delete', [1, 2, 3]).status_code == 400
+
+    def test_duplicate_ids(self, authenticated_client, projects):
+        """Test duplicate ids are reported per item"""
+        data = json.loads(post_bulk(authenticated_client, 'toggle', [projects[0], projects[0]]).data)
+        assert [r['status'] for r in data['results']] == ['ok', 'error']
+
+    def test_non_integer_ids(self, authenticated_client, projects):
+        """Test list, dict and null ids are reported per item instead of failing the request"""
+        items = [{'id': [1]}, {'id': {}}, {'id': None}, [projects[0]], {'id': projects[0]}]
+        response = post_bulk(authenticated_client, 'toggle', items)
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert [r['status'] for r in data['results']] == ['error', 'error', 'error', 'error', 'ok']
@@ -0,0 +1,123 @@
+"""
+Compression Tests for VPS Dashboard API.
+Tests negotiated response compression and precompressed static assets.
+"""
+
+import pytest
+import gzip
+import json
+
+
+class TestResponseCompression:
+    """Tests for the compress_response after_request hook"""
+
+    def test_gzip_json(self, client):
+        """Test large JSON is gzipped and the ETag weakened"""
+        response = client.get('/api/docs', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert response.headers['ETag'].startswith('W/')
+        assert json.loads(gzip.decompress(response.data))['endpoints']
+
+    def test_brotli_preferred(self, client):
+        """Test br wins over gzip when the client accepts both"""
+        brotli = pytest.importorskip('brotli')
+        response = client.get('/api/docs', headers={'Accept-Encoding': 'gzip, br'})
+
+        assert response.headers['Content-Encoding'] == 'br'
+        assert json.loads(brotli.decompress(response.data))['endpoints']
+
+    def test_zstd(self, app, client, monkeypatch):
+        """Test zstd is negotiated when configured and the client accepts it"""
+        zstandard = pytest.importorskip('zstandard')
+        monkeypatch.setitem(app.config, 'COMPRESS_ALGORITHMS', 'zstd,gzip')
+        response = client.get('/api/docs', headers={'Accept-Encoding': 'gzip, zstd'})
+
+        assert response.headers['Content-Encoding'] == 'zstd'
+        body = zstandard.ZstdDecompressor().decompressobj().decompress(response.data)
+        assert json.loads(body)['endpoints']
+
+    def test_html_not_compressed(self, client):
+        """Test HTML pages with CSRF tokens are never compressed (BREACH)"""
+        response = client.get('/login', headers={'Accept-Encoding': 'gzip, br'})
+
+        assert response.mimetype == 'text/html'
+        assert 'Content-Encoding' not in response.headers
+
+    def test_weak_etag_revalidates(self, client):
+        """Test the weakened ETag of a compressed response still yields 304"""
+        etag = client.get('/api/docs', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        response = client.get('/api/docs', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+
+        assert response.status_code == 304
+
+    def test_small_and_unaccepted_responses_untouched(self, client):
+        """Test responses below COMPRESS_MIN_SIZE or without Accept-Encoding stay plain"""
+        assert 'Content-Encoding' not in client.get('/health/live', headers={'Accept-Encoding': 'gzip'}).headers
+        assert 'Content-Encoding' not in client.get('/api/docs', headers={'Accept-Encoding': 'identity'}).headers
+
+    def test_disabled(self, app, client):
+        """Test COMPRESS_ENABLED=False turns compression off"""
+        app.config['COMPRESS_ENABLED'] = False
+        try:
+            response = client.get('/api/docs', headers={'Accept-Encoding': 'gzip'})
+        finally:
+            app.config['COMPRESS_ENABLED'] = True
+
+        assert 'Content-Encoding' not in response.headers
+
+    def test_streamed_export(self, authenticated_client, test_project):
+        """Test streamed exports are compressed chunk by chunk without Content-Length"""
+        response = authenticated_client.get('/export/projects', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in response.headers
+        assert b'Test Project' in gzip.decompress(response.data)
+
+
+class TestPrecompressedStatic:
+    """Tests for flask compress-static and serving .gz/.br variants"""
+
+    @pytest.fixture
+    def static_folder(self, app, tmp_path):
+        """Point the static folder at a temporary directory with one stylesheet."""
+        original = app.static_folder
+        (tmp_path / 'site.css').write_text('body { margin: 0; padding: 0; }\n' * 100)
+        (tmp_path / 'tiny.css').write_text('a{}')
+        app.static_folder = str(tmp_path)
+        yield tmp_path
+        app.static_folder = original
+
+    def test_command_writes_smaller_variants(self, app, static_folder):
+        """Test the CLI writes .gz (and .br) only where it saves bytes"""
+        result = app.test_cli_runner().invoke(args=['compress-static'])
+
+        assert result.exit_code == 0
+        assert (static_folder / 'site.css.gz').exists()
+        assert gzip.decompress((static_folder / 'site.css.gz').read_bytes()) == (static_folder / 'site.css').read_bytes()
+        assert not (static_folder / 'tiny.css.gz').exists()
+
+    def test_serves_precompressed_variant(self, app, client, static_folder):
+        """Test a .gz variant is sent as-is with the original mimetype"""
+        from app import precompress_static
+
+        precompress_static(str(static_folder))
+        response = client.get('/static/site.css', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.mimetype == 'text/css'
+        assert response.data == (static_folder / 'site.css.gz').read_bytes()
+        response.close()
+
+    def test_plain_file_without_accept_encoding(self, app, client, static_folder):
+        """Test clients without gzip support get the original file"""
+        from app import precompress_static
+
+        precompress_static(str(static_folder))
+        response = client.get('/static/site.css')
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.data == (static_folder / 'site.css').read_bytes()
+        response.close()
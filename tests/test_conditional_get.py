@@ -0,0 +1,135 @@
+"""
+Conditional GET Tests for VPS Dashboard API.
+Tests ETag/Last-Modified revalidation of /api/projects and /api/project/<id>.
+"""
+
+import json
+
+
+def count_statements(app, client, url, **kwargs):
+    """Issue a GET and return (response, SQL statements it ran)."""
+    from app import db
+    from sqlalchemy import event
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db.session.remove()
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        response = client.get(url, **kwargs)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+    return response, statements
+
+
+class TestProjectsCollection:
+    """Tests for conditional GET on /api/projects"""
+
+    def test_validators_present(self, authenticated_client, test_project):
+        """Test list carries ETag, Last-Modified and a revalidation policy"""
+        response = authenticated_client.get('/api/projects')
+
+        assert response.headers.get('ETag')
+        assert response.headers.get('Last-Modified')
+        assert response.cache_control.no_cache
+
+    def test_304_without_projects_query(self, app, authenticated_client, test_project):
+        """Test matching If-None-Match answers 304 without selecting projects"""
+        etag = authenticated_client.get('/api/projects').headers['ETag']
+        response, statements = count_statements(app, authenticated_client, '/api/projects',
+                                                headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+        assert not any('FROM projects' in statement for statement in statements)
+
+    def test_project_write_changes_etag(self, app, authenticated_client, test_project):
+        """Test editing and creating a project bumps the collection version"""
+        from app import db, Project
+        import os
+
+        etag = authenticated_client.get('/api/projects').headers['ETag']
+
+        project = db.session.get(Project, test_project.id)
+        project.name = 'Renamed'
+        db.session.commit()
+        response = authenticated_client.get('/api/projects', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)[0]['name'] == 'Renamed'
+
+        etag = response.headers['ETag']
+        db.session.add(Project(name='Second', api_key=os.urandom(24).hex(), user_id=test_project.user_id))
+        db.session.commit()
+        response = authenticated_client.get('/api/projects', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert len(json.loads(response.data)) == 2
+
+    def test_if_modified_since(self, authenticated_client, test_project):
+        """Test Last-Modified revalidation without an ETag"""
+        last_modified = authenticated_client.get('/api/projects').headers['Last-Modified']
+        response = authenticated_client.get('/api/projects', headers={'If-Modified-Since': last_modified})
+
+        assert response.status_code == 304
+
+    def test_etag_differs_per_user_and_query(self, app, test_user, admin_user):
+        """Test ETag is scoped to the user and to the query string"""
+        from app import projects_etag
+
+        with app.test_request_context('/api/projects'):
+            own = projects_etag(test_user.id, 1)
+            other = projects_etag(admin_user.id, 1)
+        with app.test_request_context('/api/projects?limit=5'):
+            filtered = projects_etag(test_user.id, 1)
+
+        assert len({own, other, filtered}) == 3
+
+
+class TestProjectDetail:
+    """Tests for conditional GET on /api/project/<id>"""
+
+    def test_304_skips_counts(self, app, authenticated_client, test_project):
+        """Test matching ETag answers 304 without counting payments"""
+        url = f'/api/project/{test_project.id}'
+        etag = authenticated_client.get(url).headers['ETag']
+        response, statements = count_statements(app, authenticated_client, url, headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert not any('FROM payments' in statement for statement in statements)
+
+    def test_new_payment_changes_etag(self, app, authenticated_client, test_project):
+        """Test adding a payment moves updated_at so the counts are refetched"""
+        from app import db, Payment
+        from sqlalchemy.orm import Session
+
+        url = f'/api/project/{test_project.id}'
+        etag = authenticated_client.get(url).headers['ETag']
+
+        # Separate session so the logged-in user cached by the shared app context stays attached
+        with Session(db.engine) as session:
+            session.add(Payment(project_id=test_project.id, amount=5, gateway='stripe'))
+            session.commit()
+        db.session.expire_all()
+
+        response = authenticated_client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['payments_count'] == 1
+
+
+class TestChangeTrackingMigration:
+    """Tests for migration 6"""
+
+    def test_columns_added_and_backfilled(self, app, test_project):
+        """Test legacy tables get updated_at and the collection version"""
+        from app import db, run_migrations
+
+        db.session.execute(db.text('ALTER TABLE projects DROP COLUMN updated_at'))
+        db.session.execute(db.text('ALTER TABLE users DROP COLUMN projects_version'))
+        db.session.commit()
+
+        assert 6 in run_migrations()
+        row = db.session.execute(db.text('SELECT created_at, updated_at FROM projects')).one()
+        assert row.updated_at == row.created_at
+        assert db.session.execute(db.text('SELECT projects_version FROM users')).scalar() == 0
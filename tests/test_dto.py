@@ -0,0 +1,101 @@
+"""
+DTO Tests for VPS Dashboard API.
+Tests slot-based DTOs built from column-only queries for the API and exports.
+"""
+
+import json
+from datetime import datetime
+
+
+def loaded_projects():
+    """Project instances currently held by the session's identity map."""
+    from app import db, Project
+
+    return [obj for obj in db.session.identity_map.values() if isinstance(obj, Project)]
+
+
+class TestDTOs:
+    """Tests for the DTO classes themselves"""
+
+    def test_slots_without_dict(self):
+        """Test DTOs carry no per-instance __dict__"""
+        from app import ProjectSummary
+
+        item = ProjectSummary(1, 'A', 'k', True, datetime(2024, 1, 1))
+        assert not hasattr(item, '__dict__')
+
+    def test_backends_agree(self):
+        """Test every installed backend serializes a DTO the same way"""
+        from app import ProjectDetail, installed_json_backends, make_json_encoder
+
+        item = ProjectDetail(1, 'Kaviareň', 'k', True, None, datetime(2024, 1, 1), None, 2, 0)
+        expected = json.loads(make_json_encoder('stdlib')(item))
+
+        assert expected['created_at'] == '2024-01-01T00:00:00'
+        for backend in installed_json_backends():
+            assert json.loads(make_json_encoder(backend)(item)) == expected
+
+
+class TestAPIWithoutORMIdentities:
+    """Tests that API views do not load Project entities"""
+
+    def test_detail(self, app, authenticated_client, test_project):
+        """Test project detail is served from a column-only query"""
+        from app import db
+
+        project_id = test_project.id
+        db.session.expunge_all()
+        response = authenticated_client.get(f'/api/project/{project_id}')
+
+        assert response.status_code == 200
+        assert json.loads(response.data)['name'] == 'Test Project'
+        assert loaded_projects() == []
+
+    def test_detail_missing_and_foreign(self, authenticated_client, admin_user):
+        """Test unknown ids still return 404 and foreign ones 403"""
+        from app import db, Project
+        import os
+
+        foreign = Project(name='Foreign', api_key=os.urandom(24).hex(), user_id=admin_user.id)
+        db.session.add(foreign)
+        db.session.commit()
+
+        assert authenticated_client.get('/api/project/999999').status_code == 404
+        assert authenticated_client.get(f'/api/project/{foreign.id}').status_code == 403
+
+    def test_list_and_batch(self, app, authenticated_client, test_project):
+        """Test list and batch endpoints return the same shape without ORM rows"""
+        from app import db
+
+        project_id = test_project.id
+        db.session.expunge_all()
+        listed = json.loads(authenticated_client.get('/api/projects').data)
+        batch = json.loads(authenticated_client.get(f'/api/projects/batch?ids={project_id}').data)
+
+        assert set(listed[0]) == {'id', 'name', 'api_key', 'is_active', 'created_at'}
+        assert batch['items'][0]['payments_count'] == 0
+        assert loaded_projects() == []
+
+
+class TestExportDTOs:
+    """Tests for DTO-based export rows"""
+
+    def test_project_export_field_order(self, authenticated_client, test_project):
+        """Test NDJSON export keeps the documented field order"""
+        response = authenticated_client.get('/export/projects?format=ndjson')
+        line = response.get_data(as_text=True).splitlines()[0]
+
+        assert list(json.loads(line)) == ['id', 'name', 'api_key', 'script_path', 'is_active', 'created_at']
+
+    def test_export_job_rows(self, app, test_project):
+        """Test AI request export rows are DTOs with ISO timestamps once encoded"""
+        from app import db, AIRequest, AIRequestExport, ai_request_export_rows, iter_ndjson
+
+        db.session.add(AIRequest(project_id=test_project.id, prompt='p', response='r'))
+        db.session.commit()
+
+        rows = list(ai_request_export_rows(test_project.user_id))
+        assert isinstance(rows[0], AIRequestExport)
+        item = json.loads(''.join(iter_ndjson(rows)))
+        assert item['project'] == 'Test Project'
+        assert datetime.fromisoformat(item['created_at'])
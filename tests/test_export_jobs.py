@@ -0,0 +1,217 @@
+"""
+Background Export Job Tests for VPS Dashboard API.
+Tests job creation, status polling, artifact download with Range and expiry.
+"""
+
+import pytest
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+
+
+def wait_for_job(client, job_id, timeout=10):
+    """Poll job status until it leaves pending/running"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        data = json.loads(client.get(f'/api/exports/{job_id}').data)
+        if data['status'] not in ('pending', 'running'):
+            return data
+        time.sleep(0.05)
+    pytest.fail(f'Export job {job_id} did not finish in {timeout}s')
+
+
+class TestExportJobs:
+    """Tests for /api/exports endpoints"""
+
+    def test_create_requires_login(self, client):
+        """Test job creation requires authentication"""
+        response = client.post('/api/exports', json={'kind': 'projects'})
+        assert response.status_code == 302
+
+    def test_unknown_kind_rejected(self, authenticated_client):
+        """Test unknown export kind returns 400"""
+        response = authenticated_client.post('/api/exports', json={'kind': 'users'})
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize('kind', ['projects', 'payments', 'ai', 'automation'])
+    def test_job_produces_gzip_artifact(self, authenticated_client, test_project, kind):
+        """Test every job kind finishes and serves a gzip artifact"""
+        response = authenticated_client.post('/api/exports', json={'kind': kind})
+        assert response.status_code == 202
+
+        job = wait_for_job(authenticated_client, json.loads(response.data)['id'])
+        assert job['status'] == 'done'
+        assert job['expires_at'] is not None
+
+        download = authenticated_client.get(job['download_url'])
+        assert download.status_code == 200
+        content = gzip.decompress(download.data).decode('utf-8')
+        if kind == 'projects':
+            assert json.loads(content)[0]['name'] == 'Test Project'
+
+    def test_download_supports_range(self, authenticated_client, test_project):
+        """Test artifact download answers Range requests with 206"""
+        response = authenticated_client.post('/api/exports', json={'kind': 'projects'})
+        job = wait_for_job(authenticated_client, json.loads(response.data)['id'])
+
+        partial = authenticated_client.get(job['download_url'], headers={'Range': 'bytes=0-9'})
+        assert partial.status_code == 206
+        assert len(partial.data) == 10
+
+    def test_other_user_cannot_see_job(self, app, authenticated_client, admin_user):
+        """Test jobs of other users are forbidden"""
+        from app import db, ExportJob
+
+        with app.app_context():
+            job = ExportJob(user_id=admin_user.id, kind='projects', status='done', filename='x.json.gz')
+            db.session.add(job)
+            db.session.commit()
+            job_id = job.id
+
+        assert authenticated_client.get(f'/api/exports/{job_id}').status_code == 403
+        assert authenticated_client.get(f'/api/exports/{job_id}/download').status_code == 403
+
+    def test_expired_jobs_are_cleaned_up(self, app, test_user):
+        """Test cleanup removes expired job rows and artifacts"""
+        from app import db, ExportJob, cleanup_expired_exports, export_job_path
+        import os
+
+        with app.app_context():
+            job = ExportJob(
+                user_id=test_user.id,
+                kind='projects',
+                status='done',
+                filename='expired-projects.json.gz',
+                expires_at=datetime.utcnow() - timedelta(hours=1)
+            )
+            db.session.add(job)
+            db.session.commit()
+            os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+            path = export_job_path(job)
+            open(path, 'wb').close()
+
+            assert cleanup_expired_exports() == 1
+            assert not os.path.exists(path)
+            assert ExportJob.query.count() == 0
+
+    def test_new_job_has_deadline(self, authenticated_client):
+        """Test expires_at is set when the job is created, not only when it finishes"""
+        data = json.loads(authenticated_client.post('/api/exports', json={'kind': 'projects'}).data)
+        assert data['expires_at']
+        wait_for_job(authenticated_client, data['id'])
+
+    def test_stale_running_job_reaped(self, app, test_user):
+        """Test a job left running by a dead worker is failed and its .part removed"""
+        from app import db, ExportJob, cleanup_expired_exports, export_job_path
+        import os
+
+        job = ExportJob(user_id=test_user.id, kind='projects', status='running', filename='stale-projects.json.gz',
+                        heartbeat_at=datetime.utcnow() - timedelta(minutes=10))
+        legacy = ExportJob(user_id=test_user.id, kind='ai', status='pending', filename='legacy-ai.ndjson.gz',
+                           created_at=datetime.utcnow() - timedelta(days=1))
+        db.session.add_all([job, legacy])
+        db.session.commit()
+        os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+        part = export_job_path(job) + '.part'
+        open(part, 'wb').close()
+
+        assert cleanup_expired_exports() == 2
+        assert not os.path.exists(part)
+        assert {j.status for j in ExportJob.query.all()} == {'failed'}
+        assert all(j.expires_at > datetime.utcnow() for j in ExportJob.query.all())
+
+    def test_status_reports_stale_job_failed(self, authenticated_client, test_user):
+        """Test polling a job whose lease expired reports failed instead of running forever"""
+        from app import db, ExportJob
+
+        job = ExportJob(user_id=test_user.id, kind='projects', status='running', filename='dead-projects.json.gz',
+                        heartbeat_at=datetime.utcnow() - timedelta(minutes=10))
+        db.session.add(job)
+        db.session.commit()
+
+        data = json.loads(authenticated_client.get(f'/api/exports/{job.id}').data)
+        assert data['status'] == 'failed'
+
+    def test_running_job_with_live_lease_kept(self, app, test_user):
+        """Test a long export past EXPORT_JOB_TIMEOUT_MINUTES keeps running while it renews its lease"""
+        from app import db, ExportJob, cleanup_expired_exports, export_job_path
+        import os
+
+        job = ExportJob(user_id=test_user.id, kind='projects', status='running', filename='long-projects.json.gz',
+                        created_at=datetime.utcnow() - timedelta(hours=2),
+                        expires_at=datetime.utcnow() - timedelta(hours=1),
+                        heartbeat_at=datetime.utcnow())
+        db.session.add(job)
+        db.session.commit()
+        os.makedirs(app.config['EXPORT_FOLDER'], exist_ok=True)
+        part = export_job_path(job) + '.part'
+        open(part, 'wb').close()
+        past = time.time() - 2 * 3600
+        os.utime(part, (past, past))
+
+        assert cleanup_expired_exports() == 0
+        assert os.path.exists(part)
+        assert db.session.get(ExportJob, job.id).status == 'running'
+        os.remove(part)
+
+    def test_worker_renews_lease(self, app, test_user, test_project, monkeypatch):
+        """Test the worker refreshes heartbeat_at while writing chunks"""
+        from app import db, ExportJob, run_export_job
+
+        monkeypatch.setitem(app.config, 'EXPORT_JOB_LEASE_SECONDS', 0)
+        job = ExportJob(user_id=test_user.id, kind='projects', status='pending', filename='lease-projects.json.gz')
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+
+        run_export_job(job_id)
+        db.session.expire_all()
+        job = db.session.get(ExportJob, job_id)
+        assert job.status == 'done'
+        assert job.heartbeat_at is not None
+
+    def test_reaped_job_not_overwritten_by_worker(self, app, test_user, monkeypatch):
+        """Test a worker whose job was reaped stops and keeps the reaper's failed status"""
+        import os
+        import app as app_module
+        from sqlalchemy.orm import Session
+        from app import db, ExportJob, run_export_job, export_job_path
+
+        def chunks(user_id):
+            yield '['
+            with Session(db.engine) as reaper:
+                reaper.query(ExportJob).update({'status': 'failed', 'error': 'reaped'})
+                reaper.commit()
+            yield ']'
+
+        monkeypatch.setitem(app.config, 'EXPORT_JOB_LEASE_SECONDS', 0)
+        monkeypatch.setitem(app_module.EXPORT_JOB_KINDS, 'projects', (chunks, 'json'))
+        job = ExportJob(user_id=test_user.id, kind='projects', status='pending', filename='reaped-projects.json.gz')
+        db.session.add(job)
+        db.session.commit()
+        job_id, path = job.id, export_job_path(job)
+
+        run_export_job(job_id)
+        db.session.expire_all()
+        job = db.session.get(ExportJob, job_id)
+        assert (job.status, job.error) == ('failed', 'reaped')
+        assert not os.path.exists(path) and not os.path.exists(path + '.part')
+
+    def test_orphaned_part_files_removed(self, app):
+        """Test old .part files without a live job are deleted, fresh ones kept"""
+        from app import cleanup_expired_exports
+        import os
+
+        folder = app.config['EXPORT_FOLDER']
+        os.makedirs(folder, exist_ok=True)
+        old, fresh = os.path.join(folder, 'old.json.gz.part'), os.path.join(folder, 'fresh.json.gz.part')
+        for path in (old, fresh):
+            open(path, 'wb').close()
+        past = time.time() - 2 * 3600
+        os.utime(old, (past, past))
+
+        cleanup_expired_exports()
+        assert not os.path.exists(old)
+        assert os.path.exists(fresh)
+        os.remove(fresh)
@@ -0,0 +1,172 @@
+"""
+Export Tests for VPS Dashboard API.
+Tests streamed CSV/JSON exports of projects and payments.
+"""
+
+import pytest
+import csv
+import io
+
+
+class TestPaymentsCSVExport:
+    """Tests for streamed /export/payments"""
+
+    def test_export_is_streamed(self, authenticated_client):
+        """Test CSV export response is a streamed (chunked) response"""
+        response = authenticated_client.get('/export/payments')
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert 'attachment' in response.headers['Content-Disposition']
+
+    def test_export_rows_include_project_name(self, app, authenticated_client, test_project):
+        """Test every payment row carries the joined project name"""
+        from app import db, Payment
+
+        with app.app_context():
+            for i in range(5):
+                db.session.add(Payment(project_id=test_project.id, amount=i + 1, gateway='stripe'))
+            db.session.commit()
+
+        response = authenticated_client.get('/export/payments')
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+
+        assert rows[0][0] == 'ID'
+        assert len(rows) == 6
+        assert all(row[1] == 'Test Project' for row in rows[1:])
+
+    def test_export_spans_multiple_chunks(self, app, authenticated_client, test_project, monkeypatch):
+        """Test export larger than one batch is emitted in several chunks"""
+        import app as app_module
+        from app import db, Payment
+
+        monkeypatch.setattr(app_module, 'EXPORT_BATCH_SIZE', 2)
+        with app.app_context():
+            for i in range(5):
+                db.session.add(Payment(project_id=test_project.id, amount=1, gateway='stripe'))
+            db.session.commit()
+
+        response = authenticated_client.get('/export/payments')
+        chunks = [chunk for chunk in response.response if chunk]
+
+        assert len(chunks) >= 3
+        assert b''.join(c if isinstance(c, bytes) else c.encode() for c in chunks).count(b'\n') == 6
+
+
+class TestProjectsJSONExport:
+    """Tests for streamed /export/projects"""
+
+    @pytest.fixture
+    def many_projects(self, app, test_user):
+        from app import db, Project
+        import os
+
+        with app.app_context():
+            for i in range(5):
+                db.session.add(Project(name=f'Projekt č. {i}', api_key=os.urandom(24).hex(), user_id=test_user.id))
+            db.session.commit()
+
+    def test_json_array_across_chunks(self, authenticated_client, many_projects, monkeypatch):
+        """Test chunked JSON array stays valid when split over batches"""
+        import json
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'EXPORT_BATCH_SIZE', 2)
+        response = authenticated_client.get('/export/projects')
+        assert response.is_streamed
+
+        data = json.loads(response.get_data(as_text=True))
+        assert [p['name'] for p in data] == [f'Projekt č. {i}' for i in range(5)]
+
+    def test_empty_json_array(self, authenticated_client):
+        """Test export of an account without projects is an empty array"""
+        import json
+
+        response = authenticated_client.get('/export/projects')
+        assert json.loads(response.get_data(as_text=True)) == []
+
+    def test_ndjson_format(self, authenticated_client, many_projects):
+        """Test NDJSON export has one object per line"""
+        import json
+
+        response = authenticated_client.get('/export/projects?format=ndjson')
+        lines = response.get_data(as_text=True).splitlines()
+
+        assert response.content_type.startswith('application/x-ndjson')
+        assert len(lines) == 5
+        assert all('api_key' in json.loads(line) for line in lines)
+
+    def test_unknown_format(self, authenticated_client):
+        """Test unsupported format returns 400"""
+        response = authenticated_client.get('/export/projects?format=xml')
+        assert response.status_code == 400
+
+    def test_gzip_encoding(self, authenticated_client, many_projects):
+        """Test export is gzip-compressed on the fly when accepted"""
+        import gzip
+        import json
+
+        response = authenticated_client.get('/export/projects', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.headers['Content-Encoding'] == 'gzip'
+        data = json.loads(gzip.decompress(response.get_data()))
+        assert len(data) == 5
+
+
+class TestColumnarExport:
+    """Tests for /export/<kind>/columnar (Arrow/Parquet)"""
+
+    @pytest.fixture
+    def payments(self, app, test_project):
+        from app import db, Payment, AIRequest
+
+        with app.app_context():
+            for i in range(5):
+                db.session.add(Payment(project_id=test_project.id, amount=f'{i}.25', gateway='stripe'))
+                db.session.add(AIRequest(project_id=test_project.id, prompt=f'prompt {i}', response='ok'))
+            db.session.commit()
+
+    def test_parquet_preserves_types(self, authenticated_client, payments, monkeypatch):
+        """Test Parquet export keeps decimal amounts and timestamps"""
+        pa = pytest.importorskip('pyarrow')
+        import pyarrow.parquet as pq
+        import app as app_module
+        from decimal import Decimal
+
+        monkeypatch.setattr(app_module, 'EXPORT_BATCH_SIZE', 2)
+        response = authenticated_client.get('/export/payments/columnar?format=parquet')
+        assert response.status_code == 200
+
+        table = pq.read_table(pa.BufferReader(response.data))
+        assert table.num_rows == 5
+        assert table.schema.field('amount').type == pa.decimal128(10, 2)
+        assert pa.types.is_timestamp(table.schema.field('created_at').type)
+        assert table.column('amount').to_pylist()[1] == Decimal('1.25')
+        assert set(table.column('project').to_pylist()) == {'Test Project'}
+
+    def test_arrow_stream_is_chunked(self, authenticated_client, payments, monkeypatch):
+        """Test Arrow IPC stream export of AI requests is emitted per record batch"""
+        pa = pytest.importorskip('pyarrow')
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'EXPORT_BATCH_SIZE', 2)
+        response = authenticated_client.get('/export/ai/columnar?format=arrow')
+        assert response.is_streamed
+
+        reader = pa.ipc.open_stream(response.get_data())
+        batches = list(reader)
+        assert [batch.num_rows for batch in batches] == [2, 2, 1]
+        assert reader.schema.field('prompt').type == pa.string()
+
+    def test_unknown_kind(self, authenticated_client):
+        """Test unsupported columnar export kind returns 404"""
+        response = authenticated_client.get('/export/projects/columnar')
+        assert response.status_code == 404
+
+    def test_without_pyarrow(self, authenticated_client, monkeypatch):
+        """Test endpoint reports 501 when pyarrow is not installed"""
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'pa', None)
+        response = authenticated_client.get('/export/payments/columnar')
+        assert response.status_code == 501
@@ -0,0 +1,151 @@
+"""
+Health Tier Tests for VPS Dashboard API.
+Tests liveness, readiness and cached deep health checks.
+"""
+
+import pytest
+import json
+import time
+
+
+@pytest.fixture
+def counting_probes(app, monkeypatch):
+    """Replace dependency probes with counters and enable caching without the refresher thread."""
+    import app as app_module
+
+    calls = {'database': 0, 'redis': 0}
+    state = {'database_ok': True}
+
+    def probe_database():
+        calls['database'] += 1
+        if not state['database_ok']:
+            raise RuntimeError('connection refused')
+        return 'connected'
+
+    def probe_redis():
+        calls['redis'] += 1
+        return None
+
+    monkeypatch.setattr(app_module, 'HEALTH_PROBES', [
+        ('database', probe_database, True),
+        ('redis', probe_redis, False),
+    ])
+    monkeypatch.setitem(app.config, 'HEALTH_CHECK_INTERVAL', 60)
+    monkeypatch.setattr(app_module, 'ensure_health_refresher', lambda: None)
+    monkeypatch.setitem(app_module.health_state, 'result', None)
+    return calls, state
+
+
+class TestLiveness:
+    """Tests for /health/live"""
+
+    def test_live_does_not_probe(self, client, counting_probes):
+        """Test liveness answers without touching dependencies"""
+        calls, _ = counting_probes
+        response = client.get('/health/live')
+
+        assert response.status_code == 200
+        assert json.loads(response.data)['status'] == 'healthy'
+        assert calls['database'] == 0
+
+
+class TestCachedDeepHealth:
+    """Tests for /health served from cached probe results"""
+
+    def test_probes_run_once_for_many_requests(self, client, counting_probes):
+        """Test repeated polling reuses cached probe results"""
+        calls, _ = counting_probes
+        for _ in range(5):
+            assert client.get('/health').status_code == 200
+
+        assert calls['database'] == 1
+
+    def test_reports_latency_per_dependency(self, client, counting_probes):
+        """Test each dependency reports status and latency"""
+        data = json.loads(client.get('/health/deep').data)
+
+        assert data['checks']['database']['status'] == 'ok'
+        assert data['checks']['redis']['status'] == 'not configured'
+        assert data['checks']['database']['latency_ms'] >= 0
+        assert data['services']['database'] == 'connected'
+
+    def test_failing_database_degrades(self, client, counting_probes):
+        """Test a failing critical dependency returns 503"""
+        import app as app_module
+
+        _, state = counting_probes
+        state['database_ok'] = False
+        app_module.run_health_probes()
+
+        response = client.get('/api/health')
+        assert response.status_code == 503
+        assert json.loads(response.data)['status'] == 'degraded'
+
+    def test_inline_mode_probes_every_request(self, app, client, counting_probes, monkeypatch):
+        """Test HEALTH_CHECK_INTERVAL 0 probes on each request"""
+        calls, _ = counting_probes
+        monkeypatch.setitem(app.config, 'HEALTH_CHECK_INTERVAL', 0)
+        client.get('/health')
+        client.get('/health')
+
+        assert calls['database'] == 2
+
+
+class TestReadiness:
+    """Tests for /health/ready"""
+
+    def test_ready(self, client, counting_probes):
+        """Test readiness passes with healthy critical dependencies"""
+        response = client.get('/health/ready')
+
+        assert response.status_code == 200
+        assert json.loads(response.data)['status'] == 'ready'
+
+    def test_not_ready_when_database_fails(self, client, counting_probes):
+        """Test readiness fails and names the failing dependency"""
+        import app as app_module
+
+        _, state = counting_probes
+        state['database_ok'] = False
+        app_module.run_health_probes()
+
+        response = client.get('/health/ready')
+        assert response.status_code == 503
+        assert json.loads(response.data)['failing'] == ['database']
+
+    def test_not_ready_when_results_stale(self, app, client, counting_probes, monkeypatch):
+        """Test readiness fails when the refresher stopped updating results"""
+        import app as app_module
+
+        app_module.run_health_probes()
+        app_module.health_state['result']['checked_monotonic'] -= 120
+        monkeypatch.setitem(app.config, 'HEALTH_STALE_SECONDS', 30)
+
+        response = client.get('/health/ready')
+        assert response.status_code == 503
+        assert json.loads(response.data)['stale'] is True
+
+
+class TestRefresherThread:
+    """Tests for the background health refresher"""
+
+    def test_refresher_updates_cache(self, app, counting_probes, monkeypatch):
+        """Test refresher thread refreshes results on its interval"""
+        import app as app_module
+
+        calls, _ = counting_probes
+        monkeypatch.setitem(app.config, 'HEALTH_CHECK_INTERVAL', 0.05)
+
+        from app import health_refresher, health_stop
+        import threading
+
+        health_stop.clear()
+        thread = threading.Thread(target=health_refresher, daemon=True)
+        thread.start()
+        time.sleep(0.3)
+        health_stop.set()
+        thread.join(timeout=2)
+
+        assert not thread.is_alive()
+        assert calls['database'] >= 2
+        assert app_module.health_state['result']['checks']['database']['status'] == 'ok'
@@ -0,0 +1,87 @@
+"""
+JSON Provider Tests for VPS Dashboard API.
+Tests the pluggable JSON backends behind jsonify and request.get_json.
+"""
+
+import pytest
+import json
+from datetime import datetime
+from decimal import Decimal
+
+
+@pytest.fixture(params=['orjson', 'msgspec', 'stdlib'])
+def provider(request, app):
+    """A FastJSONProvider for every installed backend."""
+    from app import FastJSONProvider, installed_json_backends
+
+    if request.param not in installed_json_backends():
+        pytest.skip(f'{request.param} not installed')
+    return FastJSONProvider(app, backend=request.param)
+
+
+class TestBackends:
+    """Tests that every backend produces the same JSON"""
+
+    def test_datetime_and_decimal(self, provider):
+        """Test datetimes become ISO 8601 and Decimals exact strings"""
+        data = json.loads(provider.dumps({
+            'created_at': datetime(2024, 1, 2, 3, 4, 5, 600),
+            'amount': Decimal('19.90')
+        }))
+
+        assert data == {'created_at': '2024-01-02T03:04:05.000600', 'amount': '19.90'}
+
+    def test_matches_stdlib(self, provider):
+        """Test output is identical to the stdlib backend on a realistic payload"""
+        from app import make_json_encoder, sample_json_payload
+
+        payload = sample_json_payload(projects=20, payments=50)
+        assert provider.dumps(payload) == make_json_encoder('stdlib')(payload).decode('utf-8')
+
+    def test_loads_invalid_raises_value_error(self, provider):
+        """Test decode errors surface as ValueError so get_json returns 400"""
+        with pytest.raises(ValueError):
+            provider.loads('{invalid')
+
+    def test_unknown_backend_falls_back(self, app):
+        """Test a configured but missing backend falls back to an installed one"""
+        from app import FastJSONProvider, installed_json_backends
+
+        assert FastJSONProvider(app, backend='nonexistent').backend == installed_json_backends()[0]
+
+
+class TestAPIResponses:
+    """Tests for JSON responses of the API views"""
+
+    def test_payment_amount_and_dates(self, authenticated_client, test_project):
+        """Test payments keep their exact amount and an ISO timestamp"""
+        from app import db, Payment
+
+        db.session.add(Payment(project_id=test_project.id, amount=Decimal('12.50'), gateway='stripe'))
+        db.session.commit()
+
+        data = json.loads(authenticated_client.get(f'/api/project/{test_project.id}/payments').data)
+        item = data['items'][0]
+
+        assert item['amount'] == '12.50'
+        assert datetime.fromisoformat(item['created_at'])
+
+    def test_malformed_body_returns_400(self, authenticated_client):
+        """Test invalid JSON in a request body is still rejected with 400"""
+        response = authenticated_client.post('/api/projects/bulk/delete', data='{invalid',
+                                             content_type='application/json')
+        assert response.status_code == 400
+
+
+class TestBenchmark:
+    """Tests for flask bench-json"""
+
+    def test_reports_every_backend(self, app):
+        """Test the benchmark prints a row per installed backend"""
+        from app import installed_json_backends
+
+        result = app.test_cli_runner().invoke(args=['bench-json', '--rounds', '2'])
+
+        assert result.exit_code == 0
+        for backend in installed_json_backends():
+            assert backend in result.output
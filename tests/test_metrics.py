@@ -0,0 +1,161 @@
+"""
+Metrics Tests for VPS Dashboard API.
+Tests the Prometheus /metrics endpoint and cross-worker aggregation.
+"""
+
+import pytest
+import json
+import os
+
+
+def sample_value(body, prefix):
+    """Return the value of the first exposition line starting with prefix."""
+    for line in body.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+
+class TestPrometheusEndpoint:
+    """Tests for /metrics"""
+
+    def test_exposition_format(self, client):
+        """Test endpoint serves Prometheus text format"""
+        client.get('/api/docs')
+        response = client.get('/metrics')
+        body = response.get_data(as_text=True)
+
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain')
+        assert '# TYPE http_request_duration_seconds histogram' in body
+        assert 'http_requests_in_flight' in body
+
+    def test_latency_histogram_per_endpoint(self, client):
+        """Test request latency is recorded per endpoint with +Inf bucket equal to count"""
+        client.get('/api/docs')
+        body = client.get('/metrics').get_data(as_text=True)
+
+        labels = 'endpoint="api_docs",method="GET"'
+        count = sample_value(body, f'http_request_duration_seconds_count{{{labels}}}')
+        inf = sample_value(body, f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}')
+        assert count >= 1
+        assert inf == count
+
+    def test_status_counter(self, client):
+        """Test requests are counted by status code"""
+        client.get('/api/projects')
+        body = client.get('/metrics').get_data(as_text=True)
+
+        assert 'http_requests_total{endpoint="api_projects",method="GET",status="302"}' in body
+
+    def test_token_protection(self, app, client, monkeypatch):
+        """Test METRICS_TOKEN requires a bearer token"""
+        monkeypatch.setitem(app.config, 'METRICS_TOKEN', 'secret')
+
+        assert client.get('/metrics').status_code == 403
+        response = client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+        assert response.status_code == 200
+
+    def test_upstream_latency(self, client):
+        """Test track_upstream records latency and errors"""
+        from app import track_upstream
+
+        with pytest.raises(RuntimeError):
+            with track_upstream('stripe'):
+                raise RuntimeError('timeout')
+        body = client.get('/metrics').get_data(as_text=True)
+
+        assert sample_value(body, 'upstream_request_duration_seconds_count{service="stripe"}') >= 1
+        assert sample_value(body, 'upstream_errors_total{service="stripe"}') >= 1
+
+
+class TestMultiprocessAggregation:
+    """Tests for aggregation of worker snapshots in METRICS_DIR"""
+
+    @pytest.fixture
+    def metrics_dir(self, app, tmp_path, monkeypatch):
+        monkeypatch.setitem(app.config, 'METRICS_DIR', str(tmp_path))
+        monkeypatch.setitem(app.config, 'METRICS_WRITE_INTERVAL', 0)
+        return tmp_path
+
+    def write_snapshot(self, directory, pid, counter, gauge):
+        snapshot = {
+            'pid': pid,
+            'counters': [['rate_limit_rejections_total', [['endpoint', 'api_projects']], counter]],
+            'gauges': [['http_requests_in_flight', [], gauge]],
+            'histograms': []
+        }
+        (directory / f'metrics_{pid}.json').write_text(json.dumps(snapshot))
+
+    def test_counters_summed_across_workers(self, client, metrics_dir):
+        """Test counters of other workers are added, including recently exited ones"""
+        from app import metrics
+
+        self.write_snapshot(metrics_dir, os.getppid(), 3, 0)
+        self.write_snapshot(metrics_dir, 2 ** 22 + 1, 4, 0)
+        own = metrics.counters.get(('rate_limit_rejections_total', (('endpoint', 'api_projects'),)), 0)
+
+        body = client.get('/metrics').get_data(as_text=True)
+        assert sample_value(body, 'rate_limit_rejections_total{endpoint="api_projects"}') == own + 7
+
+    def test_gauges_of_dead_workers_dropped(self, client, metrics_dir):
+        """Test gauges from exited workers do not inflate current values"""
+        self.write_snapshot(metrics_dir, os.getppid(), 0, 2)
+        self.write_snapshot(metrics_dir, 2 ** 22 + 1, 0, 5)
+
+        body = client.get('/metrics').get_data(as_text=True)
+        # 2 from the live worker plus this /metrics request itself
+        assert sample_value(body, 'http_requests_in_flight') == 3
+
+    def test_dead_worker_counters_folded(self, client, metrics_dir):
+        """Test counters of exited workers move to the dead aggregate and keep counting"""
+        from app import metrics
+
+        self.write_snapshot(metrics_dir, os.getppid(), 3, 0)
+        self.write_snapshot(metrics_dir, 2 ** 22 + 1, 4, 5)
+        self.write_snapshot(metrics_dir, 2 ** 22 + 2, 2, 0)
+        own = metrics.counters.get(('rate_limit_rejections_total', (('endpoint', 'api_projects'),)), 0)
+
+        body = client.get('/metrics').get_data(as_text=True)
+        assert sample_value(body, 'rate_limit_rejections_total{endpoint="api_projects"}') == own + 9
+        assert not (metrics_dir / f'metrics_{2 ** 22 + 1}.json').exists()
+        assert (metrics_dir / f'metrics_{os.getppid()}.json').exists()
+
+        dead = json.loads((metrics_dir / 'metrics_dead.json').read_text())
+        assert dead['gauges'] == []
+        assert dead['counters'] == [['rate_limit_rejections_total', [['endpoint', 'api_projects']], 6]]
+
+        # A second scrape must neither lower nor double count the totals
+        body = client.get('/metrics').get_data(as_text=True)
+        assert sample_value(body, 'rate_limit_rejections_total{endpoint="api_projects"}') == own + 9
+
+    def test_reused_pid_does_not_overwrite_predecessor(self, client, metrics_dir, monkeypatch):
+        """Test a worker reusing a dead worker's PID folds the old file instead of overwriting it"""
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'metrics_state', {'last_write': 0.0, 'pid': None, 'file': None})
+        self.write_snapshot(metrics_dir, os.getpid(), 4, 0)
+        client.get('/api/docs')
+
+        files = sorted(path.name for path in metrics_dir.glob('metrics_*.json'))
+        assert f'metrics_{os.getpid()}.json' not in files
+        assert 'metrics_dead.json' in files
+        dead = json.loads((metrics_dir / 'metrics_dead.json').read_text())
+        assert dead['counters'] == [['rate_limit_rejections_total', [['endpoint', 'api_projects']], 4]]
+
+    def test_worker_writes_snapshot(self, client, metrics_dir):
+        """Test a finished request writes this worker's snapshot file"""
+        client.get('/api/docs')
+
+        [path] = metrics_dir.glob(f'metrics_{os.getpid()}_*.json')
+        snapshot = json.loads(path.read_text())
+        assert any(name == 'http_requests_total' for name, _, _ in snapshot['counters'])
+
+    def test_export_queue_depth_tracked(self, client, metrics_dir):
+        """Test export queue depth gauge comes from submitted and started jobs"""
+        from app import metrics, run_queued_export_job
+
+        before = metrics.gauges[('export_queue_depth', ())]
+        metrics.add('export_queue_depth', 1)
+        run_queued_export_job(0)
+        assert metrics.gauges[('export_queue_depth', ())] == before
@@ -0,0 +1,78 @@
+"""
+Migration Tests for VPS Dashboard API.
+Tests the built-in versioned migrations and that hot queries are index-backed.
+"""
+
+import pytest
+import re
+
+
+class TestMigrations:
+    """Tests for run_migrations()"""
+
+    def test_all_migrations_recorded(self, app):
+        """Test fresh database records every migration version"""
+        from app import run_migrations, SchemaMigration, MIGRATIONS
+
+        with app.app_context():
+            run_migrations()
+            versions = [m.version for m in SchemaMigration.query.order_by(SchemaMigration.version)]
+            assert versions == [version for version, _, _ in MIGRATIONS]
+
+    def test_migrations_are_idempotent(self, app):
+        """Test second run applies nothing"""
+        from app import run_migrations
+
+        with app.app_context():
+            run_migrations()
+            assert run_migrations() == []
+
+    def test_missing_index_is_created(self, app):
+        """Test a legacy database without hot-path indexes gets them"""
+        from app import db, run_migrations
+
+        with app.app_context():
+            db.session.execute(db.text('DROP INDEX ix_projects_user_active'))
+            db.session.execute(db.text('DROP INDEX ix_ai_requests_project_created'))
+            db.session.commit()
+
+            assert 3 in run_migrations()
+            names = {index['name'] for index in db.inspect(db.engine).get_indexes('projects')}
+            assert 'ix_projects_user_active' in names
+
+
+class TestHotQueriesUseIndexes:
+    """EXPLAIN QUERY PLAN over every SELECT issued by the hot views"""
+
+    @pytest.fixture
+    def captured_selects(self, app):
+        from app import db
+        from sqlalchemy import event
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                statements.append((statement, parameters))
+
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', capture)
+            yield statements
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+    def test_hot_views_do_not_scan_tables(self, app, authenticated_client, test_project, captured_selects):
+        """Test no hot query needs a full table scan"""
+        from app import db
+
+        for url in ['/', '/?search=Test', f'/automation/{test_project.id}', f'/ai/{test_project.id}',
+                    '/api/projects', f'/api/project/{test_project.id}',
+                    f'/api/project/{test_project.id}/payments']:
+            assert authenticated_client.get(url).status_code == 200
+
+        assert captured_selects
+        with app.app_context():
+            for statement, parameters in captured_selects:
+                plan = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, tuple(parameters))
+                details = [row[-1] for row in plan]
+                scans = [d for d in details if re.match(r'^SCAN \w+$', d)]
+                assert not scans, f'{statement}\n -> {details}'
@@ -0,0 +1,107 @@
+"""
+Payment API Tests for VPS Dashboard API.
+Tests /api/project/<id>/payments keyset pagination and filters.
+"""
+
+import pytest
+import json
+from datetime import datetime, timedelta
+
+
+@pytest.fixture
+def project_payments(app, test_project):
+    """Create 7 payments with distinct timestamps for the test project."""
+    from app import db, Payment
+
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    with app.app_context():
+        for i in range(7):
+            db.session.add(Payment(
+                project_id=test_project.id,
+                amount=10 + i,
+                gateway='stripe' if i % 2 == 0 else 'sumup',
+                status='completed' if i < 4 else 'pending',
+                created_at=base + timedelta(days=i)
+            ))
+        db.session.commit()
+    return base
+
+
+class TestPaymentsAPI:
+    """Tests for /api/project/<id>/payments endpoint"""
+
+    def test_requires_login(self, client, test_project):
+        """Test endpoint requires authentication"""
+        response = client.get(f'/api/project/{test_project.id}/payments')
+        assert response.status_code == 302
+
+    def test_other_user_project_forbidden(self, app, authenticated_client, admin_user):
+        """Test payments of another user's project are not accessible"""
+        from app import db, Project
+        import os
+
+        with app.app_context():
+            project = Project(name='Admin', api_key=os.urandom(24).hex(), user_id=admin_user.id)
+            db.session.add(project)
+            db.session.commit()
+            project_id = project.id
+
+        response = authenticated_client.get(f'/api/project/{project_id}/payments')
+        assert response.status_code == 403
+
+    def test_newest_first(self, authenticated_client, test_project, project_payments):
+        """Test payments are ordered from newest"""
+        response = authenticated_client.get(f'/api/project/{test_project.id}/payments')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert len(data['items']) == 7
+        assert data['items'][0]['amount'] == '16.00'
+        assert data['next_cursor'] is None
+
+    def test_keyset_pages_cover_all_rows(self, authenticated_client, test_project, project_payments):
+        """Test walking next_cursor returns every payment exactly once"""
+        seen = []
+        url = f'/api/project/{test_project.id}/payments?limit=3'
+        cursor = None
+        while True:
+            response = authenticated_client.get(url + (f'&cursor={cursor}' if cursor else ''))
+            data = json.loads(response.data)
+            seen.extend(item['id'] for item in data['items'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+
+    def test_filters(self, authenticated_client, test_project, project_payments):
+        """Test status, gateway and date filters"""
+        url = f'/api/project/{test_project.id}/payments'
+
+        data = json.loads(authenticated_client.get(url + '?status=pending').data)
+        assert len(data['items']) == 3
+
+        data = json.loads(authenticated_client.get(url + '?gateway=sumup').data)
+        assert all(item['gateway'] == 'sumup' for item in data['items'])
+        assert len(data['items']) == 3
+
+        since = (project_payments + timedelta(days=5)).isoformat()
+        data = json.loads(authenticated_client.get(url + f'?from={since}').data)
+        assert len(data['items']) == 2
+
+    def test_invalid_parameters(self, authenticated_client, test_project):
+        """Test invalid cursor and date return 400"""
+        url = f'/api/project/{test_project.id}/payments'
+
+        assert authenticated_client.get(url + '?cursor=nonsense').status_code == 400
+        assert authenticated_client.get(url + '?from=yesterday').status_code == 400
+
+    def test_composite_index_declared(self, app):
+        """Test payments(project_id, created_at) index exists"""
+        from app import db
+
+        with app.app_context():
+            indexes = db.inspect(db.engine).get_indexes('payments')
+            columns = [index['column_names'] for index in indexes]
+            assert ['project_id', 'created_at'] in columns
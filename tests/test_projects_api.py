@@ -0,0 +1,134 @@
+"""
+Projects API Tests for VPS Dashboard API.
+Tests keyset pagination, field selection and the limit cap of /api/projects.
+"""
+
+import pytest
+import json
+from datetime import datetime, timedelta
+
+
+@pytest.fixture
+def many_projects(app, test_user):
+    """Create 7 projects with distinct creation times."""
+    from app import db, Project
+    import os
+
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(7):
+        db.session.add(Project(
+            name=f'Projekt {i}',
+            api_key=os.urandom(24).hex(),
+            user_id=test_user.id,
+            created_at=base + timedelta(days=i)
+        ))
+    db.session.commit()
+
+
+class TestProjectsPagination:
+    """Tests for keyset pagination of /api/projects"""
+
+    def test_body_stays_a_list(self, authenticated_client, many_projects):
+        """Test response body is still a plain list, newest first"""
+        response = authenticated_client.get('/api/projects')
+        data = json.loads(response.data)
+
+        assert isinstance(data, list)
+        assert [p['name'] for p in data][:2] == ['Projekt 6', 'Projekt 5']
+        assert 'X-Next-Cursor' not in response.headers
+
+    def test_unpaginated_without_limit_or_cursor(self, authenticated_client, many_projects, monkeypatch):
+        """Test existing clients without limit or cursor still get the full list"""
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'API_PAGE_LIMIT_DEFAULT', 3)
+        response = authenticated_client.get('/api/projects')
+
+        assert len(json.loads(response.data)) == 7
+        assert 'Link' not in response.headers
+
+    def test_limit_advertises_next_page(self, authenticated_client, many_projects):
+        """Test a truncated page carries the Link rel=next header"""
+        response = authenticated_client.get('/api/projects?limit=3')
+
+        assert len(json.loads(response.data)) == 3
+        assert 'rel="next"' in response.headers['Link']
+
+    def test_walk_pages_via_link_header(self, authenticated_client, many_projects):
+        """Test following Link rel=next returns every project exactly once"""
+        seen = []
+        url = '/api/projects?limit=3'
+        while url:
+            response = authenticated_client.get(url)
+            seen.extend(p['id'] for p in json.loads(response.data))
+            link = response.headers.get('Link')
+            url = link[1:link.index('>')] if link else None
+
+        assert len(seen) == 7
+        assert len(set(seen)) == 7
+
+    def test_next_cursor_header(self, authenticated_client, many_projects):
+        """Test X-Next-Cursor continues after the last returned row"""
+        first = authenticated_client.get('/api/projects?limit=5')
+        cursor = first.headers['X-Next-Cursor']
+        second = json.loads(authenticated_client.get(f'/api/projects?limit=5&cursor={cursor}').data)
+
+        assert [p['name'] for p in second] == ['Projekt 1', 'Projekt 0']
+
+    def test_limit_is_capped(self, authenticated_client, many_projects, monkeypatch):
+        """Test limit above the maximum is clamped"""
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'API_PAGE_LIMIT_MAX', 4)
+        response = authenticated_client.get('/api/projects?limit=1000')
+
+        assert len(json.loads(response.data)) == 4
+        assert response.headers.get('X-Next-Cursor')
+
+    def test_invalid_cursor(self, authenticated_client):
+        """Test malformed cursor returns 400"""
+        assert authenticated_client.get('/api/projects?cursor=nonsense').status_code == 400
+
+
+class TestProjectsFields:
+    """Tests for fields= column selection"""
+
+    def test_sparse_response(self, authenticated_client, test_project):
+        """Test only requested fields are returned"""
+        data = json.loads(authenticated_client.get('/api/projects?fields=id,name').data)
+
+        assert data == [{'id': test_project.id, 'name': 'Test Project'}]
+
+    def test_fields_pushed_into_select(self, authenticated_client, test_project):
+        """Test unrequested columns are not selected from the database"""
+        from app import db
+        from sqlalchemy import event
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if 'FROM projects' in statement:
+                statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            authenticated_client.get('/api/projects?fields=name')
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        assert statements
+        assert all('api_key' not in statement for statement in statements)
+
+    def test_optional_fields(self, authenticated_client, test_project):
+        """Test non-default columns can be requested"""
+        data = json.loads(authenticated_client.get('/api/projects?fields=script_path,updated_at').data)
+
+        assert data[0]['script_path'] == 'test_script.py'
+        assert 'T' in data[0]['updated_at']
+
+    def test_unknown_field(self, authenticated_client):
+        """Test unknown field returns 400"""
+        response = authenticated_client.get('/api/projects?fields=id,password')
+
+        assert response.status_code == 400
+        assert 'password' in json.loads(response.data)['message']
@@ -0,0 +1,64 @@
+"""
+Query Profile Tests for VPS Dashboard API.
+Tests per-view eager loading and that statement counts do not grow with row counts.
+"""
+
+import pytest
+
+
+def add_payments(app, project_id, count):
+    from app import db, Payment
+
+    with app.app_context():
+        for i in range(count):
+            db.session.add(Payment(project_id=project_id, amount=i + 1, gateway='stripe'))
+        db.session.commit()
+
+
+class TestQueryProfiles:
+    """Tests for QUERY_PROFILES / load_profile()"""
+
+    def test_payments_page_statements_do_not_grow(self, app, authenticated_client, test_project, statement_budget):
+        """Test payment history page issues the same number of statements for 1 and 30 payments"""
+        from app import db
+
+        # Test client shares the fixture's session - start each request with an empty identity map
+        add_payments(app, test_project.id, 1)
+        db.session.remove()
+        authenticated_client.get(f'/payments/{test_project.id}')
+        few = statement_budget['statements']
+
+        add_payments(app, test_project.id, 29)
+        db.session.remove()
+        authenticated_client.get(f'/payments/{test_project.id}')
+        many = statement_budget['statements']
+
+        assert few >= 3
+        assert many <= few
+
+    def test_edit_project_renders_counts(self, app, authenticated_client, test_project):
+        """Test edit page shows counts without loading the collections"""
+        add_payments(app, test_project.id, 3)
+
+        response = authenticated_client.get(f'/projects/{test_project.id}/edit')
+        assert response.status_code == 200
+        assert b'<br>3</p>' in response.data
+
+    def test_raiseload_blocks_unplanned_lazy_load(self, app, test_project):
+        """Test edit_project profile turns lazy collection access into an error"""
+        from app import db, Project, load_profile
+        from sqlalchemy.exc import InvalidRequestError
+
+        with app.app_context():
+            db.session.expunge_all()
+            project = load_profile(Project.query, 'edit_project').get(test_project.id)
+            with pytest.raises(InvalidRequestError):
+                project.payments
+
+    def test_project_counts_single_query(self, app, test_project, statement_budget):
+        """Test project_counts() returns all three counts"""
+        from app import project_counts
+
+        add_payments(app, test_project.id, 2)
+        with app.app_context():
+            assert project_counts(test_project.id) == {'payments': 2, 'automations': 0, 'ai_requests': 0}
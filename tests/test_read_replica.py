@@ -0,0 +1,132 @@
+"""
+Read Replica Routing Tests for VPS Dashboard API.
+Tests that read-only views read from the replica, with lag fallback and read-your-writes.
+"""
+
+import pytest
+import json
+import os
+
+
+REPLICA_PATH = '/tmp/vps_test_replica.db'
+
+
+@pytest.fixture
+def replica(app, test_user, test_project, monkeypatch):
+    """SQLite 'replica' holding a copy of test_user and one replica-only project"""
+    import app as app_module
+    from app import db, User, Project
+    from sqlalchemy import create_engine
+
+    if os.path.exists(REPLICA_PATH):
+        os.remove(REPLICA_PATH)
+    engine = create_engine(f'sqlite:///{REPLICA_PATH}')
+
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert().values(
+            id=test_user.id, username='testuser', email='test@example.com', password='x'))
+        connection.execute(Project.__table__.insert().values(
+            name='Replica Project', api_key='replica-key', user_id=test_user.id, is_active=True))
+
+    # Test client shares the fixture's session - drop objects loaded from the primary
+    db.session.expunge_all()
+
+    monkeypatch.setattr(app_module, 'get_replica_engine', lambda: engine)
+    monkeypatch.setitem(app_module.replica_state, 'checked_at', 0.0)
+    yield engine
+
+    engine.dispose()
+    os.remove(REPLICA_PATH)
+
+
+def project_names(client, headers=None):
+    return [p['name'] for p in json.loads(client.get('/api/projects', headers=headers).data)]
+
+
+class TestReplicaRouting:
+    """Tests for RoutingSession and replica_read"""
+
+    def test_read_only_view_uses_replica(self, authenticated_client, test_project, replica):
+        assert project_names(authenticated_client) == ['Replica Project']
+
+    def test_without_replica_uses_primary(self, authenticated_client, test_project):
+        assert project_names(authenticated_client) == ['Test Project']
+
+    def test_etag_version_read_from_replica(self, app, authenticated_client, test_user, test_project, replica):
+        """Test the collection ETag comes from the same database as the listed projects"""
+        from app import db, projects_etag
+        from sqlalchemy.orm import Session
+
+        # Primary is ahead of the lagging replica
+        with Session(db.engine) as session:
+            session.execute(db.text('UPDATE users SET projects_version = 7'))
+            session.commit()
+
+        response = authenticated_client.get('/api/projects')
+        with app.test_request_context('/api/projects'):
+            replica_etag = projects_etag(test_user.id, 0)
+
+        assert [p['name'] for p in json.loads(response.data)] == ['Replica Project']
+        assert response.headers['ETag'] == f'"{replica_etag}"'
+
+    def test_write_views_use_primary(self, app, authenticated_client, test_project, replica):
+        """Test a POST writes to the primary database only"""
+        from app import Project
+
+        authenticated_client.post('/projects', data={'name': 'Written'})
+        with app.app_context():
+            assert Project.query.filter_by(name='Written').count() == 1
+        with replica.connect() as connection:
+            assert connection.exec_driver_sql("SELECT COUNT(*) FROM projects WHERE name = 'Written'").scalar() == 0
+
+    def test_read_your_writes_after_post(self, authenticated_client, test_project, replica):
+        """Test reads stick to the primary shortly after a write"""
+        authenticated_client.post('/projects', data={'name': 'Fresh'})
+        assert 'Fresh' in project_names(authenticated_client)
+
+    def test_read_your_writes_without_session_cookie(self, authenticated_client, test_project, replica):
+        """Test stickiness is keyed on the user, not stored in the session cookie"""
+        response = authenticated_client.post('/projects', data={'name': 'Fresh'})
+
+        assert 'db_primary_until' not in response.headers.get('Set-Cookie', '')
+        with authenticated_client.session_transaction() as session:
+            assert 'db_primary_until' not in session
+        assert 'Fresh' in project_names(authenticated_client)
+
+    def test_read_your_writes_for_api_key(self, client, test_project, replica, monkeypatch):
+        """Test API-key clients without cookies read the primary right after their own write"""
+        import app as app_module
+        from flask import g, request_started
+
+        def reset(sender, **extra):
+            for name in ('_login_user', 'api_key_project_id', 'api_key_digest'):
+                g.pop(name, None)
+
+        monkeypatch.setattr(app_module, 'replica_sticky', {})
+        request_started.connect(reset, client.application)
+        try:
+            headers = {'X-API-Key': test_project.api_key}
+            assert project_names(client, headers) == ['Replica Project']
+
+            client.post('/api/projects/bulk/toggle', json={'items': [test_project.id]}, headers=headers)
+            assert project_names(client, headers) == ['Test Project']
+            assert list(app_module.replica_sticky) == [f'key:{app_module.api_key_digest(test_project.api_key)[:16]}']
+        finally:
+            request_started.disconnect(reset, client.application)
+
+    def test_lagging_replica_falls_back_to_primary(self, authenticated_client, test_project, replica, monkeypatch):
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'measure_replica_lag', lambda engine: 120.0)
+        assert project_names(authenticated_client) == ['Test Project']
+
+    def test_unavailable_replica_falls_back_to_primary(self, authenticated_client, test_project, replica, monkeypatch):
+        import app as app_module
+
+        monkeypatch.setattr(app_module, 'measure_replica_lag', lambda engine: None)
+        assert project_names(authenticated_client) == ['Test Project']
+
+    def test_health_reports_replica(self, client, replica):
+        data = json.loads(client.get('/health').data)
+        assert data['services']['database_replica'] == 'lag 0.0s'
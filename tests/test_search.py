@@ -0,0 +1,115 @@
+"""
+Project Search Tests for VPS Dashboard API.
+Tests the full-text search backends and ranked dashboard search.
+"""
+
+import pytest
+import os
+
+
+@pytest.fixture
+def named_projects(app, test_user):
+    """Projects with names suited for prefix/fuzzy matching"""
+    from app import db, Project
+
+    names = ['Platobná brána', 'Newsletter', 'Záloha databázy', 'Databázový monitor', 'Webhook proxy']
+    with app.app_context():
+        for name in names:
+            db.session.add(Project(name=name, api_key=os.urandom(24).hex(), user_id=test_user.id))
+        db.session.commit()
+        return {p.name: p.id for p in Project.query.filter_by(user_id=test_user.id)}
+
+
+class TestTrigramIndex:
+    """Tests for the pure-Python trigram fallback"""
+
+    def test_substring_ranks_above_similarity(self):
+        from app import TrigramIndex
+
+        index = TrigramIndex()
+        index.add(1, 'Databázový monitor')
+        index.add(2, 'Záloha databázy')
+        index.add(3, 'Newsletter')
+
+        assert index.search('datab')[:2] == [1, 2]
+        assert 3 not in index.search('datab')
+
+    def test_fuzzy_match_with_typo(self):
+        from app import TrigramIndex
+
+        index = TrigramIndex()
+        index.add(1, 'Newsletter')
+        index.add(2, 'Webhook proxy')
+
+        assert index.search('newsleter') == [1]
+
+    def test_remove(self):
+        from app import TrigramIndex
+
+        index = TrigramIndex()
+        index.add(1, 'Newsletter')
+        index.remove(1)
+
+        assert index.search('Newsletter') == []
+        assert not index.postings
+
+
+@pytest.mark.parametrize('mode', ['auto', 'trigram'])
+class TestProjectSearch:
+    """Tests for search_backend_for(...).search over both backends"""
+
+    @pytest.fixture(autouse=True)
+    def backend_mode(self, app, mode):
+        app.config['SEARCH_BACKEND'] = mode
+        yield
+        app.config['SEARCH_BACKEND'] = 'auto'
+
+    def test_prefix_and_diacritics(self, app, test_user, named_projects, mode):
+        from app import get_search_backend
+
+        with app.app_context():
+            ids = get_search_backend().search(test_user.id, 'databaz', 10)
+            assert set(ids) == {named_projects['Záloha databázy'], named_projects['Databázový monitor']}
+
+    def test_index_follows_updates_and_deletes(self, app, test_user, named_projects, mode):
+        from app import db, Project, get_search_backend
+
+        with app.app_context():
+            backend = get_search_backend()
+            backend.search(test_user.id, 'warmup', 10)
+
+            project = db.session.get(Project, named_projects['Newsletter'])
+            project.name = 'Mailing kampane'
+            db.session.commit()
+            assert backend.search(test_user.id, 'mailing', 10) == [project.id]
+
+            db.session.delete(project)
+            db.session.commit()
+            assert backend.search(test_user.id, 'mailing', 10) == []
+
+    def test_other_users_projects_not_found(self, app, admin_user, named_projects, mode):
+        from app import get_search_backend
+
+        with app.app_context():
+            assert get_search_backend().search(admin_user.id, 'Newsletter', 10) == []
+
+
+class TestDashboardSearch:
+    """Tests for ranked search on the dashboard"""
+
+    def test_dashboard_search_finds_by_prefix(self, authenticated_client, named_projects):
+        response = authenticated_client.get('/?search=webh')
+        assert response.status_code == 200
+        assert 'Webhook proxy'.encode() in response.data
+        assert 'Newsletter'.encode() not in response.data
+
+    def test_dashboard_search_is_fuzzy(self, authenticated_client, named_projects):
+        response = authenticated_client.get('/?search=Newsleter')
+        assert 'Newsletter'.encode() in response.data
+
+    def test_fts_backend_used_on_sqlite(self, app):
+        from app import get_search_backend, sqlite_has_fts5
+
+        with app.app_context():
+            expected = 'sqlite-fts5' if sqlite_has_fts5() else 'trigram'
+            assert get_search_backend().name == expected
@@ -0,0 +1,113 @@
+"""
+SQL Instrumentation Tests for VPS Dashboard API.
+Tests per-request statement counters, slow-query logging and Server-Timing.
+"""
+
+import pytest
+import json
+
+
+class TestServerTiming:
+    """Tests for the Server-Timing response header"""
+
+    def test_header_reports_db_time(self, authenticated_client):
+        """Test responses carry db and app timings"""
+        response = authenticated_client.get('/api/projects')
+        timing = response.headers.getlist('Server-Timing')
+
+        assert any(value.startswith('db;dur=') for value in timing)
+        assert any(value.startswith('app;dur=') for value in timing)
+
+    def test_header_counts_statements(self, app, authenticated_client, test_project):
+        """Test the db entry reports the statements issued by the request"""
+        from app import db
+
+        db.session.remove()
+        response = authenticated_client.get('/api/projects')
+        db_timing = next(v for v in response.headers.getlist('Server-Timing') if v.startswith('db;'))
+
+        assert 'desc="' in db_timing
+        statements = int(db_timing.split('desc="')[1].split(' ')[0])
+        assert statements >= 1
+
+
+class TestSlowQueryLog:
+    """Tests for logging of slow queries"""
+
+    def test_slow_query_logged_with_parameter_shape(self, app, authenticated_client, test_project, monkeypatch, caplog):
+        """Test queries above the threshold are logged with parameter types, not values"""
+        monkeypatch.setitem(app.config, 'SLOW_QUERY_MS', 0)
+
+        with caplog.at_level('WARNING', logger='app'):
+            authenticated_client.get(f'/api/project/{test_project.id}')
+
+        slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith('Slow query')]
+        assert slow
+        assert any("'int'" in message for message in slow)
+        assert all(test_project.api_key not in message for message in slow)
+
+    def test_failed_statements_leave_no_timer_state(self, app):
+        """Test failing statements do not accumulate start times on the pooled connection"""
+        from app import db
+        from flask import g
+        from sqlalchemy.exc import OperationalError
+
+        with app.test_request_context('/'):
+            with db.engine.connect() as connection:
+                for _ in range(3):
+                    with pytest.raises(OperationalError):
+                        connection.exec_driver_sql('SELECT * FROM missing_table')
+                connection.exec_driver_sql('SELECT 1')
+
+                assert not connection.info.get('query_start')
+                assert g.sql_statements == 1
+
+    def test_parameter_shape(self):
+        """Test parameter shape for positional, named and executemany parameters"""
+        from app import parameter_shape
+
+        assert parameter_shape((1, 'a')) == ('int', 'str')
+        assert parameter_shape({'id': 1}) == {'id': 'int'}
+        assert parameter_shape([(1,), (2,)]) == "2 x ('int',)"
+
+
+class TestStatementBudget:
+    """Tests for the SQL statement budget warning"""
+
+    def test_over_budget_is_logged(self, app, authenticated_client, monkeypatch, caplog):
+        """Test a request exceeding SQL_STATEMENT_BUDGET logs a warning"""
+        monkeypatch.setitem(app.config, 'SQL_STATEMENT_BUDGET', 0)
+
+        with caplog.at_level('WARNING', logger='app'):
+            authenticated_client.get('/api/projects')
+
+        assert any('SQL budget exceeded' in record.getMessage() for record in caplog.records)
+
+
+class TestDBMetricsEndpoint:
+    """Tests for /api/metrics/db"""
+
+    def test_requires_login(self, client):
+        """Test metrics endpoint requires authentication"""
+        response = client.get('/api/metrics/db')
+        assert response.status_code == 302
+
+    def test_requires_admin(self, authenticated_client):
+        """Test process-wide SQL statistics are hidden from regular users"""
+        response = authenticated_client.get('/api/metrics/db')
+        assert response.status_code == 403
+
+    def test_endpoint_totals(self, client, admin_user):
+        """Test per-endpoint statement totals are aggregated"""
+        with client.session_transaction() as sess:
+            sess['_user_id'] = str(admin_user.id)
+            sess['_fresh'] = True
+        client.get('/api/projects')
+        response = client.get('/api/metrics/db')
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        stats = data['endpoints']['api_projects']
+        assert stats['requests'] >= 1
+        assert stats['statements'] >= stats['max_statements']
+        assert 'pool' in data
@@ -0,0 +1,166 @@
+"""
+Template Tests for VPS Dashboard API.
+Tests that pages render from cached compiled templates, never from inline sources.
+"""
+
+import pytest
+from flask import template_rendered
+
+
+def view_code_names(view):
+    """Global names referenced by a view and the decorators wrapping it."""
+    names = set()
+    while view is not None:
+        names.update(view.__code__.co_names)
+        view = getattr(view, '__wrapped__', None)
+    return names
+
+
+@pytest.fixture
+def compile_counter(app, monkeypatch):
+    """Count Jinja template compilations."""
+    compiled = []
+    original = app.jinja_env.compile
+
+    def counting_compile(source, name=None, filename=None, *args, **kwargs):
+        compiled.append(name)
+        return original(source, name, filename, *args, **kwargs)
+
+    monkeypatch.setattr(app.jinja_env, 'compile', counting_compile)
+    return compiled
+
+
+class TestLoginTemplate:
+    """Tests for the login page"""
+
+    def test_renders_login_html(self, app, client):
+        """Test login page comes from templates/login.html"""
+        rendered = []
+
+        def record(sender, template, context, **extra):
+            rendered.append(template.name)
+
+        template_rendered.connect(record, app)
+        try:
+            response = client.get('/login')
+        finally:
+            template_rendered.disconnect(record, app)
+
+        assert response.status_code == 200
+        assert rendered == ['login.html']
+
+    def test_flashed_error_shown_once(self, client):
+        """Test failed login flashes the message text, not a list repr"""
+        response = client.post('/login', data={'username': 'nobody', 'password': 'x'}, follow_redirects=True)
+        body = response.get_data(as_text=True)
+
+        assert 'Nesprávne prihlasovacie údaje!' in body
+        assert "['" not in body
+
+
+class TestNoRequestTimeCompilation:
+    """Generic checks that views never compile templates per request"""
+
+    def test_no_view_renders_inline_templates(self, app):
+        """Test no view function calls render_template_string or from_string"""
+        offenders = [
+            endpoint for endpoint, view in app.view_functions.items()
+            if {'render_template_string', 'from_string'} & view_code_names(view)
+        ]
+        assert offenders == []
+
+    def test_repeated_renders_hit_template_cache(self, authenticated_client, test_project, compile_counter):
+        """Test HTML pages compile their templates at most once"""
+        pages = ['/', '/projects', '/settings', f'/payments/{test_project.id}', f'/automation/{test_project.id}',
+                 f'/ai/{test_project.id}', f'/projects/{test_project.id}/edit', '/nonexistent']
+        for page in pages:
+            assert authenticated_client.get(page).status_code in (200, 404)
+        compile_counter.clear()
+
+        for page in pages:
+            authenticated_client.get(page)
+        assert compile_counter == []
+
+    def test_login_page_hits_template_cache(self, client, compile_counter):
+        """Test the login page is compiled once, not on every GET"""
+        client.get('/login')
+        compile_counter.clear()
+
+        client.get('/login')
+        client.get('/login')
+        assert compile_counter == []
+
+
+class TestTemplateMode:
+    """Tests for environment-driven template caching"""
+
+    @pytest.fixture
+    def reload_config(self, monkeypatch):
+        """Re-import config.py under patched environment variables."""
+        import importlib
+        import config
+
+        def load(**env):
+            for name in ('TEMPLATE_MODE', 'JINJA_BYTECODE_CACHE_DIR'):
+                monkeypatch.delenv(name, raising=False)
+            for name, value in env.items():
+                monkeypatch.setenv(name, value)
+            return importlib.reload(config).Config
+
+        yield load
+        monkeypatch.undo()
+        importlib.reload(config)
+
+    def test_production_defaults_to_cached(self, reload_config):
+        """Test production disables auto reload and enables the bytecode cache"""
+        config = reload_config(FLASK_ENV='production')
+
+        assert config.TEMPLATE_MODE == 'cached'
+        assert config.TEMPLATES_AUTO_RELOAD is False
+        assert config.JINJA_BYTECODE_CACHE_DIR.endswith('jinja_cache')
+
+    def test_development_reloads(self, reload_config):
+        """Test development keeps auto reload without a bytecode cache"""
+        config = reload_config(FLASK_ENV='development')
+
+        assert config.TEMPLATE_MODE == 'reload'
+        assert config.TEMPLATES_AUTO_RELOAD is True
+        assert config.JINJA_BYTECODE_CACHE_DIR == ''
+
+    def test_explicit_mode_wins(self, reload_config):
+        """Test TEMPLATE_MODE overrides the FLASK_ENV default"""
+        config = reload_config(FLASK_ENV='production', TEMPLATE_MODE='reload')
+        assert config.TEMPLATES_AUTO_RELOAD is True
+
+
+class TestTemplateWarmUp:
+    """Tests for boot-time template compilation"""
+
+    def test_warm_up_fills_bytecode_cache(self, app, tmp_path, monkeypatch):
+        """Test warm-up compiles every HTML template into the shared bytecode cache"""
+        from jinja2 import FileSystemBytecodeCache
+        from app import warm_templates
+
+        monkeypatch.setattr(app.jinja_env, 'bytecode_cache', FileSystemBytecodeCache(str(tmp_path)))
+        monkeypatch.setattr(app.jinja_env, 'cache', {})
+        templates = app.jinja_env.list_templates(extensions=['html'])
+
+        assert warm_templates() == len(templates)
+        assert len(list(tmp_path.iterdir())) == len(templates)
+
+    def test_no_compilation_after_warm_up(self, client, compile_counter):
+        """Test first render after warm-up compiles nothing"""
+        from app import warm_templates
+
+        warm_templates()
+        compile_counter.clear()
+        client.get('/login')
+
+        assert compile_counter == []
+
+    def test_cli_command(self, app):
+        """Test flask warm-templates reports the compiled templates"""
+        result = app.test_cli_runner().invoke(args=['warm-templates'])
+
+        assert result.exit_code == 0
+        assert 'šablóny' in result.output